@@ -0,0 +1,99 @@
+"""
+Replay recorded conversations and compare LLM calls and latency per turn
+with and without the crew fast path.
+
+Offline (default): routes every turn with the recorded flow states and
+estimates LLM calls and latency from ``--agent-calls`` and ``--llm-latency``.
+
+    python benchmarks/crew_routing.py
+
+Live: runs the real crew for each turn (needs the Azure OpenAI settings, the
+Asgardeo settings and a running hotel API) and counts LLM calls via litellm.
+
+    python benchmarks/crew_routing.py --live
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from statistics import mean
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.constants import FlowState
+from utils.crew_router import FULL_PLAN, route_message
+from utils.state_manager import FlowStates
+
+CONVERSATIONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "conversations.json")
+
+def estimated_calls(plan, agent_calls: int) -> int:
+    return int(plan.planning) + int(plan.summarize) + agent_calls
+
+def run_offline(conversations, agent_calls: int, llm_latency: float) -> None:
+    print(f"{'conversation':<32} {'turn':>4}  {'route':<22} {'calls':>11} {'est. latency s':>16} {'router us':>10}")
+    totals = {"full": 0, "fast": 0}
+    for conversation in conversations:
+        states = FlowStates()
+        earlier = []
+        for turn_number, turn in enumerate(conversation["turns"], start=1):
+            start = time.perf_counter()
+            plan = route_message(turn["message"], states, 2 * turn_number - 1, earlier)
+            router_us = (time.perf_counter() - start) * 1e6
+            full = estimated_calls(FULL_PLAN, agent_calls)
+            fast = estimated_calls(plan, agent_calls)
+            totals["full"] += full
+            totals["fast"] += fast
+            print(
+                f"{conversation['name']:<32} {turn_number:>4}  {plan.reason:<22} {full:>4} -> {fast:<4} "
+                f"{full * llm_latency:>7.1f} -> {fast * llm_latency:<6.1f} {router_us:>10.1f}"
+            )
+            earlier.append(turn["message"])
+            states = FlowStates()
+            for name in turn["states_after"]:
+                states.add_state(FlowState[name])
+    print(f"\nLLM calls: {totals['full']} -> {totals['fast']} "
+          f"({100 * (1 - totals['fast'] / totals['full']):.0f}% fewer)")
+
+def run_live(conversations) -> None:
+    import litellm
+    from crew import crew_factory
+    from utils.chat_history import chat_history_manager
+
+    calls = []
+    litellm.success_callback = [lambda *args, **kwargs: calls.append(1)]
+
+    for fast_path in (False, True):
+        crew_factory.fast_path = fast_path
+        latencies, call_counts = [], []
+        for conversation in conversations:
+            thread_id = f"bench-{uuid.uuid4()}"
+            for turn in conversation["turns"]:
+                chat_history_manager.add_user_message(thread_id, turn["message"])
+                calls.clear()
+                start = time.perf_counter()
+                output = crew_factory.build(turn["message"], thread_id).kickoff()
+                latencies.append(time.perf_counter() - start)
+                call_counts.append(len(calls))
+                chat_history_manager.add_assistant_message(thread_id, json.dumps(output.to_dict(), default=str))
+                print(f"fast_path={fast_path} {conversation['name']}: {len(calls)} calls, {latencies[-1]:.1f}s")
+        print(f"fast_path={fast_path}: {mean(call_counts):.1f} LLM calls/turn, {mean(latencies):.1f}s/turn\n")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", default=CONVERSATIONS)
+    parser.add_argument("--live", action="store_true", help="run the real crew instead of estimating")
+    parser.add_argument("--agent-calls", type=int, default=2, help="LLM calls the agent task makes per turn (offline)")
+    parser.add_argument("--llm-latency", type=float, default=1.5, help="seconds per LLM call (offline)")
+    args = parser.parse_args()
+
+    with open(args.conversations) as f:
+        conversations = json.load(f)
+    if args.live:
+        run_live(conversations)
+    else:
+        run_offline(conversations, args.agent_calls, args.llm_latency)
+
+if __name__ == "__main__":
+    main()
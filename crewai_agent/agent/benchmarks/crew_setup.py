@@ -0,0 +1,126 @@
+"""
+Per-message crew setup time: building the LLM client, agent, tools, tasks
+and output schema for every message, as create_crew did before CrewFactory,
+vs CrewFactory.build, which binds only the per-message parts.
+
+Nothing is kicked off and no LLM or API is called, but the tools read the
+Asgardeo settings at import, so the app's .env (or environment) must be
+present. Messages come from the recorded conversations and rotate over
+--threads thread ids; with more threads than --cache-size the factory's
+tool cache also sees misses.
+
+    python benchmarks/crew_setup.py --messages 200 --threads 20
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date
+from itertools import cycle
+from statistics import mean, median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crewai import LLM, Agent, Crew, Process, Task
+
+from crew import (
+    AGENT_TASK_DESCRIPTION,
+    CHAT_HISTORY_TASK_DESCRIPTION,
+    CHAT_HISTORY_TASK_EXPECTED_OUTPUT,
+    HOTEL_AGENT_BACKSTORY,
+    HOTEL_AGENT_GOAL,
+    HOTEL_AGENT_ROLE,
+    CrewFactory,
+)
+from schemas import CrewOutput
+from tools.add_calander import AddCalanderTool
+from tools.booking import BookingTool
+from tools.fetch_booking import FetchBookingsTool
+from tools.fetch_chat_history import FetchChatHistoryTool
+from tools.fetch_hotel import FetchHotelTool
+from tools.fetch_hotels import FetchHotelsTool
+from tools.fetch_room import FetchRoomTool
+from tools.get_booking_preview import BookingPreviewTool
+from utils.crew_router import FULL_PLAN
+from utils.state_manager import state_manager
+
+CONVERSATIONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "conversations.json")
+
+def build_per_message(question, thread_id):
+    """The setup create_crew did for every message before CrewFactory."""
+    llm = LLM(model='azure/gpt4-o')
+    hotel_agent = Agent(
+        role=HOTEL_AGENT_ROLE,
+        goal=HOTEL_AGENT_GOAL,
+        backstory=HOTEL_AGENT_BACKSTORY,
+        verbose=True,
+        llm=llm,
+        tools=[
+            FetchHotelsTool(thread_id), FetchHotelTool(thread_id), FetchRoomTool(thread_id),
+            BookingPreviewTool(thread_id), BookingTool(thread_id), FetchChatHistoryTool(thread_id),
+            FetchBookingsTool(thread_id), AddCalanderTool(thread_id),
+        ]
+    )
+    prompt_values = {
+        "question": question,
+        "flow_state": state_manager.get_states_as_string(thread_id),
+        "today": date.today().isoformat(),
+    }
+    chat_history_task = Task(
+        description=CHAT_HISTORY_TASK_DESCRIPTION.format(**prompt_values),
+        agent=hotel_agent,
+        expected_output=CHAT_HISTORY_TASK_EXPECTED_OUTPUT,
+    )
+    agent_task = Task(
+        description=AGENT_TASK_DESCRIPTION.format(**prompt_values),
+        agent=hotel_agent,
+        context=[chat_history_task],
+        expected_output=f"The output should follow the schema below: {CrewOutput.model_json_schema()}.",
+        memory=True,
+        output_pydantic=CrewOutput
+    )
+    return Crew(
+        agents=[hotel_agent],
+        tasks=[chat_history_task, agent_task],
+        process=Process.sequential,
+        planning=True
+    )
+
+def measure(build, messages):
+    samples = []
+    for question, thread_id in messages:
+        start = time.perf_counter()
+        build(question, thread_id)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return mean(samples), median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=20, help="distinct thread ids the messages rotate over")
+    parser.add_argument("--cache-size", type=int, default=256, help="threads whose tools the factory keeps")
+    args = parser.parse_args()
+
+    with open(CONVERSATIONS) as f:
+        questions = [turn["message"] for conversation in json.load(f) for turn in conversation["turns"]]
+    thread_ids = [f"bench-thread-{n}" for n in range(args.threads)]
+    messages = [pair for pair, _ in zip(zip(cycle(questions), cycle(thread_ids)), range(args.messages))]
+
+    start = time.perf_counter()
+    factory = CrewFactory(max_cached_threads=args.cache_size, fast_path=False)
+    startup_ms = (time.perf_counter() - start) * 1000
+    # Both sides build the same two-task crew; routing is benchmarked in crew_routing.py
+    results = {
+        "per message": measure(build_per_message, messages),
+        "CrewFactory": measure(lambda question, thread_id: factory.build(question, thread_id, plan=FULL_PLAN), messages),
+    }
+
+    print(f"{args.messages} messages over {args.threads} threads, CrewFactory startup {startup_ms:.1f} ms")
+    print(f"{'setup':<14} {'mean ms':>10} {'p50 ms':>10} {'p95 ms':>10}")
+    for name, (mean_ms, p50_ms, p95_ms) in results.items():
+        print(f"{name:<14} {mean_ms:>10.2f} {p50_ms:>10.2f} {p95_ms:>10.2f}")
+
+if __name__ == "__main__":
+    main()
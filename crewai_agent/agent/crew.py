@@ -1,6 +1,10 @@
+from collections import OrderedDict
 from datetime import date
 import os
+import threading
+from typing import List, Optional
 from crewai import Agent, Task, Crew, LLM, Process
+from crewai.tools import BaseTool
 from dotenv import load_dotenv
 from schemas import CrewOutput
 from tools.add_calander import AddCalanderTool
@@ -11,40 +15,35 @@ from tools.fetch_hotel import FetchHotelTool
 from tools.fetch_hotels import FetchHotelsTool
 from tools.fetch_room import FetchRoomTool
 from tools.get_booking_preview import BookingPreviewTool
+from utils.chat_history import chat_history_manager
+from utils.crew_router import FULL_PLAN, CrewPlan, route_message
 from utils.state_manager import state_manager
+from utils.tracing import tracer
 
 load_dotenv()
 
 
-def create_crew(question, thread_id: str = None):
-    llm = LLM(model='azure/gpt4-o')
-    hotel_agent = Agent(
-        role='Hotel Assistant Agent',
-        goal=(
-            "Answer the given question using your tools without modifying the question itself. Please make sure to follow the instructions in the task description. Do not perform any actions outside the scope of the task."
-        ),
-        backstory=(
-            "You are the Hotel Assistant Agent for Gardeo Hotel. You have access to a language model "
-            "and a set of tools to help answer questions and assist with hotel bookings. Gardeo Hotels "
-            "offer the finest Sri Lankan hospitality and blend seamlessly with nature, creating luxurious experiences. "
-            "Our rooms immerse you in a world of their own, and our signature dining transports you to another realm—"
-            "ensuring a stay that is always memorable. We welcome every guest with warmth and a tropical embrace, making "
-            "them feel at home. As guests explore our island, they will be accompanied by the smiles of our people, "
-            "through its many natural and historical wonders. While we value our rich legacies, we also carefully preserve "
-            "our exotic habitat for the future. We share this home with the world and with one another, united by warmth "
-            "and compassion."
-        ),
-        verbose=True,
-        llm=llm,
-        tools=[FetchHotelsTool(thread_id), FetchHotelTool(thread_id), FetchRoomTool(thread_id), BookingPreviewTool(thread_id), BookingTool(thread_id), FetchChatHistoryTool(thread_id), FetchBookingsTool(thread_id), AddCalanderTool(thread_id)]
-    )
-    flow_state = state_manager.get_states_as_string(thread_id)
-    chat_history_task = Task(
-        description=
-            f"""
+HOTEL_AGENT_ROLE = 'Hotel Assistant Agent'
+HOTEL_AGENT_GOAL = (
+    "Answer the given question using your tools without modifying the question itself. Please make sure to follow the instructions in the task description. Do not perform any actions outside the scope of the task."
+)
+HOTEL_AGENT_BACKSTORY = (
+    "You are the Hotel Assistant Agent for Gardeo Hotel. You have access to a language model "
+    "and a set of tools to help answer questions and assist with hotel bookings. Gardeo Hotels "
+    "offer the finest Sri Lankan hospitality and blend seamlessly with nature, creating luxurious experiences. "
+    "Our rooms immerse you in a world of their own, and our signature dining transports you to another realm—"
+    "ensuring a stay that is always memorable. We welcome every guest with warmth and a tropical embrace, making "
+    "them feel at home. As guests explore our island, they will be accompanied by the smiles of our people, "
+    "through its many natural and historical wonders. While we value our rich legacies, we also carefully preserve "
+    "our exotic habitat for the future. We share this home with the world and with one another, united by warmth "
+    "and compassion."
+)
+
+# Task descriptions are formatted per message with question, flow_state and today
+CHAT_HISTORY_TASK_DESCRIPTION = """
             User message: {question}
             Current flow state: [{flow_state}]
-            Current year: { date.today().isoformat() }
+            Current year: {today}
 
             # Message Aggregator Assistant
 
@@ -74,17 +73,19 @@ def create_crew(question, thread_id: str = None):
 
             4. Deliver only the final summarized message in your chat_response
             """
-        ,
-        agent=hotel_agent,
-        expected_output=(
-            "Well structured message that captures all crucial information (ids, dates, preferences, location, etc.) "
-        ),
-    )
-    agent_task = Task(
-        description=
-            f"""
+CHAT_HISTORY_TASK_EXPECTED_OUTPUT = (
+    "Well structured message that captures all crucial information (ids, dates, preferences, location, etc.) "
+)
+
+# Prepended to the agent task when the summarization task is skipped
+DIRECT_MESSAGE_SECTION = """
+            User message: {question}
+            Previous assistant turn: {previous_turn}
+"""
+
+AGENT_TASK_DESCRIPTION = """
             ** Current flow state: [{flow_state}] **
-            ** Current year: { date.today().isoformat() } **
+            ** Current year: {today} **
 
             # Hotel Booking Assistant
 
@@ -160,17 +161,154 @@ def create_crew(question, thread_id: str = None):
             - Minimize tool usage per step
             - Keep URLs in tool_response only
             """
-        ,
-        agent=hotel_agent,
-        context=[chat_history_task],
-        expected_output=f"The output should follow the schema below: {CrewOutput.model_json_schema()}.",
-        memory=True,
-        output_pydantic=CrewOutput
-    )
-    choreo_crew = Crew(
-    agents=[hotel_agent],
-    tasks=[chat_history_task, agent_task],
-    process=Process.sequential,
-    planning=True
-    )
-    return choreo_crew.kickoff()
+
+
+class TracedLLM(LLM):
+    """LLM that records every completion call as an "llm" span."""
+
+    def call(self, *args, **kwargs):
+        with tracer.span(self.model, "llm"):
+            return super().call(*args, **kwargs)
+
+class TracedTask(Task):
+    """Task that records its execution as a "task" span."""
+
+    def execute_sync(self, *args, **kwargs):
+        with tracer.span(self.name or "task", "task"):
+            return super().execute_sync(*args, **kwargs)
+
+
+class CrewFactory:
+    """
+    Builds the hotel crew for a chat message.
+
+    Everything that does not depend on the message is built once: the LLM
+    client, the output schema text and the prompt templates. Tool instances
+    are bound to a thread id and kept in a small LRU, so only the agent,
+    tasks and crew are created per message.
+
+    With ``fast_path`` on, messages that the router considers self-contained
+    skip the summarization task and/or the planning pass.
+    """
+
+    def __init__(
+        self,
+        model: str = 'azure/gpt4-o',
+        planning_model: str = 'gpt-4o-mini',
+        max_cached_threads: int = 256,
+        fast_path: bool = True,
+    ):
+        self.llm = TracedLLM(model=model)
+        # Same model crewai plans with by default, wrapped so planning calls are traced too
+        self.planning_llm = TracedLLM(model=planning_model)
+        self.fast_path = fast_path
+        self.agent_task_expected_output = (
+            f"The output should follow the schema below: {CrewOutput.model_json_schema()}."
+        )
+        self._max_cached_threads = max_cached_threads
+        self._tools: "OrderedDict[Optional[str], List[BaseTool]]" = OrderedDict()
+        self._tools_lock = threading.Lock()
+
+    def get_tools(self, thread_id: Optional[str]) -> List[BaseTool]:
+        with self._tools_lock:
+            tools = self._tools.get(thread_id)
+            if tools is not None:
+                self._tools.move_to_end(thread_id)
+                return tools
+        tools = [
+            FetchHotelsTool(thread_id), FetchHotelTool(thread_id), FetchRoomTool(thread_id),
+            BookingPreviewTool(thread_id), BookingTool(thread_id), FetchChatHistoryTool(thread_id),
+            FetchBookingsTool(thread_id), AddCalanderTool(thread_id),
+        ]
+        with self._tools_lock:
+            tools = self._tools.setdefault(thread_id, tools)
+            if len(self._tools) > self._max_cached_threads:
+                self._tools.popitem(last=False)
+        return tools
+
+    def plan(self, question, thread_id: str = None) -> CrewPlan:
+        if not self.fast_path:
+            return FULL_PLAN
+        history = chat_history_manager.get_chat_history(thread_id)
+        # The current message is already the last entry of the history
+        earlier_user_messages = [message.content for message in history.messages[:-1] if message.role == "user"]
+        return route_message(
+            question, state_manager.get_flow_states(thread_id), len(history.messages), earlier_user_messages
+        )
+
+    def build(self, question, thread_id: str = None, step_callback=None, task_callback=None, plan: Optional[CrewPlan] = None) -> Crew:
+        plan = plan or self.plan(question, thread_id)
+        # Agents and tasks carry per-run state, so they are not shared between messages
+        hotel_agent = Agent(
+            role=HOTEL_AGENT_ROLE,
+            goal=HOTEL_AGENT_GOAL,
+            backstory=HOTEL_AGENT_BACKSTORY,
+            verbose=True,
+            llm=self.llm,
+            tools=self.get_tools(thread_id)
+        )
+        prompt_values = {
+            "question": question,
+            "flow_state": state_manager.get_states_as_string(thread_id),
+            "today": date.today().isoformat(),
+        }
+        tasks = []
+        if plan.summarize:
+            tasks.append(TracedTask(
+                name="chat_history",
+                description=CHAT_HISTORY_TASK_DESCRIPTION.format(**prompt_values),
+                agent=hotel_agent,
+                expected_output=CHAT_HISTORY_TASK_EXPECTED_OUTPUT,
+            ))
+            agent_task_description = AGENT_TASK_DESCRIPTION.format(**prompt_values)
+        else:
+            # No handoff message, so the agent gets the user message (and the
+            # turn it answers) directly
+            agent_task_description = DIRECT_MESSAGE_SECTION.format(
+                question=question,
+                previous_turn=self._previous_turn(thread_id),
+            ) + AGENT_TASK_DESCRIPTION.format(**prompt_values)
+        tasks.append(TracedTask(
+            name="hotel_agent",
+            description=agent_task_description,
+            agent=hotel_agent,
+            context=list(tasks),
+            expected_output=self.agent_task_expected_output,
+            memory=True,
+            output_pydantic=CrewOutput
+        ))
+        return Crew(
+            agents=[hotel_agent],
+            tasks=tasks,
+            process=Process.sequential,
+            planning=plan.planning,
+            planning_llm=self.planning_llm,
+            step_callback=step_callback,
+            task_callback=task_callback
+        )
+
+    @staticmethod
+    def _previous_turn(thread_id: Optional[str]) -> str:
+        history = chat_history_manager.get_chat_history(thread_id)
+        for message in reversed(history.messages):
+            if message.role == "assistant":
+                return message.compact()
+        return "(none)"
+
+# Single instance for application-wide use
+crew_factory = CrewFactory(fast_path=os.getenv("CREW_FAST_PATH", "true").lower() != "false")
+
+
+def create_crew(question, thread_id: str = None, step_callback=None, task_callback=None, queued_at: Optional[float] = None):
+    """
+    Build and run the crew for a message, traced as one request. ``queued_at``
+    is the perf_counter() time the message was queued for a crew worker.
+    """
+    with tracer.trace("chat", start=queued_at, thread_id=thread_id) as root:
+        if queued_at is not None:
+            tracer.record("crew_runner", "queue", queued_at)
+        with tracer.span("build", "setup"):
+            plan = crew_factory.plan(question, thread_id)
+            crew = crew_factory.build(question, thread_id, step_callback, task_callback, plan)
+        root.set(plan=plan.reason)
+        return crew.kickoff()
@@ -1,4 +1,8 @@
+import asyncio
+import functools
+import json
 import os
+import time
 from typing import Optional
 from dotenv import load_dotenv
 from langchain_openai import AzureChatOpenAI
@@ -9,11 +13,14 @@ from pydantic import BaseModel
 import jwt
 from jwt.exceptions import InvalidTokenError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
 from utils.constants import FlowState
 from utils.state_manager import state_manager
 from utils.asgardeo_manager import AuthCode, asgardeo_manager
 from utils.chat_history import ChatHistory, chat_history_manager
+from utils.crew_runner import CrewRunnerBusy, crew_runner
+from utils.tool_cache import tool_response_cache
+from utils.tracing import tracer
 from fastapi.responses import JSONResponse
 
 load_dotenv()
@@ -60,37 +67,159 @@ class ChatResponse(BaseModel):
     response: Response
     frontend_state: str
 
+def _start_turn(request: ChatRequest, user_id: str, ThreadID: Optional[str]) -> str:
+    """Bind the thread to the user and record the user message. Returns the thread id."""
+    thread_id = ThreadID or request.threadId
+    if not asgardeo_manager.get_user_id_from_thread_id(thread_id):
+        asgardeo_manager.store_user_id_against_thread_id(thread_id, user_id)
+    chat_history_manager.add_user_message(thread_id, request.message)
+    return thread_id
+
+def _finish_turn(thread_id: str, crew_response) -> ChatResponse:
+    """Record the assistant turn and convert the crew output to a ChatResponse."""
+    crew_dict = crew_response.to_dict()
+    # Stored as JSON so the history renderer can pick out IDs and dates
+    chat_history_manager.add_assistant_message(
+        thread_id, json.dumps(crew_dict, default=lambda value: getattr(value, "value", str(value)))
+    )
+
+    chat_response = crew_dict.get('response', {})
+    frontend_state = crew_dict.get('frontend_state', {})
+    tool_response = chat_response.get("tool_response", {})
+    tool_response_dict = tool_response.to_dict() if hasattr(tool_response, 'to_dict') else tool_response
+    response = Response(
+        chat_response=chat_response.get("chat_response", ""),
+        tool_response=tool_response_dict
+    )
+    return ChatResponse(response=response, frontend_state=frontend_state)
+
+def _admit_crew() -> None:
+    """Reserve a crew worker slot, or answer 503 when the queue is full."""
+    try:
+        crew_runner.admit()
+    except CrewRunnerBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many conversations in progress, please try again shortly",
+            headers={"Retry-After": "5"},
+        )
+
+def _traced_crew():
+    """create_crew bound to the current time, so its trace includes the wait for a crew worker."""
+    return functools.partial(create_crew, queued_at=time.perf_counter())
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest, 
     user_id: str = Depends(get_user_from_token),
     ThreadID: Optional[str] = Header(None)
 ):
+    # Admit before recording the message, so a rejected turn leaves no trace in the history
+    _admit_crew()
     try:
-        user_message = request.message
-        thread_id = ThreadID or request.threadId
-        if not asgardeo_manager.get_user_id_from_thread_id(thread_id):
-            asgardeo_manager.store_user_id_against_thread_id(thread_id, user_id)
-        
-        chat_history_manager.add_user_message(thread_id, user_message)
-        crew_response = create_crew(user_message, thread_id)
-        crew_dict = crew_response.to_dict()
-        print(crew_dict)
-        chat_history_manager.add_assistant_message(thread_id, str(crew_dict))
-
-        chat_response = crew_dict.get('response', {})
-        frontend_state = crew_dict.get('frontend_state', {})
-        tool_response = chat_response.get("tool_response", {})
-        tool_response_dict = tool_response.to_dict() if hasattr(tool_response, 'to_dict') else tool_response
-        response = Response(
-            chat_response=chat_response.get("chat_response", ""),
-            tool_response=tool_response_dict
-        )
-        return ChatResponse(response=response, frontend_state=frontend_state)
+        try:
+            thread_id = _start_turn(request, user_id, ThreadID)
+        except Exception:
+            crew_runner.release()
+            raise
+        # Crew kickoff blocks for the whole LLM turn, so run it off the event loop
+        crew_response = await crew_runner.start(_traced_crew(), request.message, thread_id)
+        return _finish_turn(thread_id, crew_response)
     except Exception as e:
         print(e)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def _step_event(step) -> dict:
+    """Describe a crew agent step (tool call, tool result or final answer)."""
+    tool = getattr(step, "tool", None)
+    if tool:
+        return {"type": "tool_call", "tool": tool, "input": str(getattr(step, "tool_input", ""))}
+    if hasattr(step, "output"):
+        return {"type": "final_answer", "thought": getattr(step, "thought", "")}
+    return {"type": "tool_result", "result": str(getattr(step, "result", ""))}
+
+def _task_event(task_output) -> dict:
+    return {
+        "description": getattr(task_output, "description", ""),
+        "summary": getattr(task_output, "summary", ""),
+        "output": getattr(task_output, "raw", str(task_output)),
+    }
+
+@app.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    user_id: str = Depends(get_user_from_token),
+    ThreadID: Optional[str] = Header(None)
+):
+    """
+    Server-sent events variant of /chat.
+
+    Answers 503 up front when no crew slot is free. Otherwise emits
+    ``accepted`` immediately, then ``step`` and ``task`` events while the
+    crew runs, and finally ``response`` with the ChatResponse payload (or
+    ``error``). The turn is recorded even if the client disconnects first.
+    """
+    _admit_crew()
+    try:
+        thread_id = _start_turn(request, user_id, ThreadID)
+    except Exception:
+        crew_runner.release()
+        raise
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    # Crew callbacks fire on the worker thread; hand events to the loop
+    def emit(event: str, data: dict) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+
+    job = crew_runner.start(
+        _traced_crew(),
+        request.message,
+        thread_id,
+        lambda step: emit("step", _step_event(step)),
+        lambda task_output: emit("task", _task_event(task_output)),
+    )
+    # (ChatResponse, None) or (None, exception), set when the crew finishes
+    outcome: asyncio.Future = loop.create_future()
+
+    def record_turn(job: asyncio.Future) -> None:
+        try:
+            outcome.set_result((_finish_turn(thread_id, job.result()), None))
+        except (Exception, asyncio.CancelledError) as e:
+            # Reported to the client as the "error" event
+            outcome.set_result((None, e))
+
+    job.add_done_callback(record_turn)
+
+    async def events():
+        yield _sse("accepted", {"thread_id": thread_id})
+        while True:
+            next_event = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({next_event, outcome}, return_when=asyncio.FIRST_COMPLETED)
+            if next_event in done:
+                yield _sse(*next_event.result())
+                continue
+            next_event.cancel()
+            break
+        while not queue.empty():
+            yield _sse(*queue.get_nowait())
+
+        chat_response, error = outcome.result()
+        if error is None:
+            yield _sse("response", chat_response.model_dump(mode="json"))
+        else:
+            yield _sse("error", {"status": 500, "detail": str(error)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.get("/callback")
 async def callback(
     code: str,
@@ -146,4 +275,9 @@ async def callback(
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "crews": crew_runner.get_metrics(), "tool_cache": tool_response_cache.get_metrics(), "chat_history": chat_history_manager.get_metrics()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Per-stage latency histograms (request, queue, setup, task, llm, tool, http, token) for Prometheus."""
+    return PlainTextResponse(tracer.render_prometheus(), media_type="text/plain; version=0.0.4")
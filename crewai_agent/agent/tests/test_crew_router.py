@@ -0,0 +1,54 @@
+import json
+import os
+
+import pytest
+
+from utils.constants import FlowState
+from utils.crew_router import route_message
+from utils.state_manager import FlowStates
+
+CONVERSATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "conversations.json")
+
+def replay(conversation):
+    """Route every turn of a recorded conversation; returns the plans in order."""
+    plans = []
+    states = FlowStates()
+    earlier = []
+    for turn_number, turn in enumerate(conversation["turns"], start=1):
+        plans.append(route_message(turn["message"], states, 2 * turn_number - 1, earlier))
+        earlier.append(turn["message"])
+        states = FlowStates()
+        for name in turn["states_after"]:
+            states.add_state(FlowState[name])
+    return plans
+
+@pytest.fixture(scope="module")
+def conversations():
+    with open(CONVERSATIONS) as f:
+        return {conversation["name"]: conversation for conversation in json.load(f)}
+
+def test_turn_building_on_earlier_dates_keeps_summary(conversations):
+    # "I'd like a preview for the deluxe room" needs the dates and hotel from turns 1-2
+    plan = replay(conversations["search_preview_book_calendar"])[2]
+    assert plan.summarize
+    assert plan.reason == "full"
+
+def test_confirmation_and_calendar_follow_up_take_fast_path(conversations):
+    plans = replay(conversations["search_preview_book_calendar"])
+    assert [plan.reason for plan in plans[3:]] == ["booking_confirmation", "calendar_follow_up"]
+    assert not any(plan.summarize for plan in plans[3:])
+
+def test_no_self_contained_turn_follows_booking_details(conversations):
+    for conversation in conversations.values():
+        for turn_number, plan in enumerate(replay(conversation)):
+            if plan.reason == "self_contained":
+                earlier = [turn["message"] for turn in conversation["turns"][:turn_number]]
+                pytest.fail(f"{conversation['name']} turn {turn_number + 1} skipped summarization after {earlier}")
+
+def test_self_contained_only_without_open_flow_or_earlier_details():
+    message = "Show me all Gardeo hotels near the beach please"
+    assert route_message(message, FlowStates(), 3, ["Hello there"]).reason == "self_contained"
+    assert route_message(message, FlowStates(), 3, ["Stay from 2025-03-10 for 2 nights"]).summarize
+    open_flow = FlowStates()
+    open_flow.add_state(FlowState.FETCHED_HOTEL)
+    assert route_message(message, open_flow, 3, ["Hello there"]).summarize
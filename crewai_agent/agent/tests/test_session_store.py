@@ -0,0 +1,81 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.chat_history import ChatHistoryManager
+from utils.session_store import MemorySessionStore, SessionNamespace, SQLiteSessionStore
+
+THREADS = 8
+
+@pytest.fixture(params=["memory", "sqlite"])
+def stores(request, tmp_path):
+    """Stores sharing one set of data; for SQLite two instances on one file, like two workers."""
+    if request.param == "memory":
+        return [MemorySessionStore()]
+    path = str(tmp_path / "sessions.db")
+    return [SQLiteSessionStore(path, flush_interval=0.01) for _ in range(2)]
+
+def test_concurrent_appends_keep_every_item(stores):
+    barrier = threading.Barrier(THREADS)
+
+    def append(n):
+        barrier.wait(timeout=10)
+        return stores[n % len(stores)].append("chat_messages", "thread", {"n": n})
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        seqs = list(executor.map(append, range(THREADS)))
+
+    assert sorted(seqs) == list(range(1, THREADS + 1))
+    for store in stores:
+        items = store.items("chat_messages", "thread")
+        assert [seq for seq, _ in items] == list(range(1, THREADS + 1))
+        assert sorted(item["n"] for _, item in items) == list(range(THREADS))
+        assert store.items("chat_messages", "thread", after=THREADS - 2) == items[-2:]
+
+def test_append_keeps_the_last_items(stores):
+    for n in range(5):
+        stores[0].append("chat_messages", "thread", n, keep=3)
+    assert stores[-1].items("chat_messages", "thread") == [(3, 2), (4, 3), (5, 4)]
+
+def test_sweep_prunes_registered_namespaces(stores):
+    store = stores[0]
+    by_age = SessionNamespace(store, "thread_users", max_age_seconds=0.2)
+    by_count = SessionNamespace(store, "oauth_states", max_entries=2)
+    kept = SessionNamespace(store, "auth_tokens", max_age_seconds=None)
+    by_age["old"] = "user"
+    by_age.append("old-chat", "message")
+    kept["token"] = "value"
+    for key in ("a", "b", "c"):
+        by_count[key] = key
+    time.sleep(0.3)
+    by_age["new"] = "user"
+
+    assert store.sweep() == 3
+    assert "old" not in by_age and by_age.items("old-chat") == []
+    assert "new" in by_age
+    assert "a" not in by_count and "b" in by_count and "c" in by_count
+    assert "token" in kept
+
+def test_chat_history_is_shared_across_managers(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    managers = [
+        ChatHistoryManager(sweep_interval_seconds=0, store=SQLiteSessionStore(path, flush_interval=0.01))
+        for _ in range(2)
+    ]
+    managers[0].add_user_message("thread", "hello")
+    managers[1].add_assistant_message("thread", "hi")
+    barrier = threading.Barrier(THREADS)
+
+    def add(n):
+        barrier.wait(timeout=10)
+        managers[n % 2].add_user_message("thread", f"message {n}")
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        list(executor.map(add, range(THREADS)))
+
+    for manager in managers:
+        messages = manager.get_chat_history("thread").get_messages()
+        assert messages[:2] == [{"role": "user", "content": "hello"}, {"role": "assistant", "content": "hi"}]
+        assert sorted(m["content"] for m in messages[2:]) == sorted(f"message {n}" for n in range(THREADS))
@@ -0,0 +1,58 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.constants import FlowState
+from utils.session_store import MemorySessionStore, SQLiteSessionStore
+from utils.state_manager import FLOW_STATE_BITS, FlowStates, StateManager
+
+@pytest.fixture(params=["memory", "sqlite"])
+def managers(request, tmp_path):
+    """State managers sharing one store; for SQLite two store instances on one file, like two workers."""
+    if request.param == "memory":
+        store = MemorySessionStore()
+        return [StateManager(store), StateManager(store)]
+    path = str(tmp_path / "sessions.db")
+    return [StateManager(SQLiteSessionStore(path, flush_interval=0.01)) for _ in range(2)]
+
+def test_concurrent_add_state_keeps_every_state(managers):
+    states = list(FlowState)
+    for round_number in range(10):
+        thread_id = f"thread-{round_number}"
+        barrier = threading.Barrier(len(states))
+
+        def add(n):
+            barrier.wait(timeout=10)
+            managers[n % len(managers)].add_state(thread_id, states[n])
+
+        with ThreadPoolExecutor(max_workers=len(states)) as executor:
+            list(executor.map(add, range(len(states))))
+
+        for manager in managers:
+            flow_states = manager.get_flow_states(thread_id)
+            assert flow_states.mask == sum(FLOW_STATE_BITS.values())
+            assert sorted(flow_states.get_states(), key=states.index) == states
+
+def test_add_state_folds_in_a_buffered_write(tmp_path):
+    # A long flush interval keeps the plain write buffered when add_state runs
+    manager = StateManager(SQLiteSessionStore(str(tmp_path / "sessions.db"), flush_interval=60))
+    buffered = FlowStates()
+    buffered.add_state(FlowState.FETCHED_HOTELS)
+    manager.thread_states["thread"] = buffered.to_dict()
+    manager.add_state("thread", FlowState.FETCHED_ROOM)
+    assert manager.get_states("thread") == [FlowState.FETCHED_HOTELS, FlowState.FETCHED_ROOM]
+
+def test_states_string_names_the_current_state():
+    flow_states = FlowStates()
+    for state in (FlowState.FETCHED_ROOM, FlowState.BOOKING_PREVIEW_INITIATED, FlowState.FETCHED_HOTELS):
+        flow_states.add_state(state)
+    rendered = flow_states.get_states_as_string()
+    assert rendered.endswith("(current: FETCHED_HOTELS)")
+
+    reordered = FlowStates()
+    for state in (FlowState.FETCHED_HOTELS, FlowState.FETCHED_ROOM, FlowState.BOOKING_PREVIEW_INITIATED):
+        reordered.add_state(state)
+    assert reordered.get_states_as_string().endswith("(current: BOOKING_PREVIEW_INITIATED)")
+    assert reordered.get_states_as_string() != rendered
+    assert FlowStates().get_states_as_string() == ""
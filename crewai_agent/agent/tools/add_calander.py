@@ -8,6 +8,7 @@ import requests
 from schemas import CrewOutput, Response
 from utils.asgardeo_manager import asgardeo_manager
 from utils.constants import FrontendState
+from utils.tracing import traced_tool_run, tracer
 
 class AddCalanderToolInput(BaseModel):
     """Input schema for AddCalanderTool."""
@@ -25,6 +26,7 @@ class AddCalanderTool(BaseTool):
         super().__init__()
         self.thread_id = thread_id
 
+    @traced_tool_run
     def _run(self, title: str, start: date, end: date) -> str:
         try:
             # Get the access token for authentication
@@ -50,11 +52,13 @@ class AddCalanderTool(BaseTool):
             }
 
             # Make the API request
-            response = requests.post(
-                "https://www.googleapis.com/calendar/v3/calendars/primary/events",
-                headers=headers,
-                json=event
-            )
+            with tracer.span("google_calendar_insert", "http") as span:
+                response = requests.post(
+                    "https://www.googleapis.com/calendar/v3/calendars/primary/events",
+                    headers=headers,
+                    json=event
+                )
+                span.set(status=response.status_code)
 
             # Check the response
             if response.status_code == 200:
@@ -1,14 +1,15 @@
 from datetime import date
-import os
 from typing import Type, Optional
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-import requests
 
 from schemas import CrewOutput, Response
 from utils.state_manager import state_manager
 from utils.asgardeo_manager import asgardeo_manager
+from utils.hotel_api_client import hotel_api_client
+from utils.tool_cache import tool_response_cache
 from utils.constants import FlowState, FrontendState
+from utils.tracing import traced_tool_run
 
 class BookingToolInput(BaseModel):
     """Input schema for BookRoomsTool."""
@@ -28,10 +29,11 @@ class BookingTool(BaseTool):
         super().__init__()
         self.thread_id = thread_id
 
+    @traced_tool_run
     def _run(self, room_id: int, hotel_id:int, check_in: date, check_out: date) -> str:
         try:
 
-            if FlowState.BOOKING_PREVIEW_INITIATED not in state_manager.get_states(self.thread_id):
+            if not state_manager.has_state(self.thread_id, FlowState.BOOKING_PREVIEW_INITIATED):
                 raise Exception("Booking preview not completed")
 
             state_manager.add_state(self.thread_id, FlowState.BOOKING_PREVIEW_COMPLETED)
@@ -41,11 +43,6 @@ class BookingTool(BaseTool):
             access_token = asgardeo_manager.get_user_token(user_id, ["openid", "create_bookings"])
             
             # Prepare the booking request
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json"
-            }
-            
             booking_data = {
                 "user_id": user_id,
                 "room_id": room_id,
@@ -54,10 +51,12 @@ class BookingTool(BaseTool):
                 "check_out": check_out.isoformat()
             }
 
-            api_response = requests.post(f"{os.environ['HOTEL_API_BASE_URL']}/bookings", json=booking_data, headers=headers)
+            api_response = hotel_api_client.post("/bookings", token=access_token, json=booking_data, name="create_booking")
             
             if (api_response.status_code == 200):
                 booking_details = api_response.json()
+                # A new booking can change what the catalog reports
+                tool_response_cache.invalidate()
                 response_dict = {
                     "booking_id": booking_details["id"],
                     "total_price": booking_details["total_price"],
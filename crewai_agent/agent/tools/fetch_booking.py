@@ -1,14 +1,14 @@
 from datetime import date
-import os
 from typing import Type, Optional, Optional, Union
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-import requests
 from utils.state_manager import state_manager
 from utils.constants import FlowState, FrontendState
 
 from schemas import CrewOutput, Response
 from utils.asgardeo_manager import asgardeo_manager
+from utils.hotel_api_client import hotel_api_client
+from utils.tracing import traced_tool_run
 
 class FetchBookingsToolInput(BaseModel):
     """Input schema for FetchBookingsTool."""
@@ -24,6 +24,7 @@ class FetchBookingsTool(BaseTool):
         super().__init__()
         self.thread_id = thread_id
 
+    @traced_tool_run
     def _run(self, booking_id: Union[int, str]) -> str:
 
         try: 
@@ -31,11 +32,7 @@ class FetchBookingsTool(BaseTool):
         except Exception as e:
             raise Exception("Failed to get token. Retry the operation.")
 
-        headers = {
-            'Authorization': f'Bearer {token}'
-        }
-        
-        api_response = requests.get(f"{os.environ['HOTEL_API_BASE_URL']}/bookings/{booking_id}", headers=headers)
+        api_response = hotel_api_client.get(f"/bookings/{booking_id}", token=token, name="fetch_booking")
         rooms_data = api_response.json()
 
         state_manager.add_state(self.thread_id, FlowState.FETCHED_BOOKINGS)
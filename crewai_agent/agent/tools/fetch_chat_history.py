@@ -6,6 +6,7 @@ from utils.chat_history import chat_history_manager, ChatHistory
 
 from schemas import CrewOutput, Response
 from utils.asgardeo_manager import asgardeo_manager
+from utils.tracing import traced_tool_run
 
 class FetchChatHistoryToolInput(BaseModel):
     """Input schema for FetchChatHistoryTool."""
@@ -20,7 +21,8 @@ class FetchChatHistoryTool(BaseTool):
         super().__init__()
         self.thread_id = thread_id
 
+    @traced_tool_run
     def _run(self) -> str:
 
         chat_history: ChatHistory = chat_history_manager.get_chat_history(self.thread_id)
-        return chat_history.get_messages_as_string()
+        return chat_history.render()
@@ -1,14 +1,15 @@
 from datetime import date
-import os
 from typing import Type, Optional, Optional, Union
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-import requests
 from utils.state_manager import state_manager
 from utils.constants import FlowState, FrontendState
 
 from schemas import CrewOutput, Response
 from utils.asgardeo_manager import asgardeo_manager
+from utils.hotel_api_client import hotel_api_client
+from utils.tool_cache import tool_response_cache
+from utils.tracing import traced_tool_run
 
 class FetchHotelToolInput(BaseModel):
     """Input schema for FetchHotelTool."""
@@ -24,26 +25,27 @@ class FetchHotelTool(BaseTool):
         super().__init__()
         self.thread_id = thread_id
 
+    @traced_tool_run
     def _run(self, hotel_id: Union[int, str]) -> str:
 
         if not hotel_id:
             raise ValueError("hotel_id is required. If you don't have a room_id, you can fetch all hotels using the FetchHotelsTool.")
 
-        try: 
-            token = asgardeo_manager.get_app_token(["read_rooms"])
-        except Exception as e:
-            raise Exception("Failed to get token. Retry the operation.")
+        cache_args = (str(hotel_id).strip(),)
+        rooms_data = tool_response_cache.get("fetch_hotel", cache_args)
+        if rooms_data is None:
+            try: 
+                token = asgardeo_manager.get_app_token(["read_rooms"])
+            except Exception as e:
+                raise Exception("Failed to get token. Retry the operation.")
 
-        headers = {
-            'Authorization': f'Bearer {token}'
-        }
-        
-        api_response = requests.get(f"{os.environ['HOTEL_API_BASE_URL']}/hotels/{hotel_id}", headers=headers)
+            api_response = hotel_api_client.get(f"/hotels/{hotel_id}", token=token, name="fetch_hotel")
 
-        if api_response.status_code != 200:
-            raise Exception(f"Failed to fetch hotel with id {hotel_id}")
+            if api_response.status_code != 200:
+                raise Exception(f"Failed to fetch hotel with id {hotel_id}")
 
-        rooms_data = api_response.json()
+            rooms_data = api_response.json()
+            tool_response_cache.put("fetch_hotel", cache_args, rooms_data)
 
         state_manager.add_state(self.thread_id, FlowState.FETCHED_HOTEL)
         
@@ -1,14 +1,15 @@
 from datetime import date
-import os
 from typing import Type, Optional, Optional
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-import requests
 from utils.constants import FlowState, FrontendState
 
 from schemas import CrewOutput, Response
 from utils.asgardeo_manager import asgardeo_manager
+from utils.hotel_api_client import hotel_api_client
+from utils.tool_cache import tool_response_cache
 from utils.state_manager import state_manager
+from utils.tracing import traced_tool_run
 
 class FetchHotelsToolInput(BaseModel):
     """Input schema for FetchHotelsTool."""
@@ -23,19 +24,20 @@ class FetchHotelsTool(BaseTool):
         super().__init__()
         self.thread_id = thread_id
 
+    @traced_tool_run
     def _run(self) -> str:
 
-        try: 
-            token = asgardeo_manager.get_app_token(["read_hotels"])
-        except Exception as e:
-            raise Exception("Failed to get token. Retry the operation.")
-
-        headers = {
-            'Authorization': f'Bearer {token}'
-        }
-        
-        api_response = requests.get(f"{os.environ['HOTEL_API_BASE_URL']}/hotels", headers=headers)
-        hotels_data = api_response.json()
+        hotels_data = tool_response_cache.get("fetch_hotels")
+        if hotels_data is None:
+            try: 
+                token = asgardeo_manager.get_app_token(["read_hotels"])
+            except Exception as e:
+                raise Exception("Failed to get token. Retry the operation.")
+
+            api_response = hotel_api_client.get("/hotels", token=token, name="fetch_hotels")
+            hotels_data = api_response.json()
+            if api_response.status_code == 200:
+                tool_response_cache.put("fetch_hotels", (), hotels_data)
 
         state_manager.add_state(self.thread_id, FlowState.FETCHED_HOTELS)
         
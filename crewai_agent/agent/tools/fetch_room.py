@@ -1,14 +1,15 @@
 from datetime import date
-import os
 from typing import Type, Optional, Optional, Union
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-import requests
 from utils.state_manager import state_manager
 from utils.constants import FlowState, FrontendState
 
 from schemas import CrewOutput, Response
 from utils.asgardeo_manager import asgardeo_manager
+from utils.hotel_api_client import hotel_api_client
+from utils.tool_cache import tool_response_cache
+from utils.tracing import traced_tool_run
 
 class FetchRoomToolInput(BaseModel):
     """Input schema for FetchRoomTool."""
@@ -24,22 +25,24 @@ class FetchRoomTool(BaseTool):
         super().__init__()
         self.thread_id = thread_id
 
+    @traced_tool_run
     def _run(self, room_id: Union[int, str]) -> str:
 
         if not room_id:
             raise ValueError("room_id is required. If you don't have a room_id, you can fetch all rooms using the FetchHotelTool.")
 
-        try: 
-            token = asgardeo_manager.get_app_token(["read_rooms"])
-        except Exception as e:
-            raise Exception("Failed to get token. Retry the operation.")
-
-        headers = {
-            'Authorization': f'Bearer {token}'
-        }
-        
-        api_response = requests.get(f"{os.environ['HOTEL_API_BASE_URL']}/rooms/{room_id}", headers=headers)
-        rooms_data = api_response.json()
+        cache_args = (str(room_id).strip(),)
+        rooms_data = tool_response_cache.get("fetch_room", cache_args)
+        if rooms_data is None:
+            try: 
+                token = asgardeo_manager.get_app_token(["read_rooms"])
+            except Exception as e:
+                raise Exception("Failed to get token. Retry the operation.")
+
+            api_response = hotel_api_client.get(f"/rooms/{room_id}", token=token, name="fetch_room")
+            rooms_data = api_response.json()
+            if api_response.status_code == 200:
+                tool_response_cache.put("fetch_room", cache_args, rooms_data)
 
         state_manager.add_state(self.thread_id, FlowState.FETCHED_ROOM)
         
@@ -1,15 +1,15 @@
 from datetime import date
 import json
-import os
 from typing import Type, Optional, Union
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-import requests
 from utils.state_manager import state_manager
 from utils.constants import FlowState, FrontendState
 
 from schemas import CrewOutput, Response
 from utils.asgardeo_manager import asgardeo_manager
+from utils.hotel_api_client import hotel_api_client
+from utils.tracing import traced_tool_run
 
 class BookingPreviewToolInput(BaseModel):
     """Input schema for BookingPreviewTool."""
@@ -28,6 +28,7 @@ class BookingPreviewTool(BaseTool):
         super().__init__()
         self.thread_id = thread_id
 
+    @traced_tool_run
     def _run(self, room_id: Union[int, str], check_in: date, check_out: date) -> str:
         try:
 
@@ -50,27 +51,20 @@ class BookingPreviewTool(BaseTool):
                 raise Exception("Failed to get token. Retry the BookingPreview operation.")
 
             # Prepare the booking request
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json"
-            }
-            
             booking_preview_data = {
                 "room_id": room_id,
                 "check_in": check_in.isoformat(),
                 "check_out": check_out.isoformat()
             }
 
-            try: 
-                token = asgardeo_manager.get_app_token(["read_rooms"])
-            except Exception as e:
-                raise
-
-            headers = {
-                'Authorization': f'Bearer {token}'
-            }
-            
-            api_response = requests.post(f"{os.environ['HOTEL_API_BASE_URL']}/bookings/preview", json=booking_preview_data, headers=headers)
+            # Preview is read-only, so it is safe to retry
+            api_response = hotel_api_client.post(
+                "/bookings/preview",
+                token=access_token,
+                json=booking_preview_data,
+                name="booking_preview",
+                idempotent=True,
+            )
             
             if (api_response.status_code == 200):
                 booking_preview = api_response.json()
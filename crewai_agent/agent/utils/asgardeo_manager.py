@@ -1,16 +1,36 @@
 import logging
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, List, Optional
 import uuid
 import requests
 from pydantic import BaseModel
 
+from utils.session_store import SessionNamespace, SessionStore, session_store
+from utils.tracing import tracer
+
 logger = logging.getLogger(__name__)
 
+# Refresh app tokens once 90% of their lifetime has passed, but never later
+# than this many seconds before they expire.
+MAX_TOKEN_REFRESH_MARGIN_SECONDS = 60
+# Bound on an app token request, and on waiting for one another caller started
+APP_TOKEN_TIMEOUT_SECONDS = float(os.getenv("APP_TOKEN_TIMEOUT_S", "10"))
+
 class AuthToken(BaseModel):
     id: str
     scopes: List[str]
     token: str
+    expires_at: Optional[float] = None
+    refresh_at: Optional[float] = None
+
+    def is_expired(self) -> bool:
+        return self.expires_at is not None and time.time() >= self.expires_at
+
+    def needs_refresh(self) -> bool:
+        return self.refresh_at is not None and time.time() >= self.refresh_at
 
 class AuthCode(BaseModel):
     state: str
@@ -23,7 +43,7 @@ class AsgardeoManager:
     Manages OAuth2 authentication flow and token management
     """
 
-    def __init__(self):
+    def __init__(self, store: Optional[SessionStore] = None):
         # Initialize OAuth2 configuration
         self.client_id = os.environ['CLIENT_ID']
         self.client_secret = os.environ['CLIENT_SECRET']
@@ -32,11 +52,20 @@ class AsgardeoManager:
         self.redirect_uri = os.environ['REDIRECT_URI']
         self.google_redirect_uri = os.environ['GOOGLE_REDIRECT_URI']
 
-        self.auth_codes: Dict[str, AuthCode] = {}  # Store AuthCode by session_id
-        self.auth_tokens: Dict[str, AuthToken] = {}  # Store AuthToken by token_id
-        self.thread_user_map: Dict[str, str] = {}  # Store user_id against thread_id
-        self.state_thread_map: Dict[str, str] = {}  # Store thread_id against state
-        self.state_mapping: Dict[str, AuthCode] = {}
+        # Kept in the session store so that any worker can serve the OAuth
+        # callback and later requests for the thread
+        store = store or session_store
+        self.auth_codes = SessionNamespace(store, "auth_codes", AuthCode)  # Store AuthCode by session_id
+        self.auth_tokens = SessionNamespace(store, "auth_tokens", AuthToken)  # Store AuthToken by token_id
+        self.thread_user_map = SessionNamespace(store, "thread_users")  # Store user_id against thread_id
+        self.state_thread_map = SessionNamespace(store, "oauth_state_threads")  # Store thread_id against state
+        self.state_mapping = SessionNamespace(store, "oauth_states", AuthCode)
+
+        # In-flight app token fetches by token key, so concurrent callers for
+        # the same scopes share one request to the token endpoint
+        self._token_fetches: Dict[str, Future] = {}
+        self._token_fetches_lock = threading.Lock()
+        self._token_refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="app-token-refresh")
 
     def store_auth_code(self, user_id: str, code: str):
             """Store authentication code and user_id"""
@@ -188,37 +217,96 @@ class AsgardeoManager:
             print(e)
             raise        
 
-    def fetch_app_token(self, scopes: List[str]) -> str:
+    def fetch_app_token(self, scopes: List[str]) -> AuthToken:
         """
-        Get an access token for the app
+        Get an access token for the app, along with its expiry
         """
-        try:
-            response = requests.post(
-                self.token_url,
-                data={
-                    "grant_type": "client_credentials",
-                    "scope": " ".join(scopes),
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret
-                },
-                verify=False
-            )
-            data = response.json()
-            return data.get("access_token")
-        except Exception as e:
-            raise        
+        scopes = self.normalize_scopes(scopes)
+        requested_at = time.time()
+        response = requests.post(
+            self.token_url,
+            data={
+                "grant_type": "client_credentials",
+                "scope": " ".join(scopes),
+                "client_id": self.client_id,
+                "client_secret": self.client_secret
+            },
+            verify=False,
+            timeout=APP_TOKEN_TIMEOUT_SECONDS
+        )
+        data = response.json()
+        access_token = data.get("access_token")
+        if not access_token:
+            raise ValueError(f"Token endpoint returned no access token: {data.get('error', response.status_code)}")
+        token = AuthToken(id="m2m", scopes=scopes, token=access_token)
+        expires_in = data.get("expires_in")
+        if expires_in:
+            expires_in = float(expires_in)
+            token.expires_at = requested_at + expires_in
+            token.refresh_at = token.expires_at - min(expires_in * 0.1, MAX_TOKEN_REFRESH_MARGIN_SECONDS)
+        return token
 
     def get_app_token(self, scopes: List[str]) -> str:
         """
         Get valid m2m token.
+
+        Tokens are refreshed on access: the first call after a cached token's
+        refresh_at returns it and starts fetching a new one on the refresher
+        pool, so later calls get the new token. Nothing refreshes tokens that
+        are not requested; an expired or missing token is fetched before
+        returning.
         """
-        token_entry:AuthToken = self.auth_tokens.get(self.get_token_key("m2m", scopes))
-        if token_entry:
+        token_key = self.get_token_key("m2m", scopes)
+        token_entry: AuthToken = self.auth_tokens.get(token_key)
+        if token_entry and not token_entry.is_expired():
+            if token_entry.needs_refresh():
+                self._fetch_app_token_once(token_key, scopes, wait=False)
             return token_entry.token
-        fetch_token = self.fetch_app_token(scopes)
-        token = AuthToken(id="m2m", scopes=scopes, token=fetch_token)
-        self.auth_tokens[self.get_token_key("m2m", scopes)] = token
-        return fetch_token
+        return self._fetch_app_token_once(token_key, scopes, wait=True).token
+
+    def _fetch_app_token_once(self, token_key: str, scopes: List[str], wait: bool) -> Optional[AuthToken]:
+        """
+        Start a token fetch unless one is already in flight for token_key.
+        With wait=True, block until the (possibly shared) fetch finishes, for
+        at most APP_TOKEN_TIMEOUT_SECONDS when another caller started it.
+        """
+        with self._token_fetches_lock:
+            future = self._token_fetches.get(token_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._token_fetches[token_key] = future
+        if owner:
+            if wait:
+                self._run_app_token_fetch(token_key, scopes, future)
+            else:
+                try:
+                    self._token_refresher.submit(self._run_app_token_fetch, token_key, scopes, future)
+                except RuntimeError as e:
+                    # Pool shut down; fail the fetch so it is not left in flight
+                    self._finish_app_token_fetch(token_key, future, exception=e)
+        return future.result(timeout=APP_TOKEN_TIMEOUT_SECONDS) if wait else None
+
+    def _run_app_token_fetch(self, token_key: str, scopes: List[str], future: Future) -> None:
+        try:
+            with tracer.span("app_token", "token", scopes=token_key):
+                token = self.fetch_app_token(scopes)
+            self.auth_tokens[token_key] = token
+        except Exception as e:
+            logger.warning("Failed to fetch app token for %s: %s", token_key, e)
+            self._finish_app_token_fetch(token_key, future, exception=e)
+        else:
+            self._finish_app_token_fetch(token_key, future, token=token)
+
+    def _finish_app_token_fetch(self, token_key: str, future: Future, token: Optional[AuthToken] = None, exception: Optional[BaseException] = None) -> None:
+        """Clear the in-flight entry, then resolve it, so the next caller starts a new fetch."""
+        with self._token_fetches_lock:
+            if self._token_fetches.get(token_key) is future:
+                del self._token_fetches[token_key]
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(token)
     
     def get_user_token(self, user_id: str, scopes: List[str]) -> str:
         """
@@ -240,11 +328,18 @@ class AsgardeoManager:
             return token_entry.token
         return None    
     
+    @staticmethod
+    def normalize_scopes(scopes: List[str]) -> List[str]:
+        """
+        Deduplicate and sort scopes so the same scope set always maps to the same key
+        """
+        return sorted(set(scopes))
+
     def get_token_key(self, id: str, scopes: List[str]) -> str:
         """
         Get token key from id and scopes
         """
-        return id+'_'+"_".join(scopes)
+        return id+'_'+"_".join(self.normalize_scopes(scopes))
     
     def store_user_id_against_thread_id(self, thread_id: str, user_id: str):
         """
@@ -1,14 +1,27 @@
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import logging
-from threading import Lock
+import os
+import time
+from threading import Lock, Thread
+
+from utils.history_compactor import compact_message, estimate_tokens
+from utils.session_store import SessionNamespace, SessionStore, session_store
+
+logger = logging.getLogger(__name__)
+
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1500"))
+# Messages kept per thread
+MAX_MESSAGES = 100
 
 @dataclass
 class Message:
     role: str
     content: str
     timestamp: datetime = field(default_factory=datetime.now)
+    _compact: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if not self.content.strip():
@@ -16,16 +29,42 @@ class Message:
         if self.role not in ["user", "assistant"]:
             raise ValueError("Invalid role. Must be 'user' or 'assistant'")
 
+    def compact(self) -> str:
+        """Compact rendering of the message, computed once."""
+        if self._compact is None:
+            self._compact = compact_message(self.role, self.content)
+        return self._compact
+
+    def to_dict(self) -> Dict:
+        return {"role": self.role, "content": self.content, "timestamp": self.timestamp.isoformat()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Message":
+        return cls(role=data["role"], content=data["content"], timestamp=datetime.fromisoformat(data["timestamp"]))
+
 @dataclass
 class ChatHistory:
     messages: List[Message] = field(default_factory=list)
-    max_messages: int = 100
+    max_messages: int = MAX_MESSAGES
+    # Bumped on every change; keys the cached rendering. With a shared store
+    # it is the sequence number of the last stored message.
+    version: int = field(default=0, repr=False, compare=False)
+    _rendered: Optional[Tuple[int, int, str]] = field(default=None, repr=False, compare=False)
     
     def add_message(self, role: str, content: str) -> None:
         """Add a message with validation and message limit enforcement"""
+        self._append(Message(role=role, content=content))
+        self.version += 1
+
+    def add_stored_message(self, seq: int, message: Message) -> None:
+        """Add a message read from the shared store; its sequence number becomes the version."""
+        self._append(message)
+        self.version = seq
+
+    def _append(self, message: Message) -> None:
         if len(self.messages) >= self.max_messages:
             self.messages.pop(0)  # Remove oldest message
-        self.messages.append(Message(role=role, content=content))
+        self.messages.append(message)
 
     def add_user_message(self, message: str) -> None:
         self.add_message("user", message)
@@ -41,52 +80,150 @@ class ChatHistory:
             f"{msg.role.capitalize()}: {msg.content}" for msg in self.messages
         )
 
+    def render(self, token_budget: int = CHAT_HISTORY_TOKEN_BUDGET) -> str:
+        """
+        Render the most recent messages in compact form within token_budget.
+
+        Tool payloads are reduced to IDs, names, dates and prices (see
+        history_compactor). Each message is compacted once, and the full
+        rendering is cached until the history changes.
+        """
+        rendered = self._rendered
+        if rendered is not None and rendered[:2] == (self.version, token_budget):
+            return rendered[2]
+        messages = list(self.messages)
+        lines: List[str] = []
+        used = 0
+        for message in reversed(messages):
+            line = message.compact()
+            cost = estimate_tokens(line) + 1
+            if lines and used + cost > token_budget:
+                break
+            if not lines and cost > token_budget:
+                # Always keep the newest message, cut to the budget
+                line = line[:token_budget * 4]
+            lines.append(line)
+            used += cost
+        omitted = len(messages) - len(lines)
+        if omitted:
+            lines.append(f"({omitted} earlier messages omitted)")
+        text = "\n".join(reversed(lines))
+        self._rendered = (self.version, token_budget, text)
+        return text
+
 class ChatHistoryManager:
-    def __init__(self, max_threads: int = 1000, thread_timeout_hours: int = 24):
-        self.chat_histories: Dict[str, ChatHistory] = {}
+    """
+    Chat histories per thread, evicted by idle time and by count.
+
+    ``chat_histories`` is kept in least-recently-used order (every access
+    moves the thread to the end), so the front is also the thread that has
+    been idle longest. Expired threads are popped from the front until the
+    first live one, and once ``max_threads`` is reached the front thread is
+    evicted. Both are O(1) per evicted thread, with no rescans. A
+    background sweeper drops idle threads every ``sweep_interval_seconds``.
+
+    With a shared session store the local histories act as a cache. Every
+    message is appended to the store as a row of its own, so concurrent
+    turns of a thread (also in other workers) never overwrite each other,
+    and each access applies the messages stored after the local version.
+    The store sweeps its copy with the same timeout and thread limit.
+    """
+
+    def __init__(self, max_threads: int = 100000, thread_timeout_hours: int = 24, sweep_interval_seconds: float = 60, store: Optional[SessionStore] = None):
+        self.chat_histories: "OrderedDict[str, ChatHistory]" = OrderedDict()
         self.max_threads = max_threads
         self.thread_timeout_hours = thread_timeout_hours
         self.lock = Lock()
-        self.last_access: Dict[str, datetime] = {}
+        # Monotonic time of the last access; ordered the same way as chat_histories
+        self.last_access: Dict[str, float] = {}
+        self._evicted = 0
+        self._expired = 0
+        self._stored_messages: Optional[SessionNamespace] = None
+        if store is not None and store.shared:
+            self._stored_messages = SessionNamespace(
+                store, "chat_messages", max_age_seconds=thread_timeout_hours * 3600, max_entries=max_threads
+            )
+        if sweep_interval_seconds > 0:
+            Thread(target=self._sweep_loop, args=(sweep_interval_seconds,), daemon=True, name="chat-history-sweeper").start()
+
+    def _sweep_loop(self, interval: float) -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                with self.lock:
+                    self._cleanup_old_threads()
+            except Exception:
+                logger.exception("Chat history sweep failed")
 
     def _cleanup_old_threads(self) -> None:
-        """Remove threads that haven't been accessed in thread_timeout_hours"""
-        current_time = datetime.now()
-        with self.lock:
-            threads_to_remove = [
-                thread_id for thread_id, last_access in self.last_access.items()
-                if (current_time - last_access).total_seconds() > self.thread_timeout_hours * 3600
-            ]
-            for thread_id in threads_to_remove:
-                del self.chat_histories[thread_id]
-                del self.last_access[thread_id]
+        """Remove threads that haven't been accessed in thread_timeout_hours. Caller holds self.lock."""
+        cutoff = time.monotonic() - self.thread_timeout_hours * 3600
+        while self.chat_histories:
+            thread_id = next(iter(self.chat_histories))
+            if self.last_access[thread_id] > cutoff:
+                break
+            self.chat_histories.popitem(last=False)
+            del self.last_access[thread_id]
+            self._expired += 1
 
     def get_chat_history(self, thread_id: str) -> ChatHistory:
+        chat_history = self._get_local_chat_history(thread_id)
+        if self._stored_messages is None:
+            return chat_history
+        stored = self._stored_messages.items(thread_id, after=chat_history.version)
+        if not stored:
+            return chat_history
+        if chat_history.version and stored[0][0] != chat_history.version + 1:
+            # Messages newer than the local copy were already trimmed; rebuild it
+            stored = self._stored_messages.items(thread_id)
+            chat_history = ChatHistory()
+        with self.lock:
+            for seq, message in stored:
+                # Another request may have applied some of them meanwhile
+                if seq > chat_history.version:
+                    chat_history.add_stored_message(seq, Message.from_dict(message))
+            if thread_id in self.chat_histories:
+                self.chat_histories[thread_id] = chat_history
+        return chat_history
+
+    def _get_local_chat_history(self, thread_id: str) -> ChatHistory:
         with self.lock:
-            if len(self.chat_histories) >= self.max_threads:
-                self._cleanup_old_threads()
+            chat_history = self.chat_histories.get(thread_id)
+            if chat_history is None:
                 if len(self.chat_histories) >= self.max_threads:
-                    raise RuntimeError("Maximum number of active threads reached")
-                
-            if thread_id not in self.chat_histories:
-                self.chat_histories[thread_id] = ChatHistory()
-            
-            self.last_access[thread_id] = datetime.now()
-            return self.chat_histories[thread_id]
+                    self._cleanup_old_threads()
+                while len(self.chat_histories) >= self.max_threads:
+                    evicted, _ = self.chat_histories.popitem(last=False)
+                    del self.last_access[evicted]
+                    self._evicted += 1
+                chat_history = self.chat_histories[thread_id] = ChatHistory()
+            else:
+                self.chat_histories.move_to_end(thread_id)
+            self.last_access[thread_id] = time.monotonic()
+            return chat_history
+
+    def _add_message(self, thread_id: str, role: str, content: str) -> None:
+        if self._stored_messages is None:
+            self.get_chat_history(thread_id).add_message(role, content)
+            return
+        self._stored_messages.append(thread_id, Message(role=role, content=content).to_dict(), keep=MAX_MESSAGES)
+        # Picks up the new message along with any appended by other workers
+        self.get_chat_history(thread_id)
 
     def add_user_message(self, thread_id: str, message: str) -> None:
-        chat_history = self.get_chat_history(thread_id)
-        chat_history.add_user_message(message)
+        self._add_message(thread_id, "user", message)
 
     def add_assistant_message(self, thread_id: str, message: str) -> None:
-        chat_history = self.get_chat_history(thread_id)
-        chat_history.add_assistant_message(message)
+        self._add_message(thread_id, "assistant", message)
 
     def get_thread_messages_as_string(self, thread_id: str) -> str:
+        if self._stored_messages is not None and self._stored_messages.get(thread_id) is not None:
+            return self.get_chat_history(thread_id).get_messages_as_string()
         with self.lock:
             if thread_id not in self.chat_histories:
                 return ""
-            self.last_access[thread_id] = datetime.now()
+            self.chat_histories.move_to_end(thread_id)
+            self.last_access[thread_id] = time.monotonic()
             return self.chat_histories[thread_id].get_messages_as_string()
 
     def remove_thread(self, thread_id: str) -> None:
@@ -94,6 +231,21 @@ class ChatHistoryManager:
         with self.lock:
             self.chat_histories.pop(thread_id, None)
             self.last_access.pop(thread_id, None)
+        if self._stored_messages is not None:
+            self._stored_messages.pop(thread_id)
+
+    def get_metrics(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "threads": len(self.chat_histories),
+                "max_threads": self.max_threads,
+                "expired": self._expired,
+                "evicted": self._evicted,
+            }
 
 # Single instance for application-wide use
-chat_history_manager = ChatHistoryManager()
+chat_history_manager = ChatHistoryManager(
+    max_threads=int(os.getenv("CHAT_HISTORY_MAX_THREADS", "100000")),
+    thread_timeout_hours=int(os.getenv("CHAT_HISTORY_THREAD_TIMEOUT_HOURS", "24")),
+    store=session_store,
+)
@@ -0,0 +1,85 @@
+import re
+from dataclasses import dataclass
+from typing import Sequence
+
+from utils.constants import FlowState
+from utils.state_manager import FlowStates
+
+# Short replies that only make sense against the previous assistant turn
+CONFIRMATION_PATTERN = re.compile(
+    r"^\W*(yes|yeah|yep|sure|ok|okay|confirm|confirmed|go ahead|proceed|please do|do it|book it|sounds good)\b",
+    re.IGNORECASE,
+)
+CALENDAR_PATTERN = re.compile(r"\bcalend[ae]r\b", re.IGNORECASE)
+# Words that point back into the conversation ("that room", "the first one", ...)
+REFERENCE_PATTERN = re.compile(
+    r"\b(it|its|that|this|these|those|them|they|there|same|first|second|third|last|previous|above|one|ones|instead|again|also|other)\b",
+    re.IGNORECASE,
+)
+# Signs that one message asks for several things at once
+MULTI_STEP_PATTERN = re.compile(r"\b(and then|after that|then|as well as)\b|;", re.IGNORECASE)
+# Booking details a later message may silently build on: dates, stay lengths and hotel/room/booking ids
+BOOKING_DETAIL_PATTERN = re.compile(
+    r"\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}"
+    r"|\b(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+\d{1,2}\b"
+    r"|\b\d{1,2}(st|nd|rd|th)?\s+(of\s+)?(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)"
+    r"|\b\d+\s+nights?\b"
+    r"|\b(hotel|room|booking)\s*(id\s*)?#?\d+|#\d+",
+    re.IGNORECASE,
+)
+# Flow states after which no booking flow is in progress
+SETTLED_FLOW_STATES = {None, FlowState.INITIAL_STATE, FlowState.BOOKING_COMPLETED, FlowState.FETCHED_BOOKINGS, FlowState.ADDED_TO_CALENDAR}
+
+MAX_CONFIRMATION_WORDS = 8
+MIN_SELF_CONTAINED_WORDS = 6
+MAX_SIMPLE_WORDS = 40
+
+@dataclass(frozen=True)
+class CrewPlan:
+    """Which crew stages a message needs."""
+    summarize: bool
+    planning: bool
+    reason: str
+
+FULL_PLAN = CrewPlan(summarize=True, planning=True, reason="full")
+
+def is_multi_step(message: str) -> bool:
+    return len(message.split()) > MAX_SIMPLE_WORDS or bool(MULTI_STEP_PATTERN.search(message))
+
+def carries_booking_details(message: str) -> bool:
+    return bool(BOOKING_DETAIL_PATTERN.search(message))
+
+def route_message(message: str, flow_states: FlowStates, history_size: int, earlier_user_messages: Sequence[str] = ()) -> CrewPlan:
+    """
+    Decide from local signals whether the summarization task and the crew
+    planning pass are needed for a message.
+
+    ``history_size`` counts the messages already in the thread, including
+    this one, and ``earlier_user_messages`` are the user turns before it.
+    Anything the rules do not recognise runs the full pipeline.
+    """
+    words = len(message.split())
+
+    if history_size <= 1:
+        # Nothing earlier to aggregate
+        return CrewPlan(summarize=False, planning=is_multi_step(message), reason="first_turn")
+
+    if words <= MAX_CONFIRMATION_WORDS and CONFIRMATION_PATTERN.search(message):
+        if flow_states.last == FlowState.BOOKING_PREVIEW_INITIATED:
+            return CrewPlan(summarize=False, planning=False, reason="booking_confirmation")
+
+    if CALENDAR_PATTERN.search(message) and flow_states.has_state(FlowState.BOOKING_COMPLETED) and not is_multi_step(message):
+        return CrewPlan(summarize=False, planning=False, reason="calendar_follow_up")
+
+    # Without the summary the agent only sees this message and the previous
+    # assistant turn, so anything an open flow or an earlier turn established
+    # (dates, hotel or room ids) would be lost
+    if (
+        words >= MIN_SELF_CONTAINED_WORDS
+        and not REFERENCE_PATTERN.search(message)
+        and flow_states.last in SETTLED_FLOW_STATES
+        and not any(carries_booking_details(earlier) for earlier in earlier_user_messages)
+    ):
+        return CrewPlan(summarize=False, planning=is_multi_step(message), reason="self_contained")
+
+    return FULL_PLAN
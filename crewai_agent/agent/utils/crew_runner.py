@@ -0,0 +1,81 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+class CrewRunnerBusy(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+class CrewRunner:
+    """
+    Runs blocking crew kickoffs on a bounded worker pool so they never block
+    the event loop.
+
+    At most ``max_concurrent_crews`` crews run at once and at most
+    ``max_queued_crews`` more wait for a worker; anything beyond that is
+    rejected straight away instead of piling up.
+    """
+
+    def __init__(self, max_concurrent_crews: int, max_queued_crews: int):
+        self.max_concurrent_crews = max_concurrent_crews
+        self.max_queued_crews = max_queued_crews
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_crews, thread_name_prefix="crew")
+        self._lock = threading.Lock()
+        self._running = 0
+        self._queued = 0
+        self._rejected = 0
+        self._completed = 0
+
+    def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def admit(self) -> None:
+        """Reserve a place for one start() call, or raise CrewRunnerBusy if the queue is full."""
+        with self._lock:
+            if self._running + self._queued >= self.max_concurrent_crews + self.max_queued_crews:
+                self._rejected += 1
+                raise CrewRunnerBusy()
+            self._queued += 1
+
+    def release(self) -> None:
+        """Give back a place reserved by admit() that will not be used."""
+        with self._lock:
+            self._queued -= 1
+
+    def start(self, fn: Callable[..., Any], *args: Any) -> "asyncio.Future":
+        """Run fn(*args) on the pool in the place reserved by admit()."""
+        future = self._executor.submit(self._run, fn, *args)
+        # A job cancelled before a worker picked it up never reaches _run
+        future.add_done_callback(lambda done: done.cancelled() and self.release())
+        return asyncio.wrap_future(future)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on the pool and await its result."""
+        self.admit()
+        return await self.start(fn, *args)
+
+    def get_metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "running": self._running,
+                "queue_depth": self._queued,
+                "max_concurrent_crews": self.max_concurrent_crews,
+                "max_queued_crews": self.max_queued_crews,
+                "rejected": self._rejected,
+                "completed": self._completed,
+            }
+
+# Single instance for application-wide use
+crew_runner = CrewRunner(
+    max_concurrent_crews=int(os.getenv("MAX_CONCURRENT_CREWS", "4")),
+    max_queued_crews=int(os.getenv("MAX_QUEUED_CREWS", "16")),
+)
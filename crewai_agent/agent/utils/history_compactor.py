@@ -0,0 +1,68 @@
+import json
+from collections import deque
+from typing import Any, List
+
+# Fields worth keeping from tool payloads; everything else (descriptions,
+# amenity lists, image URLs, ...) is dropped from the compact form.
+KEPT_FIELDS = (
+    "id", "hotel_id", "room_id", "booking_id", "name", "hotel_name", "room_type",
+    "room_number", "city", "location", "check_in", "check_out", "total_price",
+    "price_per_night", "is_available", "status",
+)
+MAX_CHAT_RESPONSE_CHARS = 600
+MAX_PAYLOAD_ITEMS = 20
+MAX_PAYLOAD_CHARS = 1200
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+def _summarize_payload(payload: Any) -> List[str]:
+    """
+    Return a {field=value, ...} entry for each dict in the payload that has
+    kept fields. The walk is breadth-first, so with a long payload the
+    top-level records (e.g. the hotels in a list) come before nested ones.
+    """
+    items: List[str] = []
+    queue = deque([payload])
+    while queue and len(items) < MAX_PAYLOAD_ITEMS:
+        value = queue.popleft()
+        if isinstance(value, dict):
+            kept = [f"{key}={value[key]}" for key in KEPT_FIELDS if value.get(key) not in (None, "", [], {})]
+            if kept:
+                items.append("{" + ", ".join(kept) + "}")
+            queue.extend(nested for nested in value.values() if isinstance(nested, (dict, list)))
+        elif isinstance(value, list):
+            queue.extend(value)
+    return items
+
+def compact_message(role: str, content: str) -> str:
+    """
+    Render one chat message for the LLM.
+
+    Assistant turns are stored as the crew output JSON; they are reduced to
+    the chat response, the frontend state and the IDs, names, dates and
+    prices found in the tool payload. Anything else is truncated text.
+    """
+    label = role.capitalize()
+    if role != "assistant":
+        return f"{label}: {_truncate(content, MAX_CHAT_RESPONSE_CHARS)}"
+    try:
+        crew_output = json.loads(content)
+    except ValueError:
+        return f"{label}: {_truncate(content, MAX_CHAT_RESPONSE_CHARS)}"
+    if not isinstance(crew_output, dict):
+        return f"{label}: {_truncate(content, MAX_CHAT_RESPONSE_CHARS)}"
+
+    response = crew_output.get("response") or {}
+    parts = [f"{label}: {_truncate(response.get('chat_response') or '', MAX_CHAT_RESPONSE_CHARS)}"]
+    frontend_state = crew_output.get("frontend_state")
+    if frontend_state and frontend_state != "NO_STATE":
+        parts.append(f"[state: {frontend_state}]")
+    items = _summarize_payload(response.get("tool_response"))
+    if items:
+        parts.append(f"[data: {_truncate('; '.join(items), MAX_PAYLOAD_CHARS)}]")
+    return " ".join(parts)
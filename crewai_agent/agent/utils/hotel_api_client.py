@@ -0,0 +1,134 @@
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {502, 503, 504}
+
+@dataclass
+class LatencyStats:
+    count: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, seconds: float, error: bool) -> None:
+        self.count += 1
+        self.errors += int(error)
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_seconds / self.count * 1000, 2) if self.count else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 2),
+        }
+
+class HotelApiClient:
+    """
+    Shared HTTP client for the hotel API.
+
+    All tools go through one pooled keep-alive session with connect/read
+    timeouts. Idempotent calls are retried with exponential backoff and
+    jitter on connection errors and 502/503/504 responses. Latency is
+    recorded per endpoint name.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        connect_timeout: float = float(os.getenv("HOTEL_API_CONNECT_TIMEOUT", "3")),
+        read_timeout: float = float(os.getenv("HOTEL_API_READ_TIMEOUT", "15")),
+        max_retries: int = int(os.getenv("HOTEL_API_MAX_RETRIES", "2")),
+        backoff_seconds: float = 0.2,
+        pool_size: int = 20,
+    ):
+        self._base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._metrics: Dict[str, LatencyStats] = {}
+        self._metrics_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url or os.environ['HOTEL_API_BASE_URL']
+
+    def _record(self, name: str, seconds: float, error: bool) -> None:
+        with self._metrics_lock:
+            self._metrics.setdefault(name, LatencyStats()).record(seconds, error)
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Return a snapshot of the per-endpoint latency stats."""
+        with self._metrics_lock:
+            return {name: stats.to_dict() for name, stats in self._metrics.items()}
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        token: Optional[str] = None,
+        name: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request to the hotel API.
+
+        ``name`` labels the latency metrics (defaults to "METHOD path").
+        ``idempotent`` defaults to True for GET and False otherwise; only
+        idempotent calls are retried.
+        """
+        name = name or f"{method} {path}"
+        if idempotent is None:
+            idempotent = method.upper() == "GET"
+        attempts = 1 + (self.max_retries if idempotent else 0)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if token is not None:
+            headers["Authorization"] = f"Bearer {token}"
+
+        for attempt in range(attempts):
+            start = time.perf_counter()
+            try:
+                with tracer.span(name, "http", method=method, attempt=attempt + 1) as span:
+                    response = self.session.request(
+                        method, f"{self.base_url}{path}", headers=headers, timeout=self.timeout, **kwargs
+                    )
+                    span.set(status=response.status_code)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(name, time.perf_counter() - start, error=True)
+                if attempt == attempts - 1:
+                    raise
+            else:
+                retry = response.status_code in RETRY_STATUS_CODES and attempt < attempts - 1
+                self._record(name, time.perf_counter() - start, error=response.status_code >= 500)
+                if not retry:
+                    return response
+            delay = self.backoff_seconds * (2 ** attempt)
+            time.sleep(random.uniform(0, delay))
+            logger.warning("Retrying %s (attempt %d of %d)", name, attempt + 2, attempts)
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+# Single instance for application-wide use
+hotel_api_client = HotelApiClient()
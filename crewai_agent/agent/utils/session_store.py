@@ -0,0 +1,491 @@
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Default limits of every namespace; see SessionNamespace
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_HOURS", "24")) * 3600
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "100000"))
+
+class SessionStore(ABC):
+    """
+    Namespaced key/value store for conversation state (chat histories, flow
+    states, OAuth states and tokens).
+
+    Values must be JSON-serializable. ``shared`` is True when other worker
+    processes see the same data, in which case callers must not rely on
+    holding live references to stored values.
+
+    A key can also hold an append-only list of items (``append``/``items``),
+    such as the messages of a chat; its plain value is then the sequence
+    number of the last item. Namespaces registered with ``expire`` are pruned
+    by ``sweep``, which ``start_sweeper`` runs periodically.
+    """
+
+    shared = False
+
+    def __init__(self):
+        self._expiry: Dict[str, Tuple[float, Optional[int]]] = {}
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def update(self, namespace: str, key: str, fn: Callable[[Optional[Any]], Any]) -> Any:
+        """
+        Replace a value with fn(current value, or None) as one atomic step,
+        also against other processes sharing the store. Returns the new value.
+        """
+
+    @abstractmethod
+    def append(self, namespace: str, key: str, item: Any, keep: Optional[int] = None) -> int:
+        """
+        Append an item to the list under key as one atomic step and return
+        its sequence number (1, 2, ... per key). With ``keep``, only the last
+        keep items are retained.
+        """
+
+    @abstractmethod
+    def items(self, namespace: str, key: str, after: int = 0) -> List[Tuple[int, Any]]:
+        """Return the (sequence number, item) pairs under key numbered above after, in order."""
+
+    @abstractmethod
+    def prune(self, namespace: str, max_age_seconds: float, max_entries: Optional[int] = None) -> int:
+        """
+        Delete keys not written for max_age_seconds and, with max_entries,
+        the least recently written keys beyond that count. Returns how many
+        keys were deleted.
+        """
+
+    def flush(self) -> None:
+        """Persist buffered writes, if the store buffers any."""
+
+    def expire(self, namespace: str, max_age_seconds: float, max_entries: Optional[int] = None) -> None:
+        """Have sweep() prune the namespace with these limits."""
+        self._expiry[namespace] = (max_age_seconds, max_entries)
+
+    def sweep(self) -> int:
+        """Prune every namespace registered with expire(). Returns how many keys were deleted."""
+        return sum(
+            self.prune(namespace, max_age_seconds, max_entries)
+            for namespace, (max_age_seconds, max_entries) in list(self._expiry.items())
+        )
+
+    def start_sweeper(self, interval_seconds: float) -> None:
+        threading.Thread(target=self._sweep_loop, args=(interval_seconds,), daemon=True, name="session-store-sweeper").start()
+
+    def _sweep_loop(self, interval_seconds: float) -> None:
+        while True:
+            time.sleep(interval_seconds)
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("Session store sweep failed")
+
+class MemorySessionStore(SessionStore):
+    """
+    Process-local store. Values are kept as given, without serialization.
+
+    Each namespace keeps its keys in write order, so pruning pops the least
+    recently written keys from the front.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._entries: Dict[str, "OrderedDict[str, Tuple[float, Any]]"] = {}
+        self._items: Dict[Tuple[str, str], List[Tuple[int, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def _put(self, namespace: str, key: str, value: Any) -> None:
+        """Write a value and move the key to the end. Caller holds self._lock."""
+        entries = self._entries.get(namespace)
+        if entries is None:
+            entries = self._entries[namespace] = OrderedDict()
+        entries[key] = (time.time(), value)
+        entries.move_to_end(key)
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        entry = self._entries.get(namespace, {}).get(key)
+        return None if entry is None else entry[1]
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._put(namespace, key, value)
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._entries.get(namespace, {}).pop(key, None)
+            self._items.pop((namespace, key), None)
+
+    def update(self, namespace: str, key: str, fn: Callable[[Optional[Any]], Any]) -> Any:
+        with self._lock:
+            value = fn(self.get(namespace, key))
+            self._put(namespace, key, value)
+        return value
+
+    def append(self, namespace: str, key: str, item: Any, keep: Optional[int] = None) -> int:
+        with self._lock:
+            items = self._items.setdefault((namespace, key), [])
+            seq = items[-1][0] + 1 if items else 1
+            items.append((seq, item))
+            if keep is not None and len(items) > keep:
+                del items[:-keep]
+            self._put(namespace, key, seq)
+        return seq
+
+    def items(self, namespace: str, key: str, after: int = 0) -> List[Tuple[int, Any]]:
+        with self._lock:
+            return [(seq, item) for seq, item in self._items.get((namespace, key), ()) if seq > after]
+
+    def prune(self, namespace: str, max_age_seconds: float, max_entries: Optional[int] = None) -> int:
+        cutoff = time.time() - max_age_seconds
+        deleted = 0
+        with self._lock:
+            entries = self._entries.get(namespace)
+            while entries and (
+                next(iter(entries.values()))[0] < cutoff
+                or (max_entries is not None and len(entries) > max_entries)
+            ):
+                key, _ = entries.popitem(last=False)
+                self._items.pop((namespace, key), None)
+                deleted += 1
+        return deleted
+
+_DELETED = object()
+
+_SELECT_ENTRY = "SELECT value FROM session_entries WHERE namespace = ? AND key = ?"
+_UPSERT_ENTRY = (
+    "INSERT INTO session_entries (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at"
+)
+_DELETE_ENTRY = "DELETE FROM session_entries WHERE namespace = ? AND key = ?"
+_SELECT_STALE_KEYS = "SELECT key FROM session_entries WHERE namespace = ? AND updated_at < ?"
+_SELECT_EXCESS_KEYS = (
+    "SELECT key FROM session_entries WHERE namespace = ? AND updated_at >= ? "
+    "ORDER BY updated_at DESC LIMIT -1 OFFSET ?"
+)
+_SELECT_LAST_SEQ = "SELECT COALESCE(MAX(seq), 0) FROM session_items WHERE namespace = ? AND key = ?"
+_INSERT_ITEM = "INSERT INTO session_items (namespace, key, seq, value) VALUES (?, ?, ?, ?)"
+_TRIM_ITEMS = "DELETE FROM session_items WHERE namespace = ? AND key = ? AND seq <= ?"
+_SELECT_ITEMS = "SELECT seq, value FROM session_items WHERE namespace = ? AND key = ? AND seq > ? ORDER BY seq"
+_DELETE_ITEMS = "DELETE FROM session_items WHERE namespace = ? AND key = ?"
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Store backed by a SQLite file that every worker process on the host opens.
+
+    Writes are buffered and flushed by a background thread in one
+    transaction every ``flush_interval`` seconds (or as soon as
+    ``max_batch`` keys are pending); repeated writes to a key between
+    flushes are coalesced. Reads see this process's pending writes, and
+    other processes see them after the next flush. ``flush_interval=0``
+    writes through synchronously.
+
+    ``update`` and ``append`` always write through, in one transaction.
+    Items are rows of their own, so appends never rewrite earlier items.
+    """
+
+    shared = True
+
+    def __init__(self, path: str, flush_interval: float = 0.05, max_batch: int = 500):
+        super().__init__()
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._local = threading.local()
+        self._pending: Dict[Tuple[str, str], Any] = {}
+        # The batch being committed; still visible to get() until it lands
+        self._flushing: Dict[Tuple[str, str], Any] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_session_entries_updated_at ON session_entries (namespace, updated_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_items ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, seq INTEGER NOT NULL, value TEXT NOT NULL, "
+                "PRIMARY KEY (namespace, key, seq)) WITHOUT ROWID"
+            )
+        if flush_interval > 0:
+            threading.Thread(target=self._flush_loop, daemon=True, name="session-store-flush").start()
+        atexit.register(self.flush)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn = self._local.conn = conn
+        return conn
+
+    def _pending_value(self, namespace: str, key: str) -> Any:
+        with self._pending_lock:
+            pending = self._pending.get((namespace, key))
+            if pending is None:
+                pending = self._flushing.get((namespace, key))
+        return pending
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        pending = self._pending_value(namespace, key)
+        if pending is _DELETED:
+            return None
+        if pending is not None:
+            return json.loads(pending)
+        row = self._connection().execute(_SELECT_ENTRY, (namespace, key)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        self._write(namespace, key, json.dumps(value))
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._write(namespace, key, _DELETED)
+
+    def _write(self, namespace: str, key: str, value: Any) -> None:
+        with self._pending_lock:
+            self._pending[(namespace, key)] = value
+            pending = len(self._pending)
+        if self.flush_interval <= 0:
+            self.flush()
+        elif pending >= self.max_batch:
+            self._wakeup.set()
+
+    @staticmethod
+    def _delete_keys(conn: sqlite3.Connection, keys: List[Tuple[str, str]]) -> None:
+        conn.executemany(_DELETE_ENTRY, keys)
+        conn.executemany(_DELETE_ITEMS, keys)
+
+    @contextmanager
+    def _write_through(self, namespace: str, key: str) -> Iterator[Tuple[sqlite3.Connection, Any]]:
+        """
+        Transaction for a read-modify-write of one key, yielding the
+        connection and this process's pending write to the key (or None).
+
+        Holding the flush lock means no batch is in flight, and BEGIN
+        IMMEDIATE keeps other processes from writing until the commit. The
+        pending write is for the caller to fold in; it stays visible to get()
+        as the in-flight batch until the transaction lands.
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                pending = self._pending.pop((namespace, key), None)
+                if pending is not None:
+                    self._flushing = {(namespace, key): pending}
+            conn = self._connection()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                yield conn, pending
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                if pending is not None:
+                    with self._pending_lock:
+                        self._pending.setdefault((namespace, key), pending)
+                raise
+            finally:
+                with self._pending_lock:
+                    self._flushing = {}
+
+    def update(self, namespace: str, key: str, fn: Callable[[Optional[Any]], Any]) -> Any:
+        with self._write_through(namespace, key) as (conn, pending):
+            if pending is None:
+                row = conn.execute(_SELECT_ENTRY, (namespace, key)).fetchone()
+                current = None if row is None else json.loads(row[0])
+            else:
+                current = None if pending is _DELETED else json.loads(pending)
+            value = fn(current)
+            conn.execute(_UPSERT_ENTRY, (namespace, key, json.dumps(value), time.time()))
+        return value
+
+    def append(self, namespace: str, key: str, item: Any, keep: Optional[int] = None) -> int:
+        with self._write_through(namespace, key) as (conn, pending):
+            if pending is _DELETED:
+                self._delete_keys(conn, [(namespace, key)])
+            seq = conn.execute(_SELECT_LAST_SEQ, (namespace, key)).fetchone()[0] + 1
+            conn.execute(_INSERT_ITEM, (namespace, key, seq, json.dumps(item)))
+            if keep is not None:
+                conn.execute(_TRIM_ITEMS, (namespace, key, seq - keep))
+            conn.execute(_UPSERT_ENTRY, (namespace, key, json.dumps(seq), time.time()))
+        return seq
+
+    def items(self, namespace: str, key: str, after: int = 0) -> List[Tuple[int, Any]]:
+        if self._pending_value(namespace, key) is _DELETED:
+            return []
+        rows = self._connection().execute(_SELECT_ITEMS, (namespace, key, after))
+        return [(seq, json.loads(value)) for seq, value in rows]
+
+    def prune(self, namespace: str, max_age_seconds: float, max_entries: Optional[int] = None) -> int:
+        self.flush()
+        cutoff = time.time() - max_age_seconds
+        with self._flush_lock:
+            conn = self._connection()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                stale = conn.execute(_SELECT_STALE_KEYS, (namespace, cutoff)).fetchall()
+                if max_entries is not None:
+                    stale += conn.execute(_SELECT_EXCESS_KEYS, (namespace, cutoff, max_entries)).fetchall()
+                self._delete_keys(conn, [(namespace, row[0]) for row in stale])
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        return len(stale)
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, {}
+                self._flushing = batch
+            if not batch:
+                return
+            now = time.time()
+            upserts = [(ns, key, value, now) for (ns, key), value in batch.items() if value is not _DELETED]
+            deletes = [(ns, key) for (ns, key), value in batch.items() if value is _DELETED]
+            conn = self._connection()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(_UPSERT_ENTRY, upserts)
+                self._delete_keys(conn, deletes)
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                # Put the batch back unless newer writes replaced it meanwhile
+                with self._pending_lock:
+                    for entry_key, value in batch.items():
+                        self._pending.setdefault(entry_key, value)
+                raise
+            finally:
+                with self._pending_lock:
+                    self._flushing = {}
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to flush session store, will retry")
+
+class SessionNamespace:
+    """
+    Dict-like view of one namespace of a session store.
+
+    With ``model`` set, values are pydantic models that are dumped to JSON
+    for shared stores and stored as-is in memory.
+
+    The namespace is registered with the store's sweeper: keys not written
+    for ``max_age_seconds``, and the least recently written keys beyond
+    ``max_entries``, are deleted. ``max_age_seconds=None`` keeps every key.
+    """
+
+    def __init__(
+        self,
+        store: SessionStore,
+        namespace: str,
+        model: Optional[Type[BaseModel]] = None,
+        max_age_seconds: Optional[float] = SESSION_TTL_SECONDS,
+        max_entries: Optional[int] = SESSION_MAX_ENTRIES,
+    ):
+        self.store = store
+        self.namespace = namespace
+        self.model = model
+        if max_age_seconds is not None:
+            store.expire(namespace, max_age_seconds, max_entries)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.store.get(self.namespace, key)
+        if value is None:
+            return default
+        if self.model is not None and self.store.shared:
+            return self.model.model_validate(value)
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self.model is not None and self.store.shared:
+            value = value.model_dump(mode="json")
+        self.store.set(self.namespace, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return self.store.get(self.namespace, key) is not None
+
+    def update(self, key: str, fn: Callable[[Optional[Any]], Any]) -> Any:
+        """Replace the value of key with fn(current value, or None) atomically; returns the new value."""
+        if self.model is None or not self.store.shared:
+            return self.store.update(self.namespace, key, fn)
+
+        def apply(value: Optional[Any]) -> Any:
+            current = None if value is None else self.model.model_validate(value)
+            return fn(current).model_dump(mode="json")
+
+        return self.model.model_validate(self.store.update(self.namespace, key, apply))
+
+    def append(self, key: str, item: Any, keep: Optional[int] = None) -> int:
+        """Append an item to the list under key; returns its sequence number."""
+        return self.store.append(self.namespace, key, item, keep)
+
+    def items(self, key: str, after: int = 0) -> List[Tuple[int, Any]]:
+        """Return the (sequence number, item) pairs under key numbered above after."""
+        return self.store.items(self.namespace, key, after)
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        value = self.get(key, default)
+        self.store.delete(self.namespace, key)
+        return value
+
+def create_session_store() -> SessionStore:
+    """
+    Build the store selected by SESSION_STORE ("memory" or "sqlite").
+    The SQLite file is SESSION_STORE_PATH and writes are flushed every
+    SESSION_STORE_FLUSH_INTERVAL_MS milliseconds. Expired keys are swept
+    every SESSION_STORE_SWEEP_INTERVAL_S seconds.
+    """
+    backend = os.getenv("SESSION_STORE", "memory").lower()
+    if backend == "memory":
+        store: SessionStore = MemorySessionStore()
+    elif backend == "sqlite":
+        store = SQLiteSessionStore(
+            os.getenv("SESSION_STORE_PATH", "agent_sessions.db"),
+            flush_interval=float(os.getenv("SESSION_STORE_FLUSH_INTERVAL_MS", "50")) / 1000,
+        )
+    else:
+        raise ValueError(f"Unknown SESSION_STORE backend: {backend}")
+    store.start_sweeper(float(os.getenv("SESSION_STORE_SWEEP_INTERVAL_S", "60")))
+    return store
+
+# Single instance for application-wide use
+session_store = create_session_store()
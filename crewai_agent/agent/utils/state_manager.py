@@ -1,47 +1,112 @@
-from dataclasses import dataclass, field
-from typing import List, Dict
-from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 from utils.constants import FlowState
+from utils.session_store import SessionNamespace, SessionStore, session_store
+
+# One bit per flow state, in declaration order
+FLOW_STATE_BITS: Dict[FlowState, int] = {state: 1 << i for i, state in enumerate(FlowState)}
+# Transitions kept per thread; older ones only survive in the bitmask
+MAX_TRANSITIONS = 32
+
+@lru_cache(maxsize=None)
+def render_states(mask: int, last: Optional[FlowState]) -> str:
+    """
+    Names of the states set in mask, in declaration order, followed by the
+    current (latest) state, which the prompts branch on. There are at most
+    2^len(FlowState) * (len(FlowState) + 1) combinations.
+    """
+    reached = " ".join(state.name for state, bit in FLOW_STATE_BITS.items() if mask & bit)
+    return f"{reached} (current: {last.name})" if last is not None else reached
 
-@dataclass
 class FlowStates:
-    states: List[FlowState] = field(default_factory=list)
-    
+    """
+    Flow states reached by a thread: a bitmask for O(1) membership and a
+    bounded log of the most recent transitions (repeats of the latest state
+    are not logged again).
+    """
+
+    __slots__ = ("mask", "transitions")
+
+    def __init__(self, mask: int = 0, transitions: Optional[List[FlowState]] = None):
+        self.mask = mask
+        self.transitions: List[FlowState] = transitions or []
+
     def add_state(self, state: FlowState) -> None:
         """Add a state to the list of states."""
-        self.states.append(state)
+        self.mask |= FLOW_STATE_BITS[state]
+        if not self.transitions or self.transitions[-1] is not state:
+            self.transitions.append(state)
+            if len(self.transitions) > MAX_TRANSITIONS:
+                del self.transitions[:-MAX_TRANSITIONS]
+
+    def has_state(self, state: FlowState) -> bool:
+        return bool(self.mask & FLOW_STATE_BITS[state])
+
+    @property
+    def last(self) -> Optional[FlowState]:
+        return self.transitions[-1] if self.transitions else None
 
     def get_states(self) -> List[FlowState]:
-        """Return the list of states."""
-        return self.states
+        """Return the recent transitions, oldest first."""
+        return list(self.transitions)
 
     def get_states_as_string(self) -> str:
-        """Return the states as a formatted string."""
-        return " ".join(state.name for state in self.states)
+        """Return the reached states and the current one as a formatted string."""
+        return render_states(self.mask, self.last)
+
+    def to_dict(self) -> dict:
+        return {"mask": self.mask, "transitions": [state.value for state in self.transitions]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FlowStates":
+        return cls(data["mask"], [FlowState(value) for value in data["transitions"]])
 
 class StateManager:
-    def __init__(self) -> None:
-        """Initialize the StateManager with an empty dictionary for thread states."""
-        self.thread_states: Dict[int, FlowStates] = {}
+    """
+    Flow states per thread, kept in the session store.
+
+    In memory the FlowStates objects are stored as-is; with a shared store
+    they are stored as {"mask", "transitions"} dicts. Either way add_state
+    is one atomic update of the stored value, so concurrent turns (also in
+    other workers) never drop each other's states.
+    """
+
+    def __init__(self, store: Optional[SessionStore] = None) -> None:
+        self.thread_states = SessionNamespace(store or session_store, "flow_states")
+        self._shared = self.thread_states.store.shared
+
+    def _from_stored(self, value: Any) -> FlowStates:
+        if value is None:
+            return FlowStates()
+        return FlowStates.from_dict(value) if self._shared else value
 
-    def add_state(self, thread_id: int, state: FlowState) -> None:
+    def get_flow_states(self, thread_id: str) -> FlowStates:
+        """Return the flow states of a thread (a snapshot when the store is shared)."""
+        return self._from_stored(self.thread_states.get(thread_id))
+
+    def add_state(self, thread_id: str, state: FlowState) -> None:
         """Add a state to the flow states for a specific thread."""
-        if thread_id not in self.thread_states:
-            self.thread_states[thread_id] = FlowStates()
-        self.thread_states[thread_id].add_state(state)
+        def add(value: Any) -> Any:
+            flow_states = self._from_stored(value)
+            flow_states.add_state(state)
+            return flow_states.to_dict() if self._shared else flow_states
+
+        self.thread_states.update(thread_id, add)
 
-    def get_states(self, thread_id: int) -> List[FlowState]:
-        """Return the list of states for a specific thread."""
-        if thread_id in self.thread_states:
-            return self.thread_states[thread_id].get_states()
-        return []
+    def has_state(self, thread_id: str, state: FlowState) -> bool:
+        return self.get_flow_states(thread_id).has_state(state)
 
-    def get_states_as_string(self, thread_id: int) -> str:
+    def get_states(self, thread_id: str) -> List[FlowState]:
+        """Return the recent transitions for a specific thread."""
+        return self.get_flow_states(thread_id).get_states()
+
+    def get_states_as_string(self, thread_id: str) -> str:
         """Return the states as a formatted string for a specific thread."""
-        if thread_id in self.thread_states:
-            return self.thread_states[thread_id].get_states_as_string()
-        return ""
+        return self.get_flow_states(thread_id).get_states_as_string()
+
+    def remove_thread(self, thread_id: str) -> None:
+        self.thread_states.pop(thread_id)
 
 # Single instance for application-wide use
 state_manager = StateManager()
@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+CacheKey = Tuple[str, Tuple[Hashable, ...]]
+
+class ToolResponseCache:
+    """
+    Bounded TTL + LRU cache for read-only hotel API responses, keyed by
+    (endpoint, args) and shared by every conversation.
+
+    Entries expire after ``ttl_seconds``; once ``max_entries`` is reached the
+    least recently used entry is evicted. Booking writes call
+    ``invalidate()`` so cached catalog data never outlives a change made
+    through the agent.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, endpoint: str, args: Tuple[Hashable, ...] = ()) -> Optional[Any]:
+        key = (endpoint, args)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, endpoint: str, args: Tuple[Hashable, ...], value: Any) -> None:
+        with self._lock:
+            self._entries[(endpoint, args)] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end((endpoint, args))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, endpoint: Optional[str] = None) -> None:
+        """Drop every entry, or only the entries of one endpoint."""
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == endpoint]:
+                    del self._entries[key]
+            self._invalidations += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+# Single instance for application-wide use
+tool_response_cache = ToolResponseCache(
+    max_entries=int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "512")),
+    ttl_seconds=float(os.getenv("TOOL_CACHE_TTL_SECONDS", "300")),
+)
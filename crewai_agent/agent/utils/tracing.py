@@ -0,0 +1,224 @@
+import bisect
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; LLM turns run to minutes
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+@dataclass
+class Span:
+    name: str
+    stage: str
+    trace_id: Optional[str]
+    span_id: str
+    parent_id: Optional[str]
+    start: float
+    start_time: float
+    duration: Optional[float] = None
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "stage": self.stage,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": round(self.start_time, 6),
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+@dataclass
+class Trace:
+    """All spans recorded while handling one request."""
+    trace_id: str
+    spans: List[Span] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        root = self.spans[0]
+        stages: Dict[str, float] = {}
+        for span in self.spans[1:]:
+            stages[span.stage] = stages.get(span.stage, 0.0) + (span.duration or 0.0)
+        return {
+            "trace_id": self.trace_id,
+            "name": root.name,
+            "start_time": round(root.start_time, 6),
+            "duration_ms": round((root.duration or 0.0) * 1000, 3),
+            "error": root.error,
+            "attributes": root.attributes,
+            # Nested stages overlap (a tool span contains its http spans)
+            "stage_ms": {stage: round(seconds * 1000, 3) for stage, seconds in stages.items()},
+            "spans": [span.to_dict() for span in self.spans[1:]],
+        }
+
+class LatencyHistogram:
+    """Cumulative-bucket histogram in the Prometheus layout."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+class Tracer:
+    """
+    Per-request tracing for the chat pipeline.
+
+    ``trace()`` opens the root span of a request and ``span()`` records a
+    child of whatever span is current in the calling context, tagged with a
+    stage ("request", "queue", "setup", "task", "llm", "tool", "http",
+    "token"). Every span feeds a latency histogram per (stage, name), also
+    outside a trace (e.g. background token refreshes). Finished traces are
+    appended as one JSON line to ``export_path`` when it is set.
+
+    The current span lives in a context variable, so work handed to another
+    thread is only part of the trace if it runs in a copy of the context.
+    """
+
+    def __init__(self, export_path: Optional[str] = None, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.export_path = export_path
+        self.buckets = buckets
+        self._trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+        self._span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("span", default=None)
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._histograms_lock = threading.Lock()
+        self._export_lock = threading.Lock()
+
+    def _start_span(self, name: str, stage: str, start: Optional[float], attributes: Dict[str, Any]) -> Span:
+        trace = self._trace.get()
+        parent = self._span.get()
+        now = time.perf_counter()
+        start = now if start is None else start
+        span = Span(
+            name=name,
+            stage=stage,
+            trace_id=trace.trace_id if trace else None,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            start=start,
+            start_time=time.time() - (now - start),
+            attributes=attributes,
+        )
+        if trace is not None:
+            trace.spans.append(span)
+        return span
+
+    def _end_span(self, span: Span, end: Optional[float] = None) -> None:
+        span.duration = (time.perf_counter() if end is None else end) - span.start
+        key = (span.stage, span.name)
+        with self._histograms_lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self.buckets)
+            histogram.observe(span.duration)
+
+    @contextmanager
+    def span(self, name: str, stage: str, **attributes: Any) -> Iterator[Span]:
+        """Record the enclosed block as a span of the current trace."""
+        span = self._start_span(name, stage, None, attributes)
+        token = self._span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            self._span.reset(token)
+            self._end_span(span)
+
+    def record(self, name: str, stage: str, start: float, end: Optional[float] = None, **attributes: Any) -> Span:
+        """Record a span that has already happened, from perf_counter() timestamps."""
+        span = self._start_span(name, stage, start, attributes)
+        self._end_span(span, end)
+        return span
+
+    @contextmanager
+    def trace(self, name: str, start: Optional[float] = None, **attributes: Any) -> Iterator[Span]:
+        """
+        Open a new trace whose root span covers the enclosed block (or, with
+        ``start``, everything since that perf_counter() timestamp).
+        """
+        trace = Trace(trace_id=uuid.uuid4().hex)
+        trace_token = self._trace.set(trace)
+        parent_token = self._span.set(None)
+        root = self._start_span(name, "request", start, attributes)
+        root_token = self._span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.error = type(e).__name__
+            raise
+        finally:
+            self._span.reset(root_token)
+            self._span.reset(parent_token)
+            self._trace.reset(trace_token)
+            self._end_span(root)
+            self._export(trace)
+
+    def _export(self, trace: Trace) -> None:
+        if not self.export_path:
+            return
+        line = json.dumps(trace.to_dict(), default=str)
+        try:
+            with self._export_lock, open(self.export_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.warning("Failed to export trace %s: %s", trace.trace_id, e)
+
+    def render_prometheus(self) -> str:
+        """Latency histograms in the Prometheus text exposition format."""
+        metric = "agent_stage_duration_seconds"
+        lines = [
+            f"# HELP {metric} Latency of chat pipeline stages.",
+            f"# TYPE {metric} histogram",
+        ]
+        with self._histograms_lock:
+            snapshot = [
+                (stage, name, list(histogram.counts), histogram.sum, histogram.count)
+                for (stage, name), histogram in sorted(self._histograms.items())
+            ]
+        for stage, name, counts, total, count in snapshot:
+            labels = f'stage="{_escape_label(stage)}",name="{_escape_label(name)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{metric}_sum{{{labels}}} {total:.6f}")
+            lines.append(f"{metric}_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def traced_tool_run(run: Callable) -> Callable:
+    """Decorator for a tool's ``_run``: records a "tool" span named after the tool."""
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs):
+        with tracer.span(self.name, "tool"):
+            return run(self, *args, **kwargs)
+    return wrapper
+
+# Single instance for application-wide use
+tracer = Tracer(export_path=os.getenv("TRACE_EXPORT_PATH") or None)
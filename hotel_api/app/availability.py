@@ -0,0 +1,70 @@
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, List, Tuple
+
+RoomKey = Tuple[int, int]
+
+class RoomAvailabilityIndex:
+    """
+    Per-room index of booked date ranges, keyed by (hotel_id, room_id).
+
+    Bookings for a single room never overlap, so the ranges kept for a room
+    are sorted by both check-in and check-out. An overlap check therefore only
+    has to look at the last range that starts before the requested check-out.
+    """
+
+    def __init__(self):
+        self._check_ins: Dict[RoomKey, List[date]] = {}
+        self._check_outs: Dict[RoomKey, List[date]] = {}
+
+    def is_available(self, hotel_id: int, room_id: int, check_in: date, check_out: date) -> bool:
+        """Return True if no booking for the room overlaps [check_in, check_out)."""
+        check_ins = self._check_ins.get((hotel_id, room_id))
+        if not check_ins:
+            return True
+        i = bisect_left(check_ins, check_out)
+        return i == 0 or self._check_outs[(hotel_id, room_id)][i - 1] <= check_in
+
+    def add(self, hotel_id: int, room_id: int, check_in: date, check_out: date) -> None:
+        """Record a booking. The caller must have checked availability first."""
+        key = (hotel_id, room_id)
+        check_ins = self._check_ins.setdefault(key, [])
+        i = bisect_left(check_ins, check_in)
+        check_ins.insert(i, check_in)
+        self._check_outs.setdefault(key, []).insert(i, check_out)
+
+    def booked_ranges(self, hotel_id: int, room_id: int, start: date, end: date) -> List[Tuple[date, date]]:
+        """Return the booked (check_in, check_out) ranges of a room that overlap [start, end), in order."""
+        key = (hotel_id, room_id)
+        check_outs = self._check_outs.get(key)
+        if not check_outs:
+            return []
+        check_ins = self._check_ins[key]
+        # check_outs are sorted too, so skip every range that ends before start
+        first = bisect_right(check_outs, start)
+        last = bisect_left(check_ins, end, lo=first)
+        return list(zip(check_ins[first:last], check_outs[first:last]))
+
+def occupancy(ranges: List[Tuple[date, date]], start: date, end: date) -> Tuple[str, List[Tuple[date, date]]]:
+    """
+    Summarize sorted, non-overlapping booked ranges over the nights in [start, end).
+
+    Returns a bitmap with one character per night ("1" booked, "0" free) and
+    the free (check_in, check_out) ranges, both built in a single pass.
+    """
+    nights = (end - start).days
+    bitmap = bytearray(b"0" * nights)
+    free: List[Tuple[date, date]] = []
+    cursor = start
+    for check_in, check_out in ranges:
+        booked_from = max(check_in, start)
+        booked_to = min(check_out, end)
+        if booked_from >= booked_to:
+            continue
+        if booked_from > cursor:
+            free.append((cursor, booked_from))
+        bitmap[(booked_from - start).days:(booked_to - start).days] = b"1" * (booked_to - booked_from).days
+        cursor = max(cursor, booked_to)
+    if cursor < end:
+        free.append((cursor, end))
+    return bitmap.decode(), free
@@ -0,0 +1,41 @@
+import hashlib
+from typing import Callable, Dict, Hashable, NamedTuple, Optional
+
+from fastapi import Response
+from pydantic import BaseModel
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+class CatalogResponseCache:
+    """
+    Serialized JSON bodies of catalog responses, keyed per endpoint/argument.
+
+    Every lookup passes the store's current catalog version; when it differs
+    from the version the entries were built against, the whole cache is
+    dropped so a changed catalog is never served stale.
+    """
+
+    def __init__(self):
+        self._version: Optional[int] = None
+        self._entries: Dict[Hashable, CachedResponse] = {}
+
+    def get(self, key: Hashable, version: int, build: Callable[[], BaseModel]) -> CachedResponse:
+        if version != self._version:
+            self._entries = {}
+            self._version = version
+        entry = self._entries.get(key)
+        if entry is None:
+            body = build().model_dump_json().encode()
+            entry = CachedResponse(body, f'"{hashlib.sha256(body).hexdigest()}"')
+            self._entries[key] = entry
+        return entry
+
+def conditional_response(entry: CachedResponse, if_none_match: Optional[str]) -> Response:
+    """Return 304 if the client already holds this entry, otherwise the cached body."""
+    if if_none_match:
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        if "*" in tags or entry.etag in tags:
+            return Response(status_code=304, headers={"ETag": entry.etag})
+    return Response(content=entry.body, media_type="application/json", headers={"ETag": entry.etag})
@@ -0,0 +1,215 @@
+from datetime import date
+
+# Seed catalog and booking history loaded into the configured store
+# In-memory data stores
+hotels_data = {
+    1: {
+        "name": "Gardeo Saman Villa",
+        "description": "Enjoy a luxurious stay at Gardeo Saman Villas in your suite, and indulge in a delicious breakfast and your choice of lunch or dinner from our daily set menus served at the restaurant. Access exquisite facilities, including the infinity pool, Sahana Spa, gymnasium and library, as you unwind in paradise.",
+        "location": "Bentota, Sri Lanka",
+        "rating": 4.5,
+        "amenities": ["Infinity Pool", "Sahana Spa", "Gymnasium", "Library", "Restaurant", "Room Service"],
+        "policies": [
+            "Check-in: 2:00 PM",
+            "Check-out: 12:00 PM", 
+            "No pets allowed",
+            "Non-smoking rooms"
+        ],
+        "roomTypes": ["deluxe", "super_deluxe"],
+        "promotions": ["Early Bird 20% off", "Stay 3 nights get 1 free"]
+    },
+    2: {
+        "name": "Gardeo Colombo Seven",
+        "description": "Gardeo Colombo Seven is located in the heart of Colombo, the commercial capital of Sri Lanka and offers the discerning traveler contemporary accommodation and modern design aesthetic. Rising over the city landscape, the property boasts stunning views, a rooftop bar and pool, main restaurant, gym and spa services, as well as conference facilities.",
+        "location": "Colombo 07, Sri Lanka", 
+        "rating": 4.9,
+        "amenities": ["Rooftop Pool", "Spa", "Gym", "Conference Facilities", "Restaurant", "Rooftop Bar"],
+        "policies": [
+            "Check-in: 3:00 PM",
+            "Check-out: 11:00 AM",
+            "No pets allowed", 
+            "Non-smoking rooms"
+        ],
+        "roomTypes": ["studio", "super_deluxe"],
+        "promotions": ["Business Package", "Weekend Special"]
+    },
+    3: {
+        "name": "Gardeo Kandy Hills",
+        "description": "Set amidst the misty hills of Kandy, Gardeo Kandy Hills offers breathtaking views of the surrounding mountains. This heritage property combines traditional Sri Lankan architecture with modern luxury, featuring an infinity pool overlooking the valley, authentic local cuisine, and a wellness center.",
+        "location": "Kandy, Sri Lanka",
+        "rating": 4.7,
+        "amenities": ["Infinity Pool", "Wellness Center", "Heritage Restaurant", "Tea Lounge", "Mountain Biking", "Cultural Tours"],
+        "policies": [
+            "Check-in: 2:00 PM",
+            "Check-out: 11:00 AM",
+            "No pets allowed",
+            "Non-smoking rooms"
+        ],
+        "roomTypes": ["deluxe", "studio"],
+        "promotions": ["Cultural Experience Package", "Honeymoon Special"]
+    },
+    4: {
+        "name": "Gardeo Beach Resort Galle",
+        "description": "Located along the historic Galle coast, Gardeo Beach Resort offers direct beach access and stunning views of the Indian Ocean. The resort features colonial-era architecture, beachfront dining, water sports facilities, and a luxury spa.",
+        "location": "Galle, Sri Lanka",
+        "rating": 4.8,
+        "amenities": ["Private Beach", "Water Sports", "Beachfront Dining", "Luxury Spa", "Infinity Pool", "Kids Club"],
+        "policies": [
+            "Check-in: 2:00 PM", 
+            "Check-out: 12:00 PM",
+            "No pets allowed",
+            "Non-smoking rooms"
+        ],
+        "roomTypes": ["deluxe", "super_deluxe"],
+        "promotions": ["Beach Getaway Package", "Family Fun Deal"]
+    }
+}
+
+room_type_data = {
+    "deluxe": {"description": "The spacious rooms are defined by king size beds commanding a modern yet minimal ambience, with amenities set in minimalist contours of elegance and efficiency with all the creature comforts a traveler needs."},
+    "super_deluxe": {"description": "The super deluxe rooms are defined by king size beds commanding a modern yet minimal ambience, with a bathtub and amenities set in minimalist contours of elegance and efficiency with all the creature comforts a traveler needs."},
+    "studio": {"description": "The 1 bedroom serviced apartments spacious living areas as well as a kitchen housing a cooker, fridge, washing machine and microwave. Rooms are defined by king size beds commanding a modern yet minimal ambience, with amenities set in minimalist contours of elegance and efficiency with all the creature comforts a traveller needs."},
+    "standard": {"description": "The standard rooms are defined by king size beds commanding a modern yet minimal ambience, with amenities set in minimalist contours of elegance and efficiency with all the creature comforts a traveler needs."}
+}
+
+rooms_data = {
+    1: {
+        101: {
+            "room_number": "101",
+            "room_type": "standard",
+            "price_per_night": 69.99,
+            "occupancy": 2,
+            "amenities": ["Air Conditioning", "Free WiFi", "Safe"],
+            "cancellationPolicy": "Free cancellation up to 24 hours before check-in",
+            "is_available": True
+        },
+        102: {
+            "room_number": "102", 
+            "room_type": "super_deluxe",
+            "price_per_night": 149.50,
+            "occupancy": 3,
+            "amenities": ["Air Conditioning", "Mini Bar", "Free WiFi", "Safe", "Bathtub", "Sea View"],
+            "cancellationPolicy": "Free cancellation up to 24 hours before check-in",
+            "is_available": True
+        },
+        103: {
+            "room_number": "103",
+            "room_type": "deluxe",
+            "price_per_night": 99.99,
+            "occupancy": 2,
+            "amenities": ["Air Conditioning", "Mini Bar", "Free WiFi", "Safe", "Garden View"],
+            "cancellationPolicy": "Free cancellation up to 24 hours before check-in",
+            "is_available": True
+        }
+    },
+    2: {
+        201: {
+            "room_number": "201",
+            "room_type": "studio",
+            "price_per_night": 299.99,
+            "occupancy": 4,
+            "amenities": ["Air Conditioning", "Kitchen", "Free WiFi", "Safe", "Washing Machine", "City View"],
+            "cancellationPolicy": "Free cancellation up to 48 hours before check-in",
+            "is_available": True
+        },
+        202: {
+            "room_number": "202",
+            "room_type": "super_deluxe",
+            "price_per_night": 199.50,
+            "occupancy": 3,
+            "amenities": ["Air Conditioning", "Mini Bar", "Free WiFi", "Safe", "Bathtub", "City View"],
+            "cancellationPolicy": "Free cancellation up to 48 hours before check-in",
+            "is_available": True
+        },
+        203: {
+            "room_number": "203",
+            "room_type": "standard",
+            "price_per_night": 89.99,
+            "occupancy": 4,
+            "amenities": ["Air Conditioning", "Free WiFi"],
+            "cancellationPolicy": "Free cancellation up to 24 hours before check-in", 
+            "is_available": True
+        }
+    },
+    3: {
+        301: {
+            "room_number": "301",
+            "room_type": "deluxe",
+            "price_per_night": 179.99,
+            "occupancy": 2,
+            "amenities": ["Air Conditioning", "Mini Bar", "Free WiFi", "Safe", "Mountain View"],
+            "cancellationPolicy": "Free cancellation up to 24 hours before check-in",
+            "is_available": True
+        },
+        302: {
+            "room_number": "302",
+            "room_type": "studio",
+            "price_per_night": 259.99,
+            "occupancy": 4,
+            "amenities": ["Air Conditioning", "Kitchen", "Free WiFi", "Safe", "Washing Machine", "Valley View"],
+            "cancellationPolicy": "Free cancellation up to 48 hours before check-in",
+            "is_available": True
+        },
+        303: {
+            "room_number": "303",
+            "room_type": "deluxe",
+            "price_per_night": 189.99,
+            "occupancy": 2,
+            "amenities": ["Air Conditioning", "Mini Bar", "Free WiFi", "Safe", "Garden View"],
+            "cancellationPolicy": "Free cancellation up to 24 hours before check-in",
+            "is_available": True
+        }
+    },
+    4: {
+        401: {
+            "room_number": "401",
+            "room_type": "deluxe",
+            "price_per_night": 199.99,
+            "occupancy": 2,
+            "amenities": ["Air Conditioning", "Mini Bar", "Free WiFi", "Safe", "Ocean View"],
+            "cancellationPolicy": "Free cancellation up to 24 hours before check-in",
+            "is_available": True
+        },
+        402: {
+            "room_number": "402",
+            "room_type": "super_deluxe",
+            "price_per_night": 299.50,
+            "occupancy": 3,
+            "amenities": ["Air Conditioning", "Mini Bar", "Free WiFi", "Safe", "Bathtub", "Ocean View", "Private Balcony"],
+            "cancellationPolicy": "Free cancellation up to 48 hours before check-in",
+            "is_available": True
+        },
+        403: {
+            "room_number": "403",
+            "room_type": "deluxe",
+            "price_per_night": 209.99,
+            "occupancy": 2,
+            "amenities": ["Air Conditioning", "Mini Bar", "Free WiFi", "Safe", "Garden View"],
+            "cancellationPolicy": "Free cancellation up to 24 hours before check-in",
+            "is_available": True
+        }
+    }
+}
+
+user_bookings_data = [
+    {
+        "hotel_id": 1,
+        "hotel_name": "Gardeo Saman Villa",
+        "user_id": "6dcec033-8117-49bb-8363-3c519bcdbb73",
+        "room_id": 101,
+        "room_type": "deluxe",
+        "check_in": date(2024, 2, 12),
+        "check_out": date(2024, 2, 15),
+        "total_price": 299.97
+    },
+    {
+        "hotel_id": 2,
+        "hotel_name": "Gardeo Colombo Seven",
+        "user_id": "6dcec033-8117-49bb-8363-3c519bcdbb73",
+        "room_id": 201,
+        "room_type": "studio",
+        "check_in": date(2024, 3, 1),
+        "check_out": date(2024, 3, 5),
+        "total_price": 1199.96
+    }
+]
@@ -1,43 +1,211 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
 from fastapi import Depends, HTTPException, Security
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, SecurityScopes
 import jwt
-from jwt.exceptions import InvalidTokenError
+from jwt.exceptions import InvalidTokenError, PyJWKError, PyJWTError
 
 from pydantic import BaseModel
 
+logger = logging.getLogger(__name__)
+
 security = HTTPBearer()
 
+# When a JWKS URL is configured tokens are signature-verified against the
+# identity provider's keys; otherwise they are only decoded (development mode).
+JWKS_URL = os.getenv("HOTEL_API_JWKS_URL")
+JWT_ISSUER = os.getenv("HOTEL_API_JWT_ISSUER")
+JWT_AUDIENCE = os.getenv("HOTEL_API_JWT_AUDIENCE")
+
 class TokenData(BaseModel):
     username: str | None = None
     scopes: list[str] = []
 
+class JWKSFetchError(OSError):
+    """The identity provider's key set could not be fetched or parsed."""
+
+class JWKSCache:
+    """
+    Locally cached JSON Web Key Set, looked up by ``kid``.
+
+    Keys are fetched on first use and then refreshed by a background thread.
+    A token signed with an unknown ``kid`` triggers an immediate refresh, at
+    most once every ``min_refresh_interval`` seconds, to pick up rotated keys;
+    concurrent requests with that ``kid`` share one refresh. A response that
+    is not a valid key set raises JWKSFetchError, like a failed fetch.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        refresh_interval: float = 300,
+        min_refresh_interval: float = 30,
+        fetch: Optional[Callable[[], dict]] = None,
+    ):
+        self._url = url
+        self._fetch = fetch or self._fetch_url
+        self._refresh_interval = refresh_interval
+        self._min_refresh_interval = min_refresh_interval
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._last_refresh: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+
+    def _fetch_url(self) -> dict:
+        with urllib.request.urlopen(self._url, timeout=5) as response:
+            return json.load(response)
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        """Fetch the key set and replace the cached keys. Caller holds self._lock."""
+        try:
+            key_set = self._fetch()
+            if not isinstance(key_set, dict):
+                raise ValueError("JWKS response is not a JSON object")
+            jwk_set = jwt.PyJWKSet.from_dict(key_set)
+        except (ValueError, PyJWTError) as e:
+            raise JWKSFetchError(f"Invalid JWKS response: {e}") from e
+        self._keys = {key.key_id: key for key in jwk_set.keys if key.key_id}
+        self._last_refresh = time.monotonic()
+        if self._refresher is None:
+            self._refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            time.sleep(self._refresh_interval)
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Failed to refresh JWKS, keeping the cached keys")
+
+    def get_signing_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        key = self._keys.get(kid)
+        if key is None:
+            with self._lock:
+                # Requests that waited here see the keys the first one fetched
+                key = self._keys.get(kid)
+                if key is None and (
+                    self._last_refresh is None
+                    or time.monotonic() - self._last_refresh >= self._min_refresh_interval
+                ):
+                    self._refresh()
+                    key = self._keys.get(kid)
+        if key is None:
+            raise InvalidTokenError("Unknown signing key")
+        return key
+
+class ValidatedTokenCache:
+    """
+    Bounded LRU of tokens that already passed validation, keyed by the SHA-256
+    of the raw token so the cache never holds bearer tokens themselves.
+    Entries are dropped once the token's ``exp`` has passed.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self._max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[TokenData, FrozenSet[str], Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Tuple[TokenData, FrozenSet[str]]]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            token_data, scopes, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return token_data, scopes
+
+    def put(self, token: str, token_data: TokenData, expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._entries[self._key(token)] = (token_data, frozenset(token_data.scopes), expires_at)
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+jwks_cache = JWKSCache(JWKS_URL) if JWKS_URL else None
+token_cache = ValidatedTokenCache()
+
+def decode_token(token: str, jwks: Optional[JWKSCache] = None) -> dict:
+    """
+    Decode a JWT. With a JWKS cache the signature, expiry and, if configured,
+    issuer and audience are verified; without one the payload is only decoded.
+    """
+    if jwks is None:
+        return jwt.decode(token, options={"verify_signature": False})
+    signing_key = jwks.get_signing_key(jwt.get_unverified_header(token).get("kid"))
+    return jwt.decode(
+        token,
+        signing_key.key,
+        algorithms=[signing_key.algorithm_name],
+        issuer=JWT_ISSUER,
+        audience=JWT_AUDIENCE,
+        options={"verify_aud": JWT_AUDIENCE is not None, "require": ["exp"]},
+    )
+
 async def validate_token(
     security_scopes: SecurityScopes,
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> TokenData:
     """
-    Decode JWT without verifying its signature, and then validate the scopes.
-    """
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(
-            token,
-            options={"verify_signature": False},
-        )
-    except InvalidTokenError:
-        raise HTTPException(
-            status_code=401,
-            detail="Could not decode token",
-        )
-
-    username = payload.get("sub")
-    if username is None:
-        raise HTTPException(
-            status_code=401,
-            detail="Missing 'sub' in token",
-        )
-
-    token_scopes = payload.get("scope", "").split()
+    Validate the bearer token and then validate the scopes.
+
+    Tokens are signature-verified when HOTEL_API_JWKS_URL is set and only
+    decoded otherwise. Validated tokens are cached until they expire.
+    Verification runs in the threadpool, since it may fetch the JWKS.
+    """
+    token = credentials.credentials
+    cached = token_cache.get(token)
+    if cached is None:
+        try:
+            if jwks_cache is None:
+                payload = decode_token(token)
+            else:
+                payload = await run_in_threadpool(decode_token, token, jwks_cache)
+        except (InvalidTokenError, PyJWKError):
+            raise HTTPException(
+                status_code=401,
+                detail="Could not decode token",
+            )
+        except OSError:
+            raise HTTPException(
+                status_code=503,
+                detail="Could not fetch token signing keys",
+            )
+
+        username = payload.get("sub")
+        if username is None:
+            raise HTTPException(
+                status_code=401,
+                detail="Missing 'sub' in token",
+            )
+
+        token_data = TokenData(username=username, scopes=payload.get("scope", "").split())
+        expires_at = payload.get("exp")
+        token_cache.put(token, token_data, expires_at if isinstance(expires_at, (int, float)) else None)
+        token_scopes = frozenset(token_data.scopes)
+    else:
+        token_data, token_scopes = cached
+
     # Check that the token has ALL the required scopes
     for scope in security_scopes.scopes:
         if scope not in token_scopes:
@@ -46,4 +214,4 @@ async def validate_token(
                 detail="Not enough permissions",
             )
 
-    return TokenData(username=username, scopes=token_scopes)
+    return token_data
@@ -77,6 +77,13 @@ class RoomSearchResult(BaseModel):
     room_type: str
     room_type_description: str
     price_per_night: float
+    occupancy: int
+    location: str
+    amenities: List[str]
+
+class RoomSearchResults(BaseModel):
+    rooms: List[RoomSearchResult]
+    next_cursor: Optional[str] = None
 
 class BookingPreviewRequest(BaseModel):
     room_id: int
@@ -97,3 +104,29 @@ class BookingPreview(BaseModel):
     is_available: bool
     check_in: date
     check_out: date
+
+class BookingPreviewBatchRequest(BaseModel):
+    items: List[BookingPreviewRequest]
+
+class BookingPreviewBatchItem(BaseModel):
+    preview: Optional[BookingPreview] = None
+    error: Optional[str] = None
+
+class BookingPreviewBatch(BaseModel):
+    results: List[BookingPreviewBatchItem]
+
+class DateRange(BaseModel):
+    check_in: date
+    check_out: date
+
+class RoomAvailability(BaseModel):
+    room_id: int
+    room_number: str
+    occupancy_bitmap: str
+    free_ranges: List[DateRange]
+
+class HotelAvailability(BaseModel):
+    hotel_id: int
+    start_date: date
+    end_date: date
+    rooms: List[RoomAvailability]
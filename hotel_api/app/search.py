@@ -0,0 +1,147 @@
+import base64
+import json
+import re
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+SORT_FIELDS = ("price", "rating")
+
+@dataclass
+class RoomSearchQuery:
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    location: Optional[str] = None
+    room_type: Optional[str] = None
+    occupancy: Optional[int] = None
+    amenities: List[str] = field(default_factory=list)
+    check_in: Optional[date] = None
+    check_out: Optional[date] = None
+    sort: str = "price"
+    descending: bool = False
+    cursor: Optional[str] = None
+    limit: int = 20
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+def _tokens(text: str) -> Set[str]:
+    return set(re.findall(r"[a-z0-9]+", text.lower()))
+
+def encode_cursor(key: Tuple[float, int]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        value, room_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(value), int(room_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Invalid cursor")
+
+class RoomSearchIndex:
+    """
+    Precomputed lookup structures for room search.
+
+    Rooms are kept sorted by every sortable field, and the exact-match
+    filters (location tokens, room type, amenities) map to sets of room ids.
+    A search walks one sort order from the cursor position and stops as soon
+    as a page is full.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Tuple[dict, dict]] = {}
+        self._orders: Dict[str, List[Tuple[float, int]]] = {name: [] for name in SORT_FIELDS}
+        self._by_location: Dict[str, Set[int]] = {}
+        self._by_room_type: Dict[str, Set[int]] = {}
+        self._by_amenity: Dict[str, Set[int]] = {}
+
+    @staticmethod
+    def _sort_values(hotel: dict, room: dict) -> Dict[str, float]:
+        return {"price": room["price_per_night"], "rating": hotel["rating"]}
+
+    def _memberships(self, hotel: dict, room: dict) -> List[Tuple[Dict[str, Set[int]], str]]:
+        memberships = [(self._by_room_type, room["room_type"])]
+        memberships += [(self._by_location, token) for token in _tokens(hotel["location"])]
+        amenities = {a.lower() for a in room["amenities"]} | {a.lower() for a in hotel.get("amenities", [])}
+        memberships += [(self._by_amenity, amenity) for amenity in amenities]
+        return memberships
+
+    def upsert(self, hotel: dict, room: dict) -> None:
+        """Index a room, replacing any previous entry with the same id."""
+        room_id = room["id"]
+        self.remove(room_id)
+        self._entries[room_id] = (hotel, room)
+        for name, value in self._sort_values(hotel, room).items():
+            insort(self._orders[name], (value, room_id))
+        for mapping, key in self._memberships(hotel, room):
+            mapping.setdefault(key, set()).add(room_id)
+
+    def remove(self, room_id: int) -> None:
+        entry = self._entries.pop(room_id, None)
+        if entry is None:
+            return
+        hotel, room = entry
+        for name, value in self._sort_values(hotel, room).items():
+            order = self._orders[name]
+            del order[bisect_left(order, (value, room_id))]
+        for mapping, key in self._memberships(hotel, room):
+            mapping[key].discard(room_id)
+
+    def _allowed(self, query: RoomSearchQuery) -> Optional[Set[int]]:
+        """Intersect the set-indexed filters, or None if none were given."""
+        sets = []
+        if query.room_type:
+            sets.append(self._by_room_type.get(query.room_type, set()))
+        if query.location:
+            sets += [self._by_location.get(token, set()) for token in _tokens(query.location)]
+        sets += [self._by_amenity.get(amenity.lower(), set()) for amenity in query.amenities]
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return set.intersection(*sets)
+
+    def search(self, query: RoomSearchQuery, is_available: Callable[[int, int], bool]) -> Tuple[List[Tuple[dict, dict]], Optional[str]]:
+        """
+        Return one page of (hotel, room) matches and the cursor of the next page.
+
+        ``is_available(hotel_id, room_id)`` is only called for rooms that pass
+        every other filter.
+        """
+        order = self._orders[query.sort]
+        allowed = self._allowed(query)
+        cursor = decode_cursor(query.cursor) if query.cursor else None
+
+        lo, hi = 0, len(order)
+        if query.sort == "price":
+            if query.min_price is not None:
+                lo = bisect_left(order, (query.min_price,))
+            if query.max_price is not None:
+                hi = bisect_right(order, (query.max_price, float("inf")))
+        if cursor is not None:
+            if query.descending:
+                hi = min(hi, bisect_left(order, cursor))
+            else:
+                lo = max(lo, bisect_right(order, cursor))
+        positions = range(hi - 1, lo - 1, -1) if query.descending else range(lo, hi)
+
+        page: List[Tuple[dict, dict]] = []
+        last_key = None
+        for i in positions:
+            value, room_id = order[i]
+            if allowed is not None and room_id not in allowed:
+                continue
+            hotel, room = self._entries[room_id]
+            if query.min_price is not None and room["price_per_night"] < query.min_price:
+                continue
+            if query.max_price is not None and room["price_per_night"] > query.max_price:
+                continue
+            if query.occupancy is not None and room["occupancy"] < query.occupancy:
+                continue
+            if query.check_in and query.check_out and not is_available(hotel["id"], room_id):
+                continue
+            if len(page) == query.limit:
+                return page, encode_cursor(last_key)
+            page.append((hotel, room))
+            last_key = (value, room_id)
+        return page, None
@@ -0,0 +1,34 @@
+import os
+
+from .. import data
+from .base import HotelStore, RoomUnavailableError
+from .memory import InMemoryHotelStore
+from .sqlite import SQLiteHotelStore
+
+def create_store() -> HotelStore:
+    """
+    Build the store selected by HOTEL_API_STORAGE ("memory" or "sqlite").
+
+    The SQLite database path is read from HOTEL_API_DB_PATH.
+    """
+    backend = os.getenv("HOTEL_API_STORAGE", "memory")
+    if backend == "memory":
+        return InMemoryHotelStore(data.hotels_data, data.rooms_data, data.room_type_data, data.user_bookings_data)
+    if backend == "sqlite":
+        return SQLiteHotelStore(
+            os.getenv("HOTEL_API_DB_PATH", "hotel_api.db"),
+            data.hotels_data,
+            data.rooms_data,
+            data.room_type_data,
+            data.user_bookings_data,
+            pool_size=int(os.getenv("HOTEL_API_DB_POOL_SIZE", "8")),
+        )
+    raise ValueError(f"Unknown HOTEL_API_STORAGE backend: {backend}")
+
+__all__ = [
+    "HotelStore",
+    "InMemoryHotelStore",
+    "RoomUnavailableError",
+    "SQLiteHotelStore",
+    "create_store",
+]
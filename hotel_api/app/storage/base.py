@@ -0,0 +1,88 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from ..search import RoomSearchQuery
+
+class RoomUnavailableError(Exception):
+    """Raised when a booking overlaps an existing booking for the same room."""
+
+class HotelStore(ABC):
+    """
+    Storage interface behind the hotel API endpoints.
+
+    Hotels, rooms and bookings are returned as plain dicts that include their
+    ``id`` so they can be passed straight into the response schemas.
+    """
+
+    @abstractmethod
+    def catalog_version(self) -> int:
+        """Return a counter that changes whenever hotels or rooms change."""
+
+    @abstractmethod
+    def list_hotels(self) -> List[dict]:
+        """Return every hotel in the catalog."""
+
+    @abstractmethod
+    def get_hotel(self, hotel_id: int) -> Optional[dict]:
+        """Return a hotel by id, or None if it does not exist."""
+
+    @abstractmethod
+    def get_hotel_rooms(self, hotel_id: int) -> List[dict]:
+        """Return the rooms of a hotel."""
+
+    @abstractmethod
+    def find_room(self, room_id: int) -> Optional[Tuple[int, dict]]:
+        """Return (hotel_id, room) for a room id, or None if it does not exist."""
+
+    @abstractmethod
+    def upsert_room(self, hotel_id: int, room: dict) -> None:
+        """Add a room to a hotel, or replace the room with the same id."""
+
+    @abstractmethod
+    def search_rooms(self, query: RoomSearchQuery) -> Tuple[List[Tuple[dict, dict]], Optional[str]]:
+        """
+        Return one page of (hotel, room) matches for the query and the cursor
+        of the next page, or None if this is the last page.
+        """
+
+    @abstractmethod
+    def get_room_type(self, room_type: str) -> Optional[dict]:
+        """Return the details of a room type."""
+
+    @abstractmethod
+    def is_room_available(self, hotel_id: int, room_id: int, check_in: date, check_out: date) -> bool:
+        """Return True if no booking for the room overlaps [check_in, check_out)."""
+
+    @abstractmethod
+    def are_rooms_available(self, ranges: List[Tuple[int, int, date, date]]) -> List[bool]:
+        """
+        Check (hotel_id, room_id, check_in, check_out) ranges in one call and
+        return the availability of each, in order.
+        """
+
+    @abstractmethod
+    def get_booked_ranges(self, hotel_id: int, start: date, end: date) -> Dict[int, List[Tuple[date, date]]]:
+        """
+        Return, per room of the hotel, the sorted (check_in, check_out) ranges
+        that overlap [start, end).
+        """
+
+    @abstractmethod
+    def create_booking(self, booking: dict) -> dict:
+        """
+        Store a booking and return it with its assigned id.
+
+        Raises RoomUnavailableError if the room is already booked for the dates.
+        """
+
+    @abstractmethod
+    def get_booking(self, booking_id: int) -> Optional[dict]:
+        """Return a booking by id, or None if it does not exist."""
+
+    @abstractmethod
+    def get_user_bookings(self, user_id: str, start: Optional[date] = None, end: Optional[date] = None, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        """
+        Return a page of a user's bookings ordered by check-in, optionally
+        only the stays that overlap [start, end).
+        """
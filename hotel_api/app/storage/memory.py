@@ -0,0 +1,127 @@
+import itertools
+import threading
+from bisect import insort
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from ..availability import RoomAvailabilityIndex
+from ..search import RoomSearchIndex, RoomSearchQuery
+from .base import HotelStore, RoomUnavailableError
+
+class InMemoryHotelStore(HotelStore):
+    """Process-local store. Data is lost on restart and not shared between workers."""
+
+    def __init__(self, hotels: Dict[int, dict], rooms: Dict[int, Dict[int, dict]], room_types: Dict[str, dict], user_bookings: List[dict]):
+        self._hotels = {hid: {"id": hid, **hotel} for hid, hotel in hotels.items()}
+        self._rooms = {
+            hid: {rid: {"id": rid, **room} for rid, room in hotel_rooms.items()}
+            for hid, hotel_rooms in rooms.items()
+        }
+        # room_id -> (hotel_id, room), so room lookups don't walk every hotel
+        self._room_index: Dict[int, Tuple[int, dict]] = {
+            rid: (hid, room)
+            for hid, hotel_rooms in self._rooms.items()
+            for rid, room in hotel_rooms.items()
+        }
+        self._search_index = RoomSearchIndex()
+        for hotel_id, room in self._room_index.values():
+            self._search_index.upsert(self._hotels[hotel_id], room)
+        self._room_types = dict(room_types)
+        self._bookings: Dict[int, dict] = {}
+        # user_id -> [(check_in, booking_id)] kept sorted, so history lookups
+        # only touch that user's bookings
+        self._user_index: Dict[str, List[Tuple[date, int]]] = {}
+        self._user_index_lock = threading.Lock()
+        self._availability = RoomAvailabilityIndex()
+        # One lock per room: bookings for the same room serialize, bookings
+        # for different rooms never contend.
+        self._room_locks: Dict[Tuple[int, int], threading.Lock] = {}
+        # next() on itertools.count is atomic under the GIL
+        self._booking_ids = itertools.count(1)
+        self._catalog_version = 0
+        for booking in user_bookings:
+            self._store_booking({"id": next(self._booking_ids), **booking})
+
+    def catalog_version(self) -> int:
+        return self._catalog_version
+
+    def list_hotels(self) -> List[dict]:
+        return list(self._hotels.values())
+
+    def get_hotel(self, hotel_id: int) -> Optional[dict]:
+        return self._hotels.get(hotel_id)
+
+    def get_hotel_rooms(self, hotel_id: int) -> List[dict]:
+        return list(self._rooms.get(hotel_id, {}).values())
+
+    def find_room(self, room_id: int) -> Optional[Tuple[int, dict]]:
+        return self._room_index.get(room_id)
+
+    def upsert_room(self, hotel_id: int, room: dict) -> None:
+        previous = self._room_index.get(room["id"])
+        if previous and previous[0] != hotel_id:
+            del self._rooms[previous[0]][room["id"]]
+        self._rooms.setdefault(hotel_id, {})[room["id"]] = room
+        self._room_index[room["id"]] = (hotel_id, room)
+        self._search_index.upsert(self._hotels[hotel_id], room)
+        self._catalog_version += 1
+
+    def search_rooms(self, query: RoomSearchQuery) -> Tuple[List[Tuple[dict, dict]], Optional[str]]:
+        return self._search_index.search(
+            query,
+            lambda hotel_id, room_id: self.is_room_available(hotel_id, room_id, query.check_in, query.check_out),
+        )
+
+    def get_room_type(self, room_type: str) -> Optional[dict]:
+        return self._room_types.get(room_type)
+
+    def _room_lock(self, hotel_id: int, room_id: int) -> threading.Lock:
+        lock = self._room_locks.get((hotel_id, room_id))
+        if lock is None:
+            lock = self._room_locks.setdefault((hotel_id, room_id), threading.Lock())
+        return lock
+
+    def is_room_available(self, hotel_id: int, room_id: int, check_in: date, check_out: date) -> bool:
+        with self._room_lock(hotel_id, room_id):
+            return self._availability.is_available(hotel_id, room_id, check_in, check_out)
+
+    def are_rooms_available(self, ranges: List[Tuple[int, int, date, date]]) -> List[bool]:
+        return [
+            self.is_room_available(hotel_id, room_id, check_in, check_out)
+            for hotel_id, room_id, check_in, check_out in ranges
+        ]
+
+    def get_booked_ranges(self, hotel_id: int, start: date, end: date) -> Dict[int, List[Tuple[date, date]]]:
+        ranges = {}
+        for room_id in self._rooms.get(hotel_id, {}):
+            with self._room_lock(hotel_id, room_id):
+                ranges[room_id] = self._availability.booked_ranges(hotel_id, room_id, start, end)
+        return ranges
+
+    def create_booking(self, booking: dict) -> dict:
+        hotel_id, room_id = booking["hotel_id"], booking["room_id"]
+        with self._room_lock(hotel_id, room_id):
+            if not self._availability.is_available(hotel_id, room_id, booking["check_in"], booking["check_out"]):
+                raise RoomUnavailableError()
+            record = {"id": next(self._booking_ids), **booking}
+            self._store_booking(record)
+        return record
+
+    def _store_booking(self, record: dict) -> None:
+        self._availability.add(record["hotel_id"], record["room_id"], record["check_in"], record["check_out"])
+        self._bookings[record["id"]] = record
+        with self._user_index_lock:
+            insort(self._user_index.setdefault(record["user_id"], []), (record["check_in"], record["id"]))
+
+    def get_booking(self, booking_id: int) -> Optional[dict]:
+        return self._bookings.get(booking_id)
+
+    def get_user_bookings(self, user_id: str, start: Optional[date] = None, end: Optional[date] = None, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        with self._user_index_lock:
+            entries = list(self._user_index.get(user_id, ()))
+        bookings = (self._bookings[booking_id] for _, booking_id in entries)
+        matches = [
+            booking for booking in bookings
+            if (start is None or booking["check_out"] > start) and (end is None or booking["check_in"] < end)
+        ]
+        return matches[offset:None if limit is None else offset + limit]
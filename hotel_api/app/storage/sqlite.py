@@ -0,0 +1,308 @@
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..search import RoomSearchIndex, RoomSearchQuery
+from .base import HotelStore, RoomUnavailableError
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hotels (
+    id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS room_types (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rooms (
+    id INTEGER PRIMARY KEY,
+    hotel_id INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rooms_hotel ON rooms (hotel_id);
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO catalog_meta (id, version) VALUES (1, 0);
+CREATE TABLE IF NOT EXISTS bookings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    hotel_id INTEGER NOT NULL,
+    hotel_name TEXT NOT NULL,
+    room_id INTEGER NOT NULL,
+    room_type TEXT NOT NULL,
+    check_in TEXT NOT NULL,
+    check_out TEXT NOT NULL,
+    total_price REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bookings_room_check_in ON bookings (hotel_id, room_id, check_in);
+CREATE INDEX IF NOT EXISTS idx_bookings_hotel_check_out ON bookings (hotel_id, check_out, room_id, check_in);
+CREATE INDEX IF NOT EXISTS idx_bookings_user_check_in ON bookings (user_id, check_in);
+"""
+
+# Statements are kept as module constants so sqlite3's per-connection
+# statement cache reuses the prepared form on every call.
+_SELECT_CATALOG_VERSION = "SELECT version FROM catalog_meta WHERE id = 1"
+_BUMP_CATALOG_VERSION = "UPDATE catalog_meta SET version = version + 1 WHERE id = 1"
+_SELECT_HOTELS = "SELECT data FROM hotels ORDER BY id"
+_SELECT_HOTEL = "SELECT data FROM hotels WHERE id = ?"
+_SELECT_HOTEL_ROOMS = "SELECT data FROM rooms WHERE hotel_id = ? ORDER BY id"
+_SELECT_ROOM = "SELECT hotel_id, data FROM rooms WHERE id = ?"
+_UPSERT_ROOM = "INSERT OR REPLACE INTO rooms (id, hotel_id, data) VALUES (?, ?, ?)"
+_SELECT_ROOM_TYPE = "SELECT data FROM room_types WHERE name = ?"
+# Stays of one room never overlap, so only the last stay starting before the
+# new check-out can overlap it; this reads one entry of the room index.
+_SELECT_PREVIOUS_CHECK_OUT = (
+    "SELECT check_out FROM bookings "
+    "WHERE hotel_id = ? AND room_id = ? AND check_in < ? ORDER BY check_in DESC LIMIT 1"
+)
+# Bounded by check_out on idx_bookings_hotel_check_out, which also covers
+# the selected columns, so past stays are skipped without reading the table.
+_SELECT_HOTEL_BOOKED_RANGES = (
+    "SELECT room_id, check_in, check_out FROM bookings "
+    "WHERE hotel_id = ? AND check_out > ? AND check_in < ? ORDER BY room_id, check_in"
+)
+_INSERT_BOOKING = (
+    "INSERT INTO bookings (user_id, hotel_id, hotel_name, room_id, room_type, check_in, check_out, total_price) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_SELECT_BOOKING = "SELECT * FROM bookings WHERE id = ?"
+_SELECT_USER_BOOKINGS = (
+    "SELECT * FROM bookings "
+    "WHERE user_id = ? AND (? IS NULL OR check_out > ?) AND (? IS NULL OR check_in < ?) "
+    "ORDER BY check_in, id LIMIT ? OFFSET ?"
+)
+
+_BOOKING_COLUMNS = ("user_id", "hotel_id", "hotel_name", "room_id", "room_type", "check_in", "check_out", "total_price")
+
+class _ConnectionPool:
+    """
+    Pool of SQLite connections shared by the request threads of one process.
+
+    A connection is opened whenever none is idle, so concurrency is not
+    capped; at most ``size`` connections are kept open for reuse and the
+    rest are closed when returned.
+    """
+
+    def __init__(self, path: str, size: int):
+        self._path = path
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    # IMMEDIATE takes the write lock up front so check-then-insert is atomic
+    # across every process sharing the database file.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+def _is_free(conn: sqlite3.Connection, hotel_id: int, room_id: int, check_in: date, check_out: date) -> bool:
+    row = conn.execute(_SELECT_PREVIOUS_CHECK_OUT, (hotel_id, room_id, check_out.isoformat())).fetchone()
+    return row is None or row["check_out"] <= check_in.isoformat()
+
+def _booking_from_row(row: sqlite3.Row) -> dict:
+    booking = dict(row)
+    booking["check_in"] = date.fromisoformat(booking["check_in"])
+    booking["check_out"] = date.fromisoformat(booking["check_out"])
+    return booking
+
+class SQLiteHotelStore(HotelStore):
+    """
+    SQLite-backed store that survives restarts and can be shared by several
+    uvicorn workers pointing at the same database file.
+    """
+
+    def __init__(self, path: str, hotels: Dict[int, dict], rooms: Dict[int, Dict[int, dict]], room_types: Dict[str, dict], user_bookings: List[dict], pool_size: int = 8):
+        self._pool = _ConnectionPool(path, pool_size)
+        with self._pool.connection() as conn:
+            conn.executescript(_SCHEMA)
+            self._seed(conn, hotels, rooms, room_types, user_bookings)
+        # The catalog is small and read-mostly, so search runs against an
+        # in-process index. It is rebuilt when the catalog version moves,
+        # e.g. after another worker updated a room.
+        self._search_index_lock = threading.Lock()
+        self._search_index, self._search_index_version = self._build_search_index()
+
+    def _build_search_index(self) -> Tuple[RoomSearchIndex, int]:
+        """Index the catalog as of the returned version."""
+        with self._pool.connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                version = conn.execute(_SELECT_CATALOG_VERSION).fetchone()["version"]
+                hotels = {row["id"]: json.loads(row["data"]) for row in conn.execute("SELECT id, data FROM hotels")}
+                rooms = [(row["hotel_id"], json.loads(row["data"])) for row in conn.execute("SELECT hotel_id, data FROM rooms ORDER BY id")]
+            finally:
+                conn.execute("COMMIT")
+        index = RoomSearchIndex()
+        for hotel_id, room in rooms:
+            if hotel_id in hotels:
+                index.upsert(hotels[hotel_id], room)
+        return index, version
+
+    def _current_search_index(self) -> RoomSearchIndex:
+        version = self.catalog_version()
+        if version != self._search_index_version:
+            with self._search_index_lock:
+                if version != self._search_index_version:
+                    self._search_index, self._search_index_version = self._build_search_index()
+        return self._search_index
+
+    def _seed(self, conn: sqlite3.Connection, hotels: Dict[int, dict], rooms: Dict[int, Dict[int, dict]], room_types: Dict[str, dict], user_bookings: List[dict]) -> None:
+        """Load the seed catalog and booking history into an empty database. Existing rows are kept."""
+        with _transaction(conn):
+            conn.executemany(
+                "INSERT OR IGNORE INTO hotels (id, data) VALUES (?, ?)",
+                [(hid, json.dumps({"id": hid, **hotel})) for hid, hotel in hotels.items()],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO room_types (name, data) VALUES (?, ?)",
+                [(name, json.dumps(details)) for name, details in room_types.items()],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO rooms (id, hotel_id, data) VALUES (?, ?, ?)",
+                [
+                    (rid, hid, json.dumps({"id": rid, **room}))
+                    for hid, hotel_rooms in rooms.items()
+                    for rid, room in hotel_rooms.items()
+                ],
+            )
+            if conn.execute("SELECT 1 FROM bookings LIMIT 1").fetchone() is None:
+                conn.executemany(
+                    _INSERT_BOOKING,
+                    [
+                        tuple(b[c].isoformat() if isinstance(b[c], date) else b[c] for c in _BOOKING_COLUMNS)
+                        for b in user_bookings
+                    ],
+                )
+
+    def catalog_version(self) -> int:
+        with self._pool.connection() as conn:
+            return conn.execute(_SELECT_CATALOG_VERSION).fetchone()["version"]
+
+    def list_hotels(self) -> List[dict]:
+        with self._pool.connection() as conn:
+            return [json.loads(row["data"]) for row in conn.execute(_SELECT_HOTELS)]
+
+    def get_hotel(self, hotel_id: int) -> Optional[dict]:
+        with self._pool.connection() as conn:
+            row = conn.execute(_SELECT_HOTEL, (hotel_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_hotel_rooms(self, hotel_id: int) -> List[dict]:
+        with self._pool.connection() as conn:
+            return [json.loads(row["data"]) for row in conn.execute(_SELECT_HOTEL_ROOMS, (hotel_id,))]
+
+    def find_room(self, room_id: int) -> Optional[Tuple[int, dict]]:
+        with self._pool.connection() as conn:
+            row = conn.execute(_SELECT_ROOM, (room_id,)).fetchone()
+        return (row["hotel_id"], json.loads(row["data"])) if row else None
+
+    def upsert_room(self, hotel_id: int, room: dict) -> None:
+        with self._pool.connection() as conn, _transaction(conn):
+            conn.execute(_UPSERT_ROOM, (room["id"], hotel_id, json.dumps(room)))
+            conn.execute(_BUMP_CATALOG_VERSION)
+            version = conn.execute(_SELECT_CATALOG_VERSION).fetchone()["version"]
+        with self._search_index_lock:
+            # Update in place only if the index saw every earlier change;
+            # otherwise the next search rebuilds it.
+            if self._search_index_version == version - 1:
+                self._search_index.upsert(self.get_hotel(hotel_id), room)
+                self._search_index_version = version
+
+    def search_rooms(self, query: RoomSearchQuery) -> Tuple[List[Tuple[dict, dict]], Optional[str]]:
+        return self._current_search_index().search(
+            query,
+            lambda hotel_id, room_id: self.is_room_available(hotel_id, room_id, query.check_in, query.check_out),
+        )
+
+    def get_room_type(self, room_type: str) -> Optional[dict]:
+        with self._pool.connection() as conn:
+            row = conn.execute(_SELECT_ROOM_TYPE, (room_type,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def is_room_available(self, hotel_id: int, room_id: int, check_in: date, check_out: date) -> bool:
+        with self._pool.connection() as conn:
+            return _is_free(conn, hotel_id, room_id, check_in, check_out)
+
+    def are_rooms_available(self, ranges: List[Tuple[int, int, date, date]]) -> List[bool]:
+        # One pooled connection and one prepared statement for the whole batch
+        with self._pool.connection() as conn:
+            return [_is_free(conn, *stay) for stay in ranges]
+
+    def get_booked_ranges(self, hotel_id: int, start: date, end: date) -> Dict[int, List[Tuple[date, date]]]:
+        ranges: Dict[int, List[Tuple[date, date]]] = {}
+        with self._pool.connection() as conn:
+            for row in conn.execute(_SELECT_HOTEL_BOOKED_RANGES, (hotel_id, start.isoformat(), end.isoformat())):
+                ranges.setdefault(row["room_id"], []).append(
+                    (date.fromisoformat(row["check_in"]), date.fromisoformat(row["check_out"]))
+                )
+        return ranges
+
+    def create_booking(self, booking: dict) -> dict:
+        params = tuple(
+            booking[c].isoformat() if isinstance(booking[c], date) else booking[c]
+            for c in _BOOKING_COLUMNS
+        )
+        with self._pool.connection() as conn, _transaction(conn):
+            if not _is_free(conn, booking["hotel_id"], booking["room_id"], booking["check_in"], booking["check_out"]):
+                raise RoomUnavailableError()
+            cursor = conn.execute(_INSERT_BOOKING, params)
+        return {"id": cursor.lastrowid, **booking}
+
+    def get_booking(self, booking_id: int) -> Optional[dict]:
+        with self._pool.connection() as conn:
+            row = conn.execute(_SELECT_BOOKING, (booking_id,)).fetchone()
+        return _booking_from_row(row) if row else None
+
+    def get_user_bookings(self, user_id: str, start: Optional[date] = None, end: Optional[date] = None, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        start_param = start.isoformat() if start else None
+        end_param = end.isoformat() if end else None
+        params = (user_id, start_param, start_param, end_param, end_param, -1 if limit is None else limit, offset)
+        with self._pool.connection() as conn:
+            return [_booking_from_row(row) for row in conn.execute(_SELECT_USER_BOOKINGS, params)]
+
+    def close(self) -> None:
+        self._pool.close()
@@ -0,0 +1,91 @@
+"""
+Availability check latency against the number of existing bookings: the
+old walk over every booking vs the per-room indexes of InMemoryHotelStore
+and SQLiteHotelStore.
+
+Bookings come from the load test's synthetic catalog and are spread over
+--rooms rooms, so a room holds about bookings/rooms stays. Every check asks
+for a random 1-5 night stay of a random room inside the seeded date range,
+so both free and booked dates are hit. The linear scan is slow at large
+sizes and only runs --scan-checks checks.
+
+    python -m hotel_api.benchmarks.availability --sizes 1000,10000,100000,1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+from hotel_api.app.storage import InMemoryHotelStore, SQLiteHotelStore
+from hotel_api.benchmarks.load_test import SEED_START, build_catalog
+from hotel_api.benchmarks.timing import measure
+
+Stay = Tuple[int, int, date, date]
+
+def stays(hotels: int, rooms: int, bookings: int, checks: int, seed: int) -> List[Stay]:
+    rng = random.Random(seed)
+    # build_catalog leaves an average of 5.5 days per stay, gaps included
+    span = max(1, bookings * 11 // (rooms * 2))
+    result = []
+    for _ in range(checks):
+        room_id = rng.randint(1, rooms)
+        check_in = SEED_START + timedelta(days=rng.randrange(span))
+        result.append(((room_id - 1) % hotels + 1, room_id, check_in, check_in + timedelta(days=rng.randint(1, 5))))
+    return result
+
+def scan_available(bookings: List[dict], hotel_id: int, room_id: int, check_in: date, check_out: date) -> bool:
+    """The availability check the endpoints ran before the per-room index."""
+    for existing in bookings:
+        if (existing["hotel_id"] == hotel_id and
+                existing["room_id"] == room_id and
+                not (check_out <= existing["check_in"] or check_in >= existing["check_out"])):
+            return False
+    return True
+
+def run(size: int, args: argparse.Namespace) -> None:
+    catalog = build_catalog(args.hotels, args.rooms, size, 100, args.seed)
+    checks = stays(args.hotels, args.rooms, size, args.checks, args.seed)
+
+    scan: Optional[Tuple[float, float, int]] = None
+    if args.scan_checks:
+        scan = measure(lambda *stay: scan_available(catalog[3], *stay), checks[:args.scan_checks])
+
+    memory_store = InMemoryHotelStore(*catalog)
+    memory = measure(memory_store.is_room_available, checks)
+    del memory_store
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_store = SQLiteHotelStore(os.path.join(tmp, "bench.db"), *catalog)
+        sqlite = measure(sqlite_store.is_room_available, checks)
+        sqlite_store.close()
+
+    if memory[2] != sqlite[2]:
+        raise SystemExit(f"stores disagree at {size} bookings: {memory[2]} vs {sqlite[2]} available")
+    scan_column = f"{scan[0]:>12.1f}" if scan else f"{'-':>12}"
+    print(
+        f"{size:>10} {scan_column} {memory[0]:>12.2f} {memory[1]:>12.2f} "
+        f"{sqlite[0]:>12.2f} {sqlite[1]:>12.2f} {memory[2] / len(checks):>10.0%}",
+        flush=True,
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000", help="existing bookings per run")
+    parser.add_argument("--hotels", type=int, default=100)
+    parser.add_argument("--rooms", type=int, default=10000)
+    parser.add_argument("--checks", type=int, default=5000, help="availability checks per store")
+    parser.add_argument("--scan-checks", type=int, default=20, help="checks for the linear scan, 0 to skip it")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(
+        f"{'bookings':>10} {'scan µs':>12} {'memory µs':>12} {'memory p99':>12} "
+        f"{'sqlite µs':>12} {'sqlite p99':>12} {'available':>10}"
+    )
+    for size in (int(size) for size in args.sizes.split(",")):
+        run(size, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Concurrent double-booking stress test for InMemoryHotelStore and
+SQLiteHotelStore.
+
+Every round releases --threads threads from a barrier at once, all booking
+the same room for stays that overlap each other (every stay covers the
+round's third night), so exactly one booking per round may succeed. Rounds
+cycle over --rooms rooms. For SQLite the threads are spread over
+--sqlite-stores store instances on one database file, the way several
+uvicorn workers share it.
+
+Afterwards the stored stays of every room are checked for overlaps and the
+booking ids for duplicates. The exit status is 1 on any violation.
+
+    python -m hotel_api.benchmarks.booking_stress --threads 32 --rounds 500
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+from hotel_api.app.storage import HotelStore, InMemoryHotelStore, RoomUnavailableError, SQLiteHotelStore
+from hotel_api.benchmarks.load_test import BOOKING_START, build_catalog, user_id
+
+# Rounds that reuse a room move this many days later, past every earlier stay
+ROUND_DAYS = 7
+
+def stay(rng: random.Random, start: date) -> Tuple[date, date]:
+    """A 1-5 night stay that always includes the night of start + 2 days."""
+    check_in = start + timedelta(days=rng.randint(0, 2))
+    return check_in, start + timedelta(days=rng.randint(3, 5))
+
+def run(name: str, stores: List[HotelStore], catalog: tuple, args: argparse.Namespace) -> List[str]:
+    hotels, rooms = catalog[0], catalog[1]
+    room_keys = [(hotel_id, room_id) for hotel_id, hotel_rooms in rooms.items() for room_id in hotel_rooms]
+    barrier = threading.Barrier(args.threads)
+
+    def worker(n: int) -> List[Tuple[int, Optional[int]]]:
+        rng = random.Random(args.seed * 1000 + n)
+        store = stores[n % len(stores)]
+        outcomes = []
+        try:
+            for r in range(args.rounds):
+                hotel_id, room_id = room_keys[r % len(room_keys)]
+                room = rooms[hotel_id][room_id]
+                check_in, check_out = stay(rng, BOOKING_START + timedelta(days=r // len(room_keys) * ROUND_DAYS))
+                barrier.wait(timeout=60)
+                try:
+                    created = store.create_booking({
+                        "hotel_id": hotel_id,
+                        "hotel_name": hotels[hotel_id]["name"],
+                        "user_id": user_id(n),
+                        "room_id": room_id,
+                        "room_type": room["room_type"],
+                        "check_in": check_in,
+                        "check_out": check_out,
+                        "total_price": room["price_per_night"] * (check_out - check_in).days,
+                    })
+                    outcomes.append((r, created["id"]))
+                except RoomUnavailableError:
+                    outcomes.append((r, None))
+        except BaseException:
+            # Release the other threads instead of leaving them at the barrier
+            barrier.abort()
+            raise
+        return outcomes
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        outcomes = [o for result in executor.map(worker, range(args.threads)) for o in result]
+    elapsed = time.perf_counter() - start
+
+    violations = []
+    succeeded = Counter(r for r, booking_id in outcomes if booking_id is not None)
+    for r in range(args.rounds):
+        if succeeded[r] != 1:
+            violations.append(f"{name}: round {r} booked {succeeded[r]} times")
+    booking_ids = [booking_id for _, booking_id in outcomes if booking_id is not None]
+    if len(set(booking_ids)) != len(booking_ids):
+        violations.append(f"{name}: {len(booking_ids) - len(set(booking_ids))} duplicate booking ids")
+
+    end = BOOKING_START + timedelta(days=(args.rounds // len(room_keys) + 1) * ROUND_DAYS)
+    stored = 0
+    for hotel_id in rooms:
+        for room_id, ranges in stores[0].get_booked_ranges(hotel_id, BOOKING_START, end).items():
+            stored += len(ranges)
+            for (_, previous_out), (next_in, _) in zip(ranges, ranges[1:]):
+                if next_in < previous_out:
+                    violations.append(f"{name}: room {room_id} has overlapping stays around {next_in}")
+    if stored != len(booking_ids):
+        violations.append(f"{name}: {stored} stays stored for {len(booking_ids)} successful bookings")
+
+    print(
+        f"{name:<8} {args.rounds:>8} {len(outcomes):>10} {len(booking_ids):>10} "
+        f"{len(outcomes) / elapsed:>12.0f} {len(violations):>11}",
+        flush=True,
+    )
+    return violations
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16, help="concurrent bookings per round")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--rooms", type=int, default=8)
+    parser.add_argument("--sqlite-stores", type=int, default=2, help="SQLite store instances sharing the file")
+    parser.add_argument("--storage", choices=("memory", "sqlite", "both"), default="both")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # One room per hotel, no seeded bookings
+    catalog = build_catalog(args.rooms, args.rooms, 0, args.threads, args.seed)
+    print(f"{'store':<8} {'rounds':>8} {'attempts':>10} {'booked':>10} {'attempts/s':>12} {'violations':>11}")
+    violations = []
+    if args.storage in ("memory", "both"):
+        violations += run("memory", [InMemoryHotelStore(*catalog)], catalog, args)
+    if args.storage in ("sqlite", "both"):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "hotel_api.db")
+            stores = [SQLiteHotelStore(path, *catalog) for _ in range(args.sqlite_stores)]
+            try:
+                violations += run("sqlite", stores, catalog, args)
+            finally:
+                for store in stores:
+                    store.close()
+    for violation in violations:
+        print(violation, file=sys.stderr)
+    sys.exit(1 if violations else 0)
+
+if __name__ == "__main__":
+    main()
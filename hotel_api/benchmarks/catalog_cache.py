@@ -0,0 +1,92 @@
+"""
+Throughput of GET /hotels and GET /hotels/{id}: the handlers as they were
+before the catalog response cache (pydantic models rebuilt and serialized
+on every request) vs the cached bodies, with and without If-None-Match.
+
+Requests go through the ASGI app in-process with httpx, so the numbers
+include routing, token validation and serialization but no network. The
+catalog is the load test's synthetic one with --hotels hotels.
+
+    python -m hotel_api.benchmarks.catalog_cache --hotels 200 --requests 2000
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import FastAPI, HTTPException, Security
+
+from hotel_api.app import dependencies, main as api
+from hotel_api.app.catalog_cache import CatalogResponseCache
+from hotel_api.app.dependencies import TokenData, validate_token
+from hotel_api.app.schemas import Hotel, HotelBasic, Hotels, Room
+from hotel_api.app.storage import InMemoryHotelStore
+from hotel_api.benchmarks.load_test import TokenMinter, build_catalog
+
+def uncached_app() -> FastAPI:
+    """list_hotels and get_hotel as they were before the response cache."""
+    app = FastAPI()
+
+    @app.get("/hotels", response_model=Hotels)
+    async def list_hotels(token_data: TokenData = Security(validate_token, scopes=["read_hotels"])):
+        return {"hotels": [HotelBasic(**hotel) for hotel in api.store.list_hotels()]}
+
+    @app.get("/hotels/{hotel_id}", response_model=Hotel)
+    async def get_hotel(hotel_id: int, token_data: TokenData = Security(validate_token, scopes=["read_rooms"])):
+        hotel = api.store.get_hotel(hotel_id)
+        if not hotel:
+            raise HTTPException(status_code=404, detail="Hotel not found")
+        rooms = [Room(**room) for room in api.store.get_hotel_rooms(hotel_id)]
+        return {**hotel, "rooms": rooms}
+
+    return app
+
+async def drive(app: FastAPI, paths: List[str], headers: dict, etags: Optional[Dict[str, str]] = None) -> Tuple[float, Dict[str, str]]:
+    """Send one GET per path in turn; return requests per second and the ETag seen per path."""
+    expected = 200 if etags is None else 304
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        seen = {}
+        start = time.perf_counter()
+        for path in paths:
+            request_headers = headers if etags is None else {**headers, "If-None-Match": etags[path]}
+            response = await client.get(path, headers=request_headers)
+            if response.status_code != expected:
+                raise SystemExit(f"GET {path} returned {response.status_code}, expected {expected}")
+            seen[path] = response.headers.get("etag")
+        return len(paths) / (time.perf_counter() - start), seen
+
+async def run(args: argparse.Namespace) -> None:
+    api.store = InMemoryHotelStore(*build_catalog(args.hotels, args.hotels * args.rooms_per_hotel, 0, 1, args.seed))
+    api.catalog_cache = CatalogResponseCache()
+    # Tokens are only decoded, as in development
+    dependencies.jwks_cache = None
+    headers = {"Authorization": f"Bearer {TokenMinter(1).tokens[0]}"}
+
+    rng = random.Random(args.seed)
+    routes = {
+        "/hotels": ["/hotels"] * args.requests,
+        "/hotels/{id}": [f"/hotels/{rng.randint(1, args.hotels)}" for _ in range(args.requests)],
+    }
+    baseline = uncached_app()
+    print(f"{'route':<14} {'uncached rps':>14} {'cached rps':>14} {'304 rps':>14} {'speedup':>9}")
+    for route, paths in routes.items():
+        uncached, _ = await drive(baseline, paths, headers)
+        # The first pass fills the cache; time the warm one
+        _, etags = await drive(api.app, sorted(set(paths)), headers)
+        cached, _ = await drive(api.app, paths, headers)
+        not_modified, _ = await drive(api.app, paths, headers, etags)
+        print(f"{route:<14} {uncached:>14.0f} {cached:>14.0f} {not_modified:>14.0f} {cached / uncached:>8.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hotels", type=int, default=200)
+    parser.add_argument("--rooms-per-hotel", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per route and mode")
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""
+Load test for every hotel_api route: p50/p95/p99 latency and RPS per route.
+
+A server process is started with a synthetic catalog of --hotels hotels,
+--rooms rooms and --bookings bookings (same --seed, so the client knows
+every id), then each route is driven in turn with --requests requests at
+--concurrency. Tokens are minted locally for --users users; with
+--verify-signatures they are RS256-signed and the server checks them
+against a local JWKS, otherwise they are only decoded as in development.
+
+    python -m hotel_api.benchmarks.load_test --requests 2000 --concurrency 32
+
+The report is JSON (stdout or --output). With --baseline, p95 latencies are
+compared against an earlier report and the exit status is 1 when any route
+got slower by more than --max-regression.
+
+To run the server on another host, start it there with --serve and the
+same catalog options and point the client at it with --url. Restart it
+between runs, since the bookings a run creates stay in the catalog. When
+client and server share a host they compete for CPU, so keep --concurrency
+at a level the client can sustain.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Tuple
+
+import httpx
+import jwt
+from jwt.algorithms import RSAAlgorithm
+
+LOCATIONS = ["Bentota", "Colombo 07", "Kandy", "Galle", "Ella", "Trincomalee", "Jaffna", "Negombo", "Sigiriya", "Mirissa"]
+HOTEL_AMENITIES = ["Infinity Pool", "Spa", "Gym", "Restaurant", "Room Service", "Rooftop Bar", "Private Beach", "Kids Club"]
+ROOM_AMENITIES = ["Air Conditioning", "Mini Bar", "Free WiFi", "Safe", "Bathtub", "Sea View", "Garden View", "Balcony"]
+SCOPES = "read_hotels read_rooms create_bookings read_bookings read_loyalty"
+KEY_ID = "load-test"
+# Without --verify-signatures the server never checks the signature
+UNVERIFIED_SECRET = "hotel-api-load-test-unverified-secret"
+# Seeded bookings are spread over SEED_START...; bookings made by the test start at BOOKING_START
+SEED_START = date(2025, 1, 1)
+BOOKING_START = date(2030, 1, 1)
+
+def user_id(n: int) -> str:
+    return f"load-test-user-{n}"
+
+def build_catalog(hotels: int, rooms: int, bookings: int, users: int, seed: int) -> Tuple[dict, dict, dict, List[dict]]:
+    """Return (hotels_data, rooms_data, room_type_data, user_bookings_data) in the layout of app/data.py."""
+    from hotel_api.app import data
+
+    rng = random.Random(seed)
+    room_types = list(data.room_type_data)
+    hotels_data = {
+        hotel_id: {
+            "name": f"Gardeo Load Test {hotel_id}",
+            "description": "Synthetic hotel generated for load testing. " * 4,
+            "location": f"{rng.choice(LOCATIONS)}, Sri Lanka",
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+            "amenities": rng.sample(HOTEL_AMENITIES, 4),
+            "policies": ["Check-in: 2:00 PM", "Check-out: 12:00 PM", "No pets allowed"],
+            "roomTypes": rng.sample(room_types, 2),
+            "promotions": ["Early Bird 20% off"],
+        }
+        for hotel_id in range(1, hotels + 1)
+    }
+    rooms_data: Dict[int, Dict[int, dict]] = {hotel_id: {} for hotel_id in hotels_data}
+    for room_id in range(1, rooms + 1):
+        hotel_id = (room_id - 1) % hotels + 1
+        rooms_data[hotel_id][room_id] = {
+            "room_number": str(room_id),
+            "room_type": rng.choice(hotels_data[hotel_id]["roomTypes"]),
+            "price_per_night": round(rng.uniform(50, 500), 2),
+            "occupancy": rng.randint(1, 4),
+            "amenities": rng.sample(ROOM_AMENITIES, 4),
+            "cancellationPolicy": "Free cancellation up to 24 hours before check-in",
+            "is_available": True,
+        }
+    # Non-overlapping stays per room, so the seed never conflicts with itself
+    next_free = {room_id: SEED_START for room_id in range(1, rooms + 1)}
+    user_bookings = []
+    for _ in range(bookings):
+        room_id = rng.randint(1, rooms)
+        hotel_id = (room_id - 1) % hotels + 1
+        check_in = next_free[room_id] + timedelta(days=rng.randint(0, 5))
+        check_out = check_in + timedelta(days=rng.randint(1, 5))
+        next_free[room_id] = check_out
+        room = rooms_data[hotel_id][room_id]
+        user_bookings.append({
+            "hotel_id": hotel_id,
+            "hotel_name": hotels_data[hotel_id]["name"],
+            "user_id": user_id(rng.randrange(users)),
+            "room_id": room_id,
+            "room_type": room["room_type"],
+            "check_in": check_in,
+            "check_out": check_out,
+            "total_price": room["price_per_night"] * (check_out - check_in).days,
+        })
+    return hotels_data, rooms_data, dict(data.room_type_data), user_bookings
+
+def serve(args: argparse.Namespace) -> None:
+    """Run hotel_api on the synthetic catalog (the --serve side of the harness)."""
+    import uvicorn
+    from hotel_api.app import dependencies, main
+    from hotel_api.app.catalog_cache import CatalogResponseCache
+    from hotel_api.app.storage import InMemoryHotelStore, SQLiteHotelStore
+
+    catalog = build_catalog(args.hotels, args.rooms, args.bookings, args.users, args.seed)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="hotel_api_load_test_")
+    if args.storage == "sqlite":
+        main.store = SQLiteHotelStore(os.path.join(workdir, "hotel_api.db"), *catalog)
+    else:
+        main.store = InMemoryHotelStore(*catalog)
+    main.catalog_cache = CatalogResponseCache()
+    if args.verify_signatures:
+        with open(os.path.join(workdir, "key.jwk")) as f:
+            private_key = RSAAlgorithm.from_jwk(f.read())
+        public_jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+        jwk_set = {"keys": [{**public_jwk, "kid": KEY_ID, "alg": "RS256", "use": "sig"}]}
+        dependencies.jwks_cache = dependencies.JWKSCache(fetch=lambda: jwk_set)
+    uvicorn.run(main.app, host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+
+class TokenMinter:
+    """One token per user with every scope; RS256-signed when a private key is given."""
+
+    def __init__(self, users: int, private_key=None):
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=2)
+        self.tokens = []
+        for n in range(users):
+            claims = {"sub": user_id(n), "scope": SCOPES, "exp": expires_at}
+            if private_key is None:
+                self.tokens.append(jwt.encode(claims, UNVERIFIED_SECRET, algorithm="HS256"))
+            else:
+                self.tokens.append(jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": KEY_ID}))
+
+    def headers(self, rng: random.Random) -> dict:
+        return {"Authorization": f"Bearer {rng.choice(self.tokens)}"}
+
+# A route builds (method, path, request kwargs) for the i-th request
+RequestBuilder = Callable[[int, random.Random], Tuple[str, str, dict]]
+
+def build_routes(args: argparse.Namespace) -> Dict[str, RequestBuilder]:
+    """Request builders keyed by the endpoint function names in app/main.py."""
+    hotels, rooms, users = args.hotels, args.rooms, args.users
+
+    def stay(rng: random.Random, max_nights: int = 5) -> Tuple[str, str]:
+        check_in = SEED_START + timedelta(days=rng.randint(0, 365))
+        return check_in.isoformat(), (check_in + timedelta(days=rng.randint(1, max_nights))).isoformat()
+
+    def search_rooms(i, rng):
+        params = {"location": rng.choice(LOCATIONS), "sort": rng.choice(["price", "-price", "rating", "-rating"])}
+        if rng.random() < 0.5:
+            params["min_price"], params["max_price"] = 50, rng.randint(100, 500)
+        if rng.random() < 0.5:
+            params["check_in"], params["check_out"] = stay(rng)
+        if rng.random() < 0.3:
+            params["amenities"] = rng.sample(ROOM_AMENITIES, 2)
+        return "GET", "/rooms", {"params": params}
+
+    def book_room(i, rng):
+        # Each request gets its own (room, stay), so bookings do not conflict
+        room_id = i % rooms + 1
+        check_in = BOOKING_START + timedelta(days=3 * (i // rooms))
+        return "POST", "/bookings", {"json": {
+            "user_id": user_id(rng.randrange(users)),
+            "hotel_id": (room_id - 1) % hotels + 1,
+            "room_id": room_id,
+            "check_in": check_in.isoformat(),
+            "check_out": (check_in + timedelta(days=2)).isoformat(),
+        }}
+
+    def preview_item(rng):
+        check_in, check_out = stay(rng)
+        return {"room_id": rng.randint(1, rooms), "check_in": check_in, "check_out": check_out}
+
+    def get_user_bookings(i, rng):
+        params = {}
+        if rng.random() < 0.5:
+            params["from"], params["to"] = stay(rng, max_nights=90)
+        return "GET", f"/users/{user_id(rng.randrange(users))}/bookings", {"params": params}
+
+    routes: Dict[str, RequestBuilder] = {
+        "list_hotels": lambda i, rng: ("GET", "/hotels", {}),
+        "get_hotel": lambda i, rng: ("GET", f"/hotels/{rng.randint(1, hotels)}", {}),
+        "get_hotel_availability": lambda i, rng: (
+            "GET", f"/hotels/{rng.randint(1, hotels)}/availability", {"params": dict(zip(("from", "to"), stay(rng, max_nights=30)))}
+        ),
+        "search_rooms": search_rooms,
+        "get_room_details": lambda i, rng: ("GET", f"/rooms/{rng.randint(1, rooms)}", {}),
+        "book_room": book_room,
+        "get_booking_details": lambda i, rng: ("GET", f"/bookings/{rng.randint(1, max(args.bookings, 1))}", {}),
+        "get_booking_preview": lambda i, rng: ("POST", "/bookings/preview", {"json": preview_item(rng)}),
+        "get_booking_preview_batch": lambda i, rng: (
+            "POST", "/bookings/preview/batch", {"json": {"items": [preview_item(rng) for _ in range(10)]}}
+        ),
+        "get_user_bookings": get_user_bookings,
+        "get_user_loyalty": lambda i, rng: ("GET", f"/users/{user_id(rng.randrange(users))}/loyalty", {}),
+    }
+    return routes
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, max(0, int(fraction * len(sorted_values) + 0.5) - 1))]
+
+async def drive(
+    client: httpx.AsyncClient,
+    build: RequestBuilder,
+    tokens: TokenMinter,
+    counter,
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> dict:
+    """Send ``requests`` requests from ``concurrency`` workers and summarize them."""
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    sent = 0
+
+    async def worker(worker_id: int) -> None:
+        nonlocal sent
+        rng = random.Random(seed * 1000 + worker_id)
+        while sent < requests:
+            sent += 1
+            method, path, kwargs = build(next(counter), rng)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, headers=tokens.headers(rng), **kwargs)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": sum(count for status, count in statuses.items() if not status.startswith("2")),
+        "status_codes": dict(statuses),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+    }
+
+async def run(args: argparse.Namespace, base_url: str, tokens: TokenMinter) -> dict:
+    routes = build_routes(args)
+    selected = args.routes or list(routes)
+    unknown = set(selected) - set(routes)
+    if unknown:
+        raise SystemExit(f"Unknown routes: {', '.join(sorted(unknown))} (choose from {', '.join(routes)})")
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        for name in selected:
+            # Shared across warmup and measurement so created bookings never repeat a stay
+            counter = itertools.count()
+            if args.warmup:
+                await drive(client, routes[name], tokens, counter, args.warmup, args.concurrency, args.seed)
+            results[name] = await drive(client, routes[name], tokens, counter, args.requests, args.concurrency, args.seed)
+            summary = results[name]
+            print(
+                f"{name:<28} {summary['rps']:>9.1f} rps  p50 {summary['latency_ms']['p50']:>8.2f} ms  "
+                f"p95 {summary['latency_ms']['p95']:>8.2f} ms  p99 {summary['latency_ms']['p99']:>8.2f} ms  "
+                f"errors {summary['errors']}",
+                file=sys.stderr,
+            )
+    return results
+
+def wait_for_server(port: int, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"Server exited with status {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit("Server did not start in time")
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def regressions(report: dict, baseline: dict, max_regression: float) -> List[str]:
+    """Routes whose p95 latency grew by more than max_regression (a fraction) over the baseline."""
+    found = []
+    for name, summary in report["routes"].items():
+        before = baseline.get("routes", {}).get(name)
+        if not before or not before["latency_ms"]["p95"]:
+            continue
+        ratio = summary["latency_ms"]["p95"] / before["latency_ms"]["p95"] - 1
+        if ratio > max_regression:
+            found.append(f"{name}: p95 {before['latency_ms']['p95']} -> {summary['latency_ms']['p95']} ms (+{ratio:.0%})")
+    return found
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hotels", type=int, default=50)
+    parser.add_argument("--rooms", type=int, default=2000)
+    parser.add_argument("--bookings", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=500, help="distinct users, one token each")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--storage", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--requests", type=int, default=1000, help="measured requests per route")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests per route")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--routes", nargs="*", help="endpoint names to run (default: all)")
+    parser.add_argument("--verify-signatures", action="store_true", help="sign tokens and verify them against a local JWKS")
+    parser.add_argument("--url", help="drive an already running `--serve` server instead of starting one")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="earlier JSON report to compare p95 latencies against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p95 growth over the baseline (0.2 = 20%%)")
+    parser.add_argument("--serve", action="store_true", help="only run the server on the synthetic catalog (for --url)")
+    parser.add_argument("--port", type=int, default=8001, help="port for --serve")
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    if args.verify_signatures and args.url:
+        raise SystemExit("--verify-signatures needs the harness to start the server")
+    # Holds the signing key and the SQLite database of the server
+    workdir = tempfile.TemporaryDirectory(prefix="hotel_api_load_test_")
+    private_key = None
+    if args.verify_signatures:
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        with open(os.path.join(workdir.name, "key.jwk"), "w") as f:
+            f.write(RSAAlgorithm.to_jwk(private_key))
+    tokens = TokenMinter(args.users, private_key)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        port = free_port()
+        command = [
+            sys.executable, "-m", "hotel_api.benchmarks.load_test", "--serve", "--port", str(port),
+            "--hotels", str(args.hotels), "--rooms", str(args.rooms), "--bookings", str(args.bookings),
+            "--users", str(args.users), "--seed", str(args.seed), "--storage", args.storage,
+            "--workdir", workdir.name,
+        ]
+        if args.verify_signatures:
+            command.append("--verify-signatures")
+        server = subprocess.Popen(command)
+        wait_for_server(port, server)
+        base_url = f"http://127.0.0.1:{port}"
+    try:
+        results = asyncio.run(run(args, base_url, tokens))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        workdir.cleanup()
+
+    report = {
+        "config": {
+            name: getattr(args, name)
+            for name in ("hotels", "rooms", "bookings", "users", "seed", "storage", "requests", "warmup", "concurrency", "verify_signatures")
+        },
+        "routes": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(report, json.load(f), args.max_regression)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
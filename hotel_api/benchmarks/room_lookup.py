@@ -0,0 +1,63 @@
+"""
+Room lookup latency by room id on a synthetic catalog of --hotels hotels:
+the old walk over every hotel's rooms vs find_room() of InMemoryHotelStore
+and SQLiteHotelStore.
+
+Room ids are drawn uniformly, so the scan visits half the hotels on
+average; a share of --missing lookups ask for ids that do not exist,
+which the scan can only answer after visiting every hotel.
+
+    python -m hotel_api.benchmarks.room_lookup --hotels 10000 --rooms-per-hotel 5
+"""
+import argparse
+import os
+import random
+import tempfile
+from typing import Dict, Optional
+
+from hotel_api.app.storage import InMemoryHotelStore, SQLiteHotelStore
+from hotel_api.benchmarks.load_test import build_catalog
+from hotel_api.benchmarks.timing import measure
+
+def scan_room(rooms_data: Dict[int, Dict[int, dict]], room_id: int) -> Optional[dict]:
+    """The lookup get_room_details and get_booking_preview ran before the room index."""
+    for hotel_rooms in rooms_data.values():
+        if room_id in hotel_rooms:
+            return hotel_rooms[room_id]
+    return None
+
+def is_found(room: Optional[object]) -> bool:
+    return room is not None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hotels", type=int, default=10000)
+    parser.add_argument("--rooms-per-hotel", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--missing", type=float, default=0.1, help="share of lookups for unknown room ids")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rooms = args.hotels * args.rooms_per_hotel
+    catalog = build_catalog(args.hotels, rooms, 0, 1, args.seed)
+    rng = random.Random(args.seed)
+    room_ids = [
+        rooms + rng.randint(1, rooms) if rng.random() < args.missing else rng.randint(1, rooms)
+        for _ in range(args.lookups)
+    ]
+
+    lookups = [(room_id,) for room_id in room_ids]
+    results = {"scan": measure(lambda room_id: scan_room(catalog[1], room_id), lookups, is_found)}
+    results["memory"] = measure(InMemoryHotelStore(*catalog).find_room, lookups, is_found)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteHotelStore(os.path.join(tmp, "bench.db"), *catalog)
+        results["sqlite"] = measure(store.find_room, lookups, is_found)
+        store.close()
+
+    print(f"{args.hotels} hotels, {rooms} rooms, {args.lookups} lookups")
+    print(f"{'lookup':<10} {'mean µs':>12} {'p99 µs':>12} {'found':>8}")
+    for name, (mean, p99, found) in results.items():
+        print(f"{name:<10} {mean:>12.2f} {p99:>12.2f} {found:>8}")
+
+if __name__ == "__main__":
+    main()
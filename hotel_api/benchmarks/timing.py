@@ -0,0 +1,24 @@
+"""Per-call latency measurement shared by the micro-benchmarks."""
+import time
+from typing import Callable, Iterable, Tuple
+
+from hotel_api.benchmarks.load_test import percentile
+
+def measure(
+    call: Callable[..., object],
+    calls: Iterable[tuple],
+    counts: Callable[[object], bool] = bool,
+) -> Tuple[float, float, int]:
+    """
+    Time call(*args) for every args tuple. Returns (mean µs, p99 µs, number
+    of results for which counts(result) is true).
+    """
+    samples = []
+    counted = 0
+    for args in calls:
+        start = time.perf_counter()
+        result = call(*args)
+        samples.append(time.perf_counter() - start)
+        counted += bool(counts(result))
+    samples.sort()
+    return sum(samples) / len(samples) * 1e6, percentile(samples, 0.99) * 1e6, counted
@@ -0,0 +1,57 @@
+import json
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from hotel_api.app import dependencies
+
+class KeyPair:
+    """RSA signing key standing in for the identity provider."""
+
+    def __init__(self, kid: str):
+        self.kid = kid
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def jwk(self) -> dict:
+        public_jwk = json.loads(RSAAlgorithm.to_jwk(self.private_key.public_key()))
+        return {**public_jwk, "kid": self.kid, "alg": "RS256", "use": "sig"}
+
+    def sign(self, sub: str = "user-1", scope: str = "read_rooms", expires_in: float = 3600, **claims) -> str:
+        payload = {"sub": sub, "scope": scope, "exp": int(time.time() + expires_in), **claims}
+        return jwt.encode(payload, self.private_key, algorithm="RS256", headers={"kid": self.kid})
+
+class IdentityProvider:
+    """Publishes the JWKS of its current keys; rotate() adds a new key and retires the old ones."""
+
+    def __init__(self):
+        self.keys = [KeyPair("key-1")]
+        self.fetches = 0
+
+    @property
+    def key(self) -> KeyPair:
+        return self.keys[-1]
+
+    def rotate(self) -> KeyPair:
+        self.keys = [KeyPair(f"key-{len(self.keys) + 1}")]
+        return self.key
+
+    def jwks(self) -> dict:
+        self.fetches += 1
+        return {"keys": [key.jwk() for key in self.keys]}
+
+@pytest.fixture(scope="session")
+def _rsa_keys():
+    # RSA key generation is slow; reuse the first key across tests
+    return KeyPair("key-1")
+
+@pytest.fixture
+def identity_provider(_rsa_keys, monkeypatch) -> IdentityProvider:
+    """Verified-mode validation against a local key pair, with fresh JWKS and token caches."""
+    provider = IdentityProvider()
+    provider.keys = [_rsa_keys]
+    monkeypatch.setattr(dependencies, "jwks_cache", dependencies.JWKSCache(fetch=provider.jwks, min_refresh_interval=0))
+    monkeypatch.setattr(dependencies, "token_cache", dependencies.ValidatedTokenCache())
+    return provider
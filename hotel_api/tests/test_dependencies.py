@@ -0,0 +1,104 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, SecurityScopes
+
+from hotel_api.app import dependencies
+from hotel_api.app.dependencies import validate_token
+
+from .conftest import KeyPair
+
+def validate(token: str, scopes=("read_rooms",)):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return asyncio.run(validate_token(SecurityScopes(list(scopes)), credentials))
+
+def test_signed_token_is_verified(identity_provider):
+    token_data = validate(identity_provider.key.sign(sub="alice", scope="read_rooms read_bookings"))
+    assert token_data.username == "alice"
+    assert token_data.scopes == ["read_rooms", "read_bookings"]
+
+def test_token_signed_by_unknown_key_is_rejected(identity_provider):
+    forged = KeyPair(identity_provider.key.kid).sign()
+    with pytest.raises(HTTPException) as error:
+        validate(forged)
+    assert error.value.status_code == 401
+
+def test_rotated_key_is_picked_up_by_kid(identity_provider):
+    validate(identity_provider.key.sign())
+    fetches = identity_provider.fetches
+    new_key = identity_provider.rotate()
+    assert validate(new_key.sign(sub="bob")).username == "bob"
+    # The unknown kid triggered exactly one JWKS refresh
+    assert identity_provider.fetches == fetches + 1
+
+def test_expired_token_is_rejected(identity_provider):
+    with pytest.raises(HTTPException) as error:
+        validate(identity_provider.key.sign(expires_in=-60))
+    assert error.value.status_code == 401
+
+def test_missing_scope_is_rejected(identity_provider):
+    with pytest.raises(HTTPException) as error:
+        validate(identity_provider.key.sign(scope="read_rooms"), scopes=("create_bookings",))
+    assert error.value.status_code == 401
+
+def test_validated_token_is_served_from_cache(identity_provider):
+    token = identity_provider.key.sign()
+    validate(token)
+    fetches = identity_provider.fetches
+    identity_provider.rotate()
+    # Still valid until it expires, without another verification or JWKS fetch
+    assert validate(token).username == "user-1"
+    assert identity_provider.fetches == fetches
+
+def test_jwks_fetch_does_not_block_the_event_loop(identity_provider, monkeypatch):
+    def slow_jwks():
+        time.sleep(0.3)
+        return identity_provider.jwks()
+
+    monkeypatch.setattr(dependencies, "jwks_cache", dependencies.JWKSCache(fetch=slow_jwks))
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=identity_provider.key.sign())
+
+    async def ticks_during_validation() -> int:
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.ensure_future(ticker())
+        await validate_token(SecurityScopes(["read_rooms"]), credentials)
+        task.cancel()
+        return ticks
+
+    # Other requests keep being served while the keys are fetched
+    assert asyncio.run(ticks_during_validation()) >= 10
+
+@pytest.mark.parametrize("response", ["<html>", [], {"keys": "none"}, {"keys": [{"kty": "unknown"}]}])
+def test_invalid_key_set_is_reported_as_unavailable(identity_provider, monkeypatch, response):
+    def fetch():
+        if response == "<html>":
+            return json.loads(response)
+        return response
+
+    monkeypatch.setattr(dependencies, "jwks_cache", dependencies.JWKSCache(fetch=fetch))
+    with pytest.raises(HTTPException) as error:
+        validate(identity_provider.key.sign())
+    assert error.value.status_code == 503
+
+def test_unknown_kid_refresh_is_shared_by_concurrent_requests(identity_provider, monkeypatch):
+    def slow_jwks():
+        time.sleep(0.1)
+        return identity_provider.jwks()
+
+    monkeypatch.setattr(dependencies, "jwks_cache", dependencies.JWKSCache(fetch=slow_jwks))
+    tokens = [identity_provider.key.sign(sub=f"user-{n}") for n in range(8)]
+    with ThreadPoolExecutor(max_workers=len(tokens)) as executor:
+        usernames = list(executor.map(lambda token: validate(token).username, tokens))
+    assert usernames == [f"user-{n}" for n in range(8)]
+    assert identity_provider.fetches == 1
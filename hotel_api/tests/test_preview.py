@@ -0,0 +1,30 @@
+import asyncio
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from hotel_api.app import main
+from hotel_api.app.dependencies import TokenData
+from hotel_api.app.schemas import BookingPreviewBatchRequest, BookingPreviewRequest
+
+TOKEN = TokenData(username="user-1", scopes=["read_rooms"])
+
+def preview_request(room_id: int, check_in: date, check_out: date) -> BookingPreviewRequest:
+    return BookingPreviewRequest(room_id=room_id, check_in=check_in, check_out=check_out)
+
+@pytest.mark.parametrize("check_out", [date(2030, 1, 10), date(2030, 1, 9)])
+def test_preview_rejects_check_out_not_after_check_in(check_out):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(main.get_booking_preview(preview_request(101, date(2030, 1, 10), check_out), TOKEN))
+    assert error.value.status_code == 400
+
+def test_batch_preview_reports_invalid_dates_per_item():
+    batch = BookingPreviewBatchRequest(items=[
+        preview_request(101, date(2030, 1, 10), date(2030, 1, 12)),
+        preview_request(101, date(2030, 1, 10), date(2030, 1, 10)),
+        preview_request(101, date(2030, 1, 10), date(2030, 1, 8)),
+    ])
+    results = asyncio.run(main.get_booking_preview_batch(batch, TOKEN))["results"]
+    assert results[0]["preview"]["total_price"] > 0
+    assert results[1:] == [{"error": "Check-out must be after check-in"}] * 2
@@ -0,0 +1,94 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pytest
+
+from hotel_api.app import data
+from hotel_api.app.search import RoomSearchQuery
+from hotel_api.app.storage import InMemoryHotelStore, RoomUnavailableError, SQLiteHotelStore
+
+THREADS = 16
+
+@pytest.fixture(params=["memory", "sqlite"])
+def stores(request, tmp_path):
+    """Stores sharing one set of bookings; for SQLite two instances on one file, like two workers."""
+    catalog = (data.hotels_data, data.rooms_data, data.room_type_data, [])
+    if request.param == "memory":
+        yield [InMemoryHotelStore(*catalog)]
+        return
+    path = str(tmp_path / "hotel_api.db")
+    stores = [SQLiteHotelStore(path, *catalog), SQLiteHotelStore(path, *catalog)]
+    yield stores
+    for store in stores:
+        store.close()
+
+def booking(room_id: int, check_in: date, check_out: date, user: str = "user-1") -> dict:
+    return {
+        "hotel_id": 1,
+        "hotel_name": data.hotels_data[1]["name"],
+        "user_id": user,
+        "room_id": room_id,
+        "room_type": data.rooms_data[1][room_id]["room_type"],
+        "check_in": check_in,
+        "check_out": check_out,
+        "total_price": 100.0,
+    }
+
+def book_concurrently(stores, bookings):
+    """Release one create_booking per booking at once; return the created ids, None where refused."""
+    barrier = threading.Barrier(len(bookings))
+
+    def book(n):
+        barrier.wait(timeout=10)
+        try:
+            return stores[n % len(stores)].create_booking(bookings[n])["id"]
+        except RoomUnavailableError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=len(bookings)) as executor:
+        return list(executor.map(book, range(len(bookings))))
+
+def test_overlapping_concurrent_bookings_admit_exactly_one(stores):
+    start = date(2030, 1, 1)
+    booked = []
+    for round_start in (start + timedelta(days=7 * r) for r in range(20)):
+        # Every stay covers the night of round_start + 2 days
+        ids = book_concurrently(stores, [
+            booking(101, round_start + timedelta(days=n % 3), round_start + timedelta(days=3 + n % 3), f"user-{n}")
+            for n in range(THREADS)
+        ])
+        assert sum(booking_id is not None for booking_id in ids) == 1
+        booked += [booking_id for booking_id in ids if booking_id is not None]
+
+    assert len(set(booked)) == len(booked)
+    ranges = stores[0].get_booked_ranges(1, start, start + timedelta(days=7 * 20))[101]
+    assert len(ranges) == 20
+    assert all(previous[1] <= following[0] for previous, following in zip(ranges, ranges[1:]))
+
+def test_concurrent_bookings_of_different_rooms_all_succeed(stores):
+    room_ids = list(data.rooms_data[1])
+    stays = [date(2030, 1, 1) + timedelta(days=n // len(room_ids) * 2) for n in range(THREADS)]
+    ids = book_concurrently(stores, [
+        booking(room_ids[n % len(room_ids)], stays[n], stays[n] + timedelta(days=1))
+        for n in range(THREADS)
+    ])
+    assert None not in ids
+    assert len(set(ids)) == THREADS
+
+def test_search_sees_rooms_updated_by_another_store(stores):
+    room = {**data.rooms_data[1][101], "id": 101, "price_per_night": 1.0}
+    stores[-1].upsert_room(1, room)
+    for store in stores:
+        matches, _ = store.search_rooms(RoomSearchQuery(max_price=1.0))
+        assert [(hotel["id"], match["id"]) for hotel, match in matches] == [(1, 101)]
+
+def test_availability_checks_the_stay_before_check_out(stores):
+    stores[0].create_booking(booking(101, date(2030, 1, 10), date(2030, 1, 12)))
+    stores[0].create_booking(booking(101, date(2030, 1, 20), date(2030, 1, 25)))
+    store = stores[-1]
+    assert store.is_room_available(1, 101, date(2030, 1, 12), date(2030, 1, 20))
+    assert not store.is_room_available(1, 101, date(2030, 1, 11), date(2030, 1, 13))
+    assert not store.is_room_available(1, 101, date(2030, 1, 5), date(2030, 1, 30))
+    assert not store.is_room_available(1, 101, date(2030, 1, 21), date(2030, 1, 22))
+    assert store.get_booked_ranges(1, date(2030, 1, 12), date(2030, 1, 21))[101] == [(date(2030, 1, 20), date(2030, 1, 25))]
@@ -3,16 +3,26 @@ from langchain_core.tools import tool
 from langgraph.prebuilt import ToolNode
 from langchain_google_genai import ChatGoogleGenerativeAI
 from copilotkit.langgraph import copilotkit_customize_config
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, StateGraph
 from pydantic import BaseModel
 from langgraph.errors import NodeInterrupt
-import requests
+import os
+
+try:
+    from langgraph_agent.agent.checkpointer import SQLiteDeltaSaver
+    from langgraph_agent.agent.hotel_api_client import hotel_api_client
+except ModuleNotFoundError as e:
+    # `langgraph dev` loads this file from langgraph_agent/agent with only
+    # this directory on the path, so the package is not importable there
+    if e.name != "langgraph_agent":
+        raise
+    from checkpointer import SQLiteDeltaSaver
+    from hotel_api_client import hotel_api_client
 
 authorize = False
 
 @tool
-def search_rooms(min_price: float = None, max_price: float = None):
+async def search_rooms(min_price: float = None, max_price: float = None):
     """
     Search for hotel rooms within a price range.
     
@@ -30,11 +40,10 @@ def search_rooms(min_price: float = None, max_price: float = None):
     if max_price is not None:
         params['max_price'] = max_price
         
-    response = requests.get('http://localhost:8001/rooms/', params=params)
-    return response.json()
+    return await hotel_api_client.get('/rooms', params=params)
 
 @tool
-def book_room(user_id: int, room_id: int, check_in: str, check_out: str):
+async def book_room(user_id: int, room_id: int, check_in: str, check_out: str):
     """
     Book a hotel room for a user.
     
@@ -55,11 +64,12 @@ def book_room(user_id: int, room_id: int, check_in: str, check_out: str):
         'check_out': check_out
     }
     
-    response = requests.post('http://localhost:8001/bookings/', json=data)
-    return response.json()
+    return await hotel_api_client.post('/bookings', json=data)
     
 
 tools = [search_rooms, book_room]
+# Async tools: when the model asks for several calls in one turn, ToolNode
+# runs them concurrently on the event loop
 tool_node = ToolNode(tools)
 
 model = ChatGoogleGenerativeAI(model='gemini-1.5-flash')
@@ -133,6 +143,13 @@ workflow.add_edge("check_auth", "authorization")
 workflow.add_edge("authorization", "tools")
 workflow.add_edge("ask_human", "agent")
 
-memory = MemorySaver()
+# Persisted so threads survive restarts and can be served by any worker on the host
+memory = SQLiteDeltaSaver(
+    os.getenv("LANGGRAPH_CHECKPOINT_PATH", "langgraph_checkpoints.db"),
+    max_checkpoints=int(os.getenv("LANGGRAPH_MAX_CHECKPOINTS", "50")),
+)
 
 graph = workflow.compile(checkpointer=memory, interrupt_after=["ask_human"])
+
+# `langgraph dev` persists threads itself and refuses graphs that bring their own checkpointer
+server_graph = workflow.compile(interrupt_after=["ask_human"])
@@ -0,0 +1,75 @@
+"""
+Checkpoint write/read latency against thread length: MemorySaver vs
+SQLiteDeltaSaver.
+
+Each turn appends a user and an assistant message (~500 characters each)
+through a one-node graph, so every turn writes the same checkpoints the
+agent graph would. Reported per thread length: mean turn latency, latest
+state read latency and the bytes stored for the thread.
+
+    python -m langgraph_agent.agent.benchmarks.checkpointer
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from langgraph_agent.agent.checkpointer import SQLiteDeltaSaver
+
+TEXT = "lorem ipsum dolor sit amet " * 20
+
+def reply(state):
+    return {"messages": [AIMessage(content=TEXT)]}
+
+def build(checkpointer):
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("agent", reply)
+    workflow.add_edge(START, "agent")
+    workflow.add_edge("agent", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+def stored_bytes(saver) -> int:
+    if isinstance(saver, SQLiteDeltaSaver):
+        saver.flush()
+        conn = saver._connection()
+        return sum(
+            conn.execute(f"SELECT COALESCE(SUM(LENGTH(value)), 0) FROM {table}").fetchone()[0]
+            for table in ("blobs", "writes")
+        ) + conn.execute("SELECT SUM(LENGTH(checkpoint)) FROM checkpoints").fetchone()[0]
+    return sum(len(value[1]) for value in saver.blobs.values())
+
+def run(name, saver, lengths):
+    graph = build(saver)
+    config = {"configurable": {"thread_id": "bench"}}
+    turns = 0
+    for length in lengths:
+        start = time.perf_counter()
+        added = 0
+        while turns * 2 < length:
+            graph.invoke({"messages": [HumanMessage(content=TEXT)]}, config)
+            turns += 1
+            added += 1
+        write_ms = (time.perf_counter() - start) / max(added, 1) * 1000
+        start = time.perf_counter()
+        for _ in range(20):
+            graph.get_state(config)
+        read_ms = (time.perf_counter() - start) / 20 * 1000
+        print(f"{name:<18} {length:>8} {write_ms:>12.2f} {read_ms:>12.2f} {stored_bytes(saver) / 1024:>12.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", default="10,50,100,200,400", help="thread lengths in messages")
+    args = parser.parse_args()
+    lengths = [int(length) for length in args.lengths.split(",")]
+
+    print(f"{'checkpointer':<18} {'messages':>8} {'turn ms':>12} {'read ms':>12} {'stored KiB':>12}")
+    run("MemorySaver", MemorySaver(), lengths)
+    with tempfile.TemporaryDirectory() as tmp:
+        run("SQLiteDeltaSaver", SQLiteDeltaSaver(os.path.join(tmp, "bench.db")), lengths)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+import asyncio
+import atexit
+import logging
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    checkpoint_type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    base_version TEXT,
+    value_type TEXT,
+    value BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    value_type TEXT NOT NULL,
+    value BLOB NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+) WITHOUT ROWID;
+"""
+
+INSERT_CHECKPOINT = "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+INSERT_BLOB = "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+# Regular writes are kept from the first attempt; special writes (negative idx) are replaced
+INSERT_WRITE = "INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+REPLACE_WRITE = "INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+# Blob kinds: a full value, the items appended to the list stored at
+# base_version, or a channel that was cleared
+FULL, DELTA, EMPTY = "full", "delta", "empty"
+
+ChannelKey = Tuple[str, str]  # (checkpoint_ns, channel)
+
+class SQLiteDeltaSaver(BaseCheckpointSaver[str]):
+    """
+    LangGraph checkpointer backed by a local SQLite file.
+
+    Channel values are stored once per version, like the in-memory saver,
+    but a list channel (``messages``) that only grew is stored as the
+    appended items on top of its previous version. A full copy is written
+    every ``snapshot_every`` versions to bound the chain a read follows.
+
+    Writes are buffered and committed in one transaction every
+    ``flush_interval`` seconds; reading a thread with buffered writes
+    flushes first. A batch that fails to commit ``max_flush_attempts``
+    times in a row is dropped (and logged) so it cannot block later
+    writes; the threads it touched store full values again.
+
+    Each thread keeps its newest ``max_checkpoints`` checkpoints, and the
+    last channel values used to compute deltas are kept for at most
+    ``max_cached_threads`` recently used threads.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        serde: Optional[SerializerProtocol] = None,
+        flush_interval: float = 0.1,
+        snapshot_every: int = 16,
+        max_checkpoints: int = 50,
+        max_cached_threads: int = 1000,
+        max_flush_attempts: int = 5,
+    ):
+        super().__init__(serde=serde)
+        self.path = path
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        self.max_checkpoints = max_checkpoints
+        self.max_cached_threads = max_cached_threads
+        self.max_flush_attempts = max_flush_attempts
+        self.dropped_batches = 0
+        self._failed_flushes = 0
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._pending: List[Tuple[str, tuple]] = []
+        self._pending_threads: Set[str] = set()
+        # thread_id -> {(ns, channel): (version, value, chain length)}
+        self._latest: "OrderedDict[str, Dict[ChannelKey, Tuple[str, Any, int]]]" = OrderedDict()
+        self._connection().executescript(SCHEMA)
+        if flush_interval > 0:
+            threading.Thread(target=self._flush_loop, daemon=True, name="checkpoint-flush").start()
+        atexit.register(self.flush)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to flush checkpoints, will retry")
+
+    def flush(self) -> None:
+        """Commit buffered writes and prune the threads they touched."""
+        with self._lock:
+            if not self._pending:
+                return
+            batch, threads = self._pending, self._pending_threads
+            conn = self._connection()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for sql, params in batch:
+                    conn.execute(sql, params)
+                for thread_id in threads:
+                    self._prune(conn, thread_id)
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                self._failed_flushes += 1
+                if self._failed_flushes >= self.max_flush_attempts:
+                    self._drop_pending()
+                raise
+            self._pending, self._pending_threads = [], set()
+            self._failed_flushes = 0
+
+    def _drop_pending(self) -> None:
+        """Discard the buffered writes after repeated failed flushes."""
+        logger.error(
+            "Dropping %d checkpoint writes for threads %s after %d failed flushes",
+            len(self._pending), sorted(self._pending_threads), self._failed_flushes,
+        )
+        for thread_id in self._pending_threads:
+            # Later deltas must not build on versions that were never stored
+            self._latest.pop(thread_id, None)
+        self._pending, self._pending_threads = [], set()
+        self._failed_flushes = 0
+        self.dropped_batches += 1
+
+    def _queue(self, thread_id: str, sql: str, params: tuple) -> None:
+        self._pending.append((sql, params))
+        self._pending_threads.add(thread_id)
+        if self.flush_interval <= 0:
+            self.flush()
+
+    def _flush_thread(self, thread_id: Optional[str]) -> None:
+        if thread_id is None or thread_id in self._pending_threads:
+            self.flush()
+
+    # Channel values
+
+    def _encode(self, thread_id: str, checkpoint_ns: str, channel: str, version: str, values: Dict[str, Any]) -> tuple:
+        latest = self._latest.setdefault(thread_id, {})
+        self._latest.move_to_end(thread_id)
+        if channel not in values:
+            latest.pop((checkpoint_ns, channel), None)
+            return (thread_id, checkpoint_ns, channel, version, EMPTY, None, None, None)
+        value = values[channel]
+        previous = latest.get((checkpoint_ns, channel))
+        if isinstance(value, list):
+            latest[(checkpoint_ns, channel)] = (version, list(value), 0)
+        else:
+            latest.pop((checkpoint_ns, channel), None)
+        if previous is not None and isinstance(value, list) and previous[2] + 1 < self.snapshot_every:
+            base_version, base, chain = previous
+            if len(value) >= len(base) and all(a is b or a == b for a, b in zip(base, value)):
+                latest[(checkpoint_ns, channel)] = (version, list(value), chain + 1)
+                value_type, data = self.serde.dumps_typed(value[len(base):])
+                return (thread_id, checkpoint_ns, channel, version, DELTA, base_version, value_type, data)
+        value_type, data = self.serde.dumps_typed(value)
+        return (thread_id, checkpoint_ns, channel, version, FULL, None, value_type, data)
+
+    def _load_blob(self, conn: sqlite3.Connection, thread_id: str, checkpoint_ns: str, channel: str, version: str) -> Tuple[bool, Any]:
+        cached = self._latest.get(thread_id, {}).get((checkpoint_ns, channel))
+        if cached is not None and cached[0] == version:
+            return True, list(cached[1])
+        row = conn.execute(
+            "SELECT kind, base_version, value_type, value FROM blobs "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+            (thread_id, checkpoint_ns, channel, version),
+        ).fetchone()
+        if row is None or row[0] == EMPTY:
+            return False, None
+        kind, base_version, value_type, data = row
+        value = self.serde.loads_typed((value_type, data))
+        if kind == DELTA:
+            found, base = self._load_blob(conn, thread_id, checkpoint_ns, channel, base_version)
+            if not found:
+                # Returning the delta alone would silently truncate the conversation
+                logger.error("Missing base %s of %s for thread %s", base_version, channel, thread_id)
+                raise LookupError(f"Base version {base_version} of channel {channel!r} is missing for thread {thread_id}")
+            value = base + value
+        return True, value
+
+    def _load_channel_values(self, conn: sqlite3.Connection, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> Dict[str, Any]:
+        values = {}
+        for channel, version in versions.items():
+            found, value = self._load_blob(conn, thread_id, checkpoint_ns, channel, version)
+            if found:
+                values[channel] = value
+        return values
+
+    def _prune(self, conn: sqlite3.Connection, thread_id: str) -> None:
+        """Drop all but the newest max_checkpoints checkpoints and the blobs only they needed."""
+        namespaces = [row[0] for row in conn.execute(
+            "SELECT checkpoint_ns FROM checkpoints WHERE thread_id = ? GROUP BY checkpoint_ns HAVING COUNT(*) > ?",
+            (thread_id, self.max_checkpoints),
+        )]
+        for checkpoint_ns in namespaces:
+            kept = conn.execute(
+                "SELECT checkpoint_id, checkpoint_type, checkpoint FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT ?",
+                (thread_id, checkpoint_ns, self.max_checkpoints),
+            ).fetchall()
+            oldest_kept = kept[-1][0]
+            conn.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                (thread_id, checkpoint_ns, oldest_kept),
+            )
+            conn.execute(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                (thread_id, checkpoint_ns, oldest_kept),
+            )
+            # Versions only grow, so per channel everything older than the
+            # last full value at or before the oldest version still in use goes
+            oldest_used: Dict[str, str] = {}
+            for _, checkpoint_type, checkpoint in kept:
+                for channel, version in self.serde.loads_typed((checkpoint_type, checkpoint))["channel_versions"].items():
+                    if channel not in oldest_used or version < oldest_used[channel]:
+                        oldest_used[channel] = version
+            for channel, version in oldest_used.items():
+                floor = conn.execute(
+                    "SELECT MAX(version) FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? "
+                    "AND version <= ? AND kind != ?",
+                    (thread_id, checkpoint_ns, channel, version, DELTA),
+                ).fetchone()[0]
+                if floor is not None:
+                    conn.execute(
+                        "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version < ?",
+                        (thread_id, checkpoint_ns, channel, floor),
+                    )
+
+    # BaseCheckpointSaver
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        configurable = {"checkpoint_ns": "", **config["configurable"]}
+        return next(self.list({**config, "configurable": configurable}, limit=1), None)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"] if config else None
+        with self._lock:
+            self._flush_thread(thread_id)
+            conn = self._connection()
+            query = "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, checkpoint_type, checkpoint, metadata_type, metadata FROM checkpoints"
+            clauses, params = [], []
+            if config:
+                clauses.append("thread_id = ?")
+                params.append(thread_id)
+                if config["configurable"].get("checkpoint_ns") is not None:
+                    clauses.append("checkpoint_ns = ?")
+                    params.append(config["configurable"]["checkpoint_ns"])
+                if checkpoint_id := get_checkpoint_id(config):
+                    clauses.append("checkpoint_id = ?")
+                    params.append(checkpoint_id)
+            if before and (before_id := get_checkpoint_id(before)):
+                clauses.append("checkpoint_id < ?")
+                params.append(before_id)
+            if clauses:
+                query += " WHERE " + " AND ".join(clauses)
+            rows = conn.execute(query + " ORDER BY checkpoint_id DESC", params).fetchall()
+
+            results = []
+            for row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                row_thread_id, checkpoint_ns, checkpoint_id, parent_id, checkpoint_type, checkpoint, metadata_type, metadata = row
+                metadata = self.serde.loads_typed((metadata_type, metadata))
+                if filter and not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+                checkpoint = self.serde.loads_typed((checkpoint_type, checkpoint))
+                writes = conn.execute(
+                    "SELECT task_id, channel, value_type, value FROM writes "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+                    (row_thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchall()
+                results.append(CheckpointTuple(
+                    config={"configurable": {"thread_id": row_thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+                    checkpoint={
+                        **checkpoint,
+                        "channel_values": self._load_channel_values(conn, row_thread_id, checkpoint_ns, checkpoint["channel_versions"]),
+                    },
+                    metadata=metadata,
+                    parent_config=(
+                        {"configurable": {"thread_id": row_thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id}}
+                        if parent_id else None
+                    ),
+                    pending_writes=[
+                        (task_id, channel, self.serde.loads_typed((value_type, value)))
+                        for task_id, channel, value_type, value in writes
+                    ],
+                ))
+            self._evict_cold_threads()
+        return iter(results)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint = checkpoint.copy()
+        values = checkpoint.pop("channel_values")
+        with self._lock:
+            for channel, version in new_versions.items():
+                self._queue(thread_id, INSERT_BLOB, self._encode(thread_id, checkpoint_ns, channel, version, values))
+            checkpoint_type, checkpoint_data = self.serde.dumps_typed(checkpoint)
+            metadata_type, metadata_data = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+            self._queue(thread_id, INSERT_CHECKPOINT, (
+                thread_id, checkpoint_ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+                checkpoint_type, checkpoint_data, metadata_type, metadata_data,
+            ))
+            self._evict_cold_threads()
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        with self._lock:
+            for idx, (channel, value) in enumerate(writes):
+                idx = WRITES_IDX_MAP.get(channel, idx)
+                value_type, data = self.serde.dumps_typed(value)
+                self._queue(thread_id, REPLACE_WRITE if idx < 0 else INSERT_WRITE, (
+                    thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, value_type, data, task_path,
+                ))
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self.flush()
+            self._latest.pop(thread_id, None)
+            conn = self._connection()
+            for table in ("checkpoints", "blobs", "writes"):
+                conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    def _evict_cold_threads(self) -> None:
+        while len(self._latest) > self.max_cached_threads:
+            self._latest.popitem(last=False)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # Zero-padded so versions sort as strings, which pruning relies on
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # Async API, used by the CopilotKit endpoint. Every call runs in a worker
+    # thread, since even puts may wait on self._lock while a flush commits.
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        results = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for result in results:
+            yield result
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
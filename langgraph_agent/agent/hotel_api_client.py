@@ -0,0 +1,52 @@
+import asyncio
+import os
+import weakref
+from typing import Any, Optional
+
+import httpx
+
+class HotelApiClient:
+    """
+    Shared async HTTP client for the hotel API.
+
+    Connections are pooled and kept alive across tool calls, with connect
+    and read timeouts. httpx.AsyncClient is bound to the event loop that
+    opened its connections, so one client is kept per running loop.
+    """
+
+    def __init__(
+        self,
+        base_url: str = os.getenv("HOTEL_API_BASE_URL", "http://localhost:8001"),
+        connect_timeout: float = float(os.getenv("HOTEL_API_CONNECT_TIMEOUT", "3")),
+        read_timeout: float = float(os.getenv("HOTEL_API_READ_TIMEOUT", "15")),
+        max_connections: int = int(os.getenv("HOTEL_API_MAX_CONNECTIONS", "20")),
+    ):
+        self.base_url = base_url
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = httpx.AsyncClient(
+                base_url=self.base_url, timeout=self.timeout, limits=self.limits
+            )
+        return client
+
+    async def get(self, path: str, params: Optional[dict] = None) -> Any:
+        response = await self._client().get(path, params=params)
+        return response.json()
+
+    async def post(self, path: str, json: Optional[dict] = None) -> Any:
+        response = await self._client().post(path, json=json)
+        return response.json()
+
+    async def aclose(self) -> None:
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+# Single instance for application-wide use
+hotel_api_client = HotelApiClient()
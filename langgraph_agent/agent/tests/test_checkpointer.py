@@ -0,0 +1,83 @@
+import sqlite3
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from langgraph_agent.agent.checkpointer import DELTA, SQLiteDeltaSaver
+
+CONFIG = {"configurable": {"thread_id": "thread"}}
+
+def reply(state):
+    return {"messages": [AIMessage(content=f"reply {len(state['messages'])}")]}
+
+def build(checkpointer):
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("agent", reply)
+    workflow.add_edge(START, "agent")
+    workflow.add_edge("agent", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+def run_turns(graph, first, count):
+    for turn in range(first, first + count):
+        graph.invoke({"messages": [HumanMessage(content=f"turn {turn}")]}, CONFIG)
+
+def contents(state):
+    return [message.content for message in state.values["messages"]]
+
+def expected(turns):
+    return [content for turn in range(turns) for content in (f"turn {turn}", f"reply {2 * turn + 1}")]
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "checkpoints.db")
+
+def test_cold_reader_sees_the_full_thread(path):
+    writer = SQLiteDeltaSaver(path, flush_interval=0)
+    run_turns(build(writer), 0, 10)
+    assert writer._connection().execute("SELECT COUNT(*) FROM blobs WHERE kind = ?", (DELTA,)).fetchone()[0] > 0
+
+    # A new saver has no cached channel values, so every delta chain is read from the file
+    assert contents(build(SQLiteDeltaSaver(path, flush_interval=0)).get_state(CONFIG)) == expected(10)
+
+def test_pruning_keeps_the_newest_checkpoints_readable(path):
+    saver = SQLiteDeltaSaver(path, flush_interval=0, max_checkpoints=3, snapshot_every=2)
+    run_turns(build(saver), 0, 12)
+    conn = saver._connection()
+    assert conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0] == 3
+    # Blobs older than the last full value the kept checkpoints need are gone
+    assert conn.execute("SELECT COUNT(*) FROM blobs WHERE channel = 'messages'").fetchone()[0] < 12
+
+    graph = build(SQLiteDeltaSaver(path, flush_interval=0))
+    assert contents(graph.get_state(CONFIG)) == expected(12)
+    history = list(graph.get_state_history(CONFIG))
+    assert len(history) == 3
+    # Newest first; every kept checkpoint rebuilds the messages it saw
+    for state in history:
+        messages = contents(state)
+        assert messages == expected(12)[:len(messages)]
+    assert len(contents(history[0])) > len(contents(history[-1]))
+
+def test_writes_continue_after_a_dropped_batch(path):
+    saver = SQLiteDeltaSaver(path, flush_interval=0, max_flush_attempts=2)
+    graph = build(saver)
+    run_turns(graph, 0, 3)
+    conn = saver._connection()
+    conn.execute("CREATE TRIGGER fail_checkpoints BEFORE INSERT ON checkpoints BEGIN SELECT RAISE(ABORT, 'disk full'); END")
+    for turn in (3, 4):
+        with pytest.raises(sqlite3.IntegrityError):
+            run_turns(graph, turn, 1)
+    assert saver.dropped_batches >= 1 and not saver._pending
+    conn.execute("DROP TRIGGER fail_checkpoints")
+
+    # The thread continues from the last committed checkpoint, and its next
+    # messages value is stored in full rather than on top of a dropped version
+    run_turns(graph, 5, 1)
+    assert contents(build(SQLiteDeltaSaver(path, flush_interval=0)).get_state(CONFIG)) == expected(3) + ["turn 5", "reply 7"]
+
+def test_missing_delta_base_raises(path):
+    saver = SQLiteDeltaSaver(path, flush_interval=0)
+    run_turns(build(saver), 0, 3)
+    saver._connection().execute("DELETE FROM blobs WHERE channel = 'messages' AND kind != ?", (DELTA,))
+    with pytest.raises(LookupError):
+        build(SQLiteDeltaSaver(path, flush_interval=0)).get_state(CONFIG)